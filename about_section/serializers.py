@@ -1,11 +1,13 @@
 from rest_framework import serializers
+from back_su_m.locale import CompactLanguageMixin, get_request_language
+from back_su_m.trees import TreeChildrenMixin
 from .models import (
     Partner, AboutSection,
     OrganizationStructure, Achievement, UniversityStatistic, UniversityFounder
 )
 
 
-class PartnerSerializer(serializers.ModelSerializer):
+class PartnerSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Serializer for Partner model with multilingual support"""
     
     # Computed fields for frontend compatibility
@@ -45,45 +47,29 @@ class PartnerSerializer(serializers.ModelSerializer):
     def get_display_name(self, obj):
         """Get display name based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_name(language)
     
     def get_display_description(self, obj):
         """Get display description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_description(language)
     
     def get_display_country(self, obj):
         """Get display country based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_country(language)
     
     def get_display_city(self, obj):
         """Get display city based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_city(language)
     
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
 
-class PartnerListSerializer(serializers.ModelSerializer):
+class PartnerListSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Lightweight serializer for partner list views"""
     
     nameKey = serializers.SerializerMethodField()
@@ -115,42 +101,27 @@ class PartnerListSerializer(serializers.ModelSerializer):
     def get_display_name(self, obj):
         """Get display name based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_name(language)
     
     def get_display_description(self, obj):
         """Get display description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_description(language)
     
     def get_display_country(self, obj):
         """Get display country based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_country(language)
     
     def get_display_city(self, obj):
         """Get display city based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_city(language)
     
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
 
 class AboutSectionSerializer(serializers.ModelSerializer):
     """Serializer for AboutSection model with multilingual support"""
@@ -176,48 +147,21 @@ class AboutSectionSerializer(serializers.ModelSerializer):
     def get_display_title(self, obj):
         """Get title in request language"""
         request = self.context.get('request')
-        language = 'ru'
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
+        language = get_request_language(request)
         
         return obj.get_display_title(language)
     
     def get_display_subtitle(self, obj):
         """Get subtitle in request language"""
         request = self.context.get('request')
-        language = 'ru'
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
+        language = get_request_language(request)
         
         return obj.get_display_subtitle(language)
     
     def get_display_content(self, obj):
         """Get content in request language"""
         request = self.context.get('request')
-        language = 'ru'
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
+        language = get_request_language(request)
         
         return obj.get_display_content(language)
 
@@ -243,13 +187,15 @@ class AboutSectionWithPartnersSerializer(AboutSectionSerializer):
         return []
 
 
-class OrganizationStructureSerializer(serializers.ModelSerializer):
+class OrganizationStructureSerializer(TreeChildrenMixin, serializers.ModelSerializer):
     """Serializer for OrganizationStructure model with multilingual support"""
     
     name = serializers.SerializerMethodField()
     head_name = serializers.SerializerMethodField()
     children = serializers.SerializerMethodField()
     title = serializers.SerializerMethodField()
+    # Active child departments for the whole response are loaded in one query
+    tree_queryset = OrganizationStructure.objects.filter(is_active=True).order_by('order')
     
     class Meta:
         model = OrganizationStructure
@@ -264,44 +210,19 @@ class OrganizationStructureSerializer(serializers.ModelSerializer):
     def get_name(self, obj):
         """Get name in request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_name(language)
     
     def get_head_name(self, obj):
         """Get head name in request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_head_name(language)
     
     def get_title(self, obj):
         """Get title for the structure type"""
         return obj.get_structure_type_display()
     
-    def get_children(self, obj):
-        """Get child departments"""
-        children = obj.children.filter(is_active=True).order_by('order')
-        if children.exists():
-            serializer = OrganizationStructureSerializer(
-                children, 
-                many=True, 
-                context=self.context
-            )
-            return serializer.data
-        return []
-    
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        return language
-
 
 class AchievementSerializer(serializers.ModelSerializer):
     """Serializer for Achievement model with multilingual support"""
@@ -322,28 +243,15 @@ class AchievementSerializer(serializers.ModelSerializer):
     def get_title(self, obj):
         """Get title in request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_title(language)
     
     def get_description(self, obj):
         """Get description in request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_description(language)
     
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        return language
-
 
 class UniversityStatisticSerializer(serializers.ModelSerializer):
     """Serializer for UniversityStatistic model with multilingual support"""
@@ -361,21 +269,9 @@ class UniversityStatisticSerializer(serializers.ModelSerializer):
     def get_name(self, obj):
         """Get name in request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_name(language)
     
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        return language
 class UniversityFounderSerializer(serializers.ModelSerializer):
     """Serializer for UniversityFounder model with multilingual support"""
     
@@ -405,49 +301,33 @@ class UniversityFounderSerializer(serializers.ModelSerializer):
     def get_name(self, obj):
         """Get name based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_name(language)
     
     def get_position(self, obj):
         """Get position based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_position(language)
     
     def get_years(self, obj):
         """Get years based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_years(language)
     
     def get_description(self, obj):
         """Get description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_description(language)
     
     def get_achievements(self, obj):
         """Get achievements based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_achievements(language)
     
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
 
 class UniversityFounderListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for founder list views"""
@@ -468,44 +348,29 @@ class UniversityFounderListSerializer(serializers.ModelSerializer):
     def get_name(self, obj):
         """Get name based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_name(language)
     
     def get_position(self, obj):
         """Get position based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_position(language)
     
     def get_years(self, obj):
         """Get years based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_years(language)
     
     def get_description(self, obj):
         """Get description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_description(language)
     
     def get_achievements(self, obj):
         """Get achievements based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_achievements(language)
-    
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
\ No newline at end of file
@@ -1,3 +1,80 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import Partner, UniversityStatistic
+
+
+class FrontendResponseCacheTests(APITestCase):
+    """*_for_frontend ответы кэшируются по языку и сбрасываются сигналами"""
+
+    url = '/api/about-section/statistics/frontend/'
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.stat = UniversityStatistic.objects.create(
+            name_ru='Студентов', name_en='Students', name_ky='Студенттер', value='5000'
+        )
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_hit_skips_database(self):
+        response, queries = self.get(lang='en')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertGreater(queries, 0)
+
+        response, queries = self.get(lang='en')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(queries, 0)
+        self.assertEqual(response.json()['data'][0]['name'], 'Students')
+
+    def test_keyed_by_language(self):
+        self.get(lang='en')
+        response, _ = self.get(lang='ky')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['data'][0]['name'], 'Студенттер')
+
+    def test_invalidated_on_save_and_delete(self):
+        self.get(lang='ru')
+        self.stat.value = '6000'
+        self.stat.save()
+        response, _ = self.get(lang='ru')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['data'][0]['value'], '6000')
+
+        self.stat.delete()
+        response, _ = self.get(lang='ru')
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_not_modified(self):
+        response, _ = self.get(lang='en')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'lang': 'en'}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_browsable_api_not_cached(self):
+        self.get(lang='ru')
+        # Browsable API доступен только сотрудникам
+        self.client.force_login(User.objects.create_user('staff', password='password', is_staff=True))
+        response = self.client.get(self.url, {'lang': 'ru'}, HTTP_ACCEPT='text/html')
+        self.assertEqual(response['Content-Type'].split(';')[0], 'text/html')
+
+
+class CompactPartnerTests(APITestCase):
+    """?compact=1: вместо name/name_en/name_ky остается display_name"""
+
+    def test_partner_list(self):
+        Partner.objects.create(name='Партнер', name_en='Partner', name_ky='Өнөктөш')
+        response = self.client.get('/api/about-section/partners/', {'lang': 'ky', 'compact': '1'})
+        self.assertEqual(response.status_code, 200)
+        item = response.json()['results'][0]
+        self.assertEqual(item['display_name'], 'Өнөктөш')
+        self.assertNotIn('name', item)
+        self.assertNotIn('name_en', item)
@@ -5,6 +5,12 @@ from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from back_su_m.columns import LanguageColumnsMixin
+from back_su_m.conditional import conditional_response
+from back_su_m.locale import get_request_language
+from back_su_m.response_cache import cached_response
+from back_su_m.trees import NodeTree
+
 from .models import (
     Partner, AboutSection, 
     OrganizationStructure, Achievement, UniversityStatistic, UniversityFounder
@@ -22,7 +28,7 @@ from .serializers import (
 )
 
 
-class PartnerListView(generics.ListAPIView):
+class PartnerListView(LanguageColumnsMixin, generics.ListAPIView):
     """
     Get list of active partners
     Supports filtering and ordering
@@ -36,7 +42,7 @@ class PartnerListView(generics.ListAPIView):
     ordering = ['order', 'name']
 
 
-class PartnerDetailView(generics.RetrieveAPIView):
+class PartnerDetailView(LanguageColumnsMixin, generics.RetrieveAPIView):
     """
     Get detailed information about a specific partner
     """
@@ -72,6 +78,8 @@ class AboutSectionWithPartnersView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
 
+@conditional_response('partners_for_frontend', models=[Partner])
+@cached_response('partners_for_frontend', models=[Partner])
 @api_view(['GET'])
 def partners_for_frontend(request):
     """
@@ -83,13 +91,7 @@ def partners_for_frontend(request):
         partners = Partner.objects.filter(is_active=True).order_by('order', 'name')
         
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Format data for frontend
         partners_data = []
@@ -135,6 +137,8 @@ def partners_for_frontend(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@conditional_response('about_section_with_partners', models=[AboutSection, Partner])
+@cached_response('about_section_with_partners', models=[AboutSection, Partner])
 @api_view(['GET'])
 def about_section_with_partners(request):
     """
@@ -152,13 +156,7 @@ def about_section_with_partners(request):
             }, status=status.HTTP_404_NOT_FOUND)
         
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Format about section data
         about_data = {
@@ -245,6 +243,8 @@ class OrganizationStructureListView(generics.ListAPIView):
     ordering = ['structure_type', 'order', 'name_ru']
 
 
+@conditional_response('structure_for_frontend', models=[OrganizationStructure])
+@cached_response('structure_for_frontend', models=[OrganizationStructure], params=['type'])
 @api_view(['GET'])
 def structure_for_frontend(request):
     """
@@ -253,13 +253,7 @@ def structure_for_frontend(request):
     """
     try:
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Get structure type filter
         structure_type = request.GET.get('type', None)
@@ -270,6 +264,8 @@ def structure_for_frontend(request):
             queryset = queryset.filter(structure_type=structure_type)
         
         structures = queryset.order_by('structure_type', 'order')
+        # Child departments of all structures in one query
+        tree = NodeTree(OrganizationStructure.objects.filter(is_active=True).order_by('order'))
         
         # Group by structure type
         structure_data = {}
@@ -312,8 +308,7 @@ def structure_for_frontend(request):
                 }
             
             # Get child departments
-            children = structure.children.filter(is_active=True).order_by('order')
-            departments = [child.get_display_name(language) for child in children]
+            departments = [child.get_display_name(language) for child in tree.children(structure)]
             
             item_data = {
                 'name': structure.get_display_name(language),
@@ -353,6 +348,8 @@ class AchievementListView(generics.ListAPIView):
     ordering = ['-featured', '-year', 'order']
 
 
+@conditional_response('achievements_for_frontend', models=[Achievement])
+@cached_response('achievements_for_frontend', models=[Achievement], params=['category'])
 @api_view(['GET'])
 def achievements_for_frontend(request):
     """
@@ -364,13 +361,7 @@ def achievements_for_frontend(request):
         achievements = Achievement.objects.filter(is_active=True).order_by('-featured', '-year', 'order')
         
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Get category filter
         category = request.GET.get('category', 'all')
@@ -421,6 +412,8 @@ class UniversityStatisticListView(generics.ListAPIView):
     ordering = ['order', 'name_ru']
 
 
+@conditional_response('statistics_for_frontend', models=[UniversityStatistic])
+@cached_response('statistics_for_frontend', models=[UniversityStatistic])
 @api_view(['GET'])
 def statistics_for_frontend(request):
     """
@@ -432,13 +425,7 @@ def statistics_for_frontend(request):
         statistics = UniversityStatistic.objects.filter(is_active=True).order_by('order', 'name_ru')
         
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Format data for frontend
         statistics_data = []
@@ -492,6 +479,8 @@ class UniversityFounderDetailView(generics.RetrieveAPIView):
     lookup_field = 'id'
 
 
+@conditional_response('founders_for_frontend', models=[UniversityFounder])
+@cached_response('founders_for_frontend', models=[UniversityFounder])
 @api_view(['GET'])
 def founders_for_frontend(request):
     """
@@ -503,13 +492,7 @@ def founders_for_frontend(request):
         founders = UniversityFounder.objects.filter(is_active=True).order_by('order', 'name_ru')
         
         # Get language from request
-        language = request.GET.get('lang', 'ru')
-        if not language:
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-            if 'en' in accept_language:
-                language = 'en'
-            elif 'ky' in accept_language:
-                language = 'ky'
+        language = get_request_language(request)
         
         # Format data for frontend
         founders_data = []
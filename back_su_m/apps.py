@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
+
+
+class BackSuMConfig(AppConfig):
+    name = 'back_su_m'
+    verbose_name = 'Общие механизмы проекта'
+
+    def ready(self):
+        # Версии контента увеличиваются при любой записи в таблицы моделей
+        from .content_versions import check_shared_cache, install_all
+        install_all()
+        checks.register(check_shared_cache)
+
+        if getattr(settings, 'SNAPSHOT_AUTO_PUBLISH', False):
+            from .snapshots import enable_auto_publish
+            enable_auto_publish()
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'back_su_m.settings')
 
 application = get_asgi_application()
+
+# Воркеры не запускаются с версиями контента в памяти процесса
+from back_su_m.content_versions import ensure_shared_cache  # noqa: E402
+
+ensure_shared_cache()
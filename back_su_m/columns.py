@@ -0,0 +1,155 @@
+"""
+Загрузка только тех колонок, которые нужны сериализатору.
+
+Списочные сериализаторы обычно не отдают полный текст (content_*,
+abstract_*, description_*), но queryset по умолчанию загружает все
+колонки. optimize_queryset() по объявленным полям сериализатора:
+
+- откладывает (defer) TextField/JSONField, которые сериализатор не использует;
+- добавляет select_related для вложенных сериализаторов и source='fk.attr';
+- добавляет prefetch_related для вложенных сериализаторов с many=True.
+
+Поле сериализатора `title` считается использующим колонки `title`,
+`title_ru`, `title_kg`, `title_en` - так устроены LocalizedField и
+мультиязычные SerializerMethodField в проекте. Если метод или property читает другую
+текстовую колонку, ее нужно перечислить в Meta.required_columns.
+
+LanguageColumnsMixin для компактного режима (?compact=1, см.
+back_su_m.locale) откладывает колонки переводов на другие языки -
+у основной модели и у моделей из select_related.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+from .locale import LANGUAGE_FIELD_RE, get_request_language, is_compact, kept_suffixes
+
+LANGUAGE_SUFFIXES = ('ru', 'kg', 'ky', 'en')
+DEFERRABLE_FIELDS = (models.TextField, models.JSONField)
+
+
+def _column_names(model, name):
+    """Колонки модели, соответствующие имени поля сериализатора"""
+    candidates = {name} | {f'{name}_{suffix}' for suffix in LANGUAGE_SUFFIXES}
+    return candidates & {field.name for field in model._meta.concrete_fields}
+
+
+def _get_model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _collect(serializer, model, prefix, plan):
+    used = set(getattr(getattr(serializer, 'Meta', None), 'required_columns', ()))
+
+    for field_name, field in serializer.fields.items():
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+
+        if field.source == '*':
+            used |= _column_names(model, getattr(field, 'base_name', None) or field_name)
+            continue
+
+        attr = field.source_attrs[0] if field.source_attrs else field_name
+        used |= _column_names(model, attr)
+
+        model_field = _get_model_field(model, attr)
+        if model_field is None or not model_field.is_relation:
+            continue
+
+        lookup = f'{prefix}{attr}'
+        if (model_field.many_to_one or model_field.one_to_one) and model_field.concrete:
+            plan['select_related'].add(lookup)
+            if not many and isinstance(nested, serializers.ModelSerializer) and len(field.source_attrs) == 1:
+                _collect(nested, model_field.related_model, f'{lookup}__', plan)
+        elif isinstance(nested, serializers.BaseSerializer):
+            plan['prefetch_related'].add(lookup)
+
+    for model_field in model._meta.concrete_fields:
+        if isinstance(model_field, DEFERRABLE_FIELDS) and model_field.name not in used:
+            plan['defer'].add(f'{prefix}{model_field.name}')
+
+
+def get_column_plan(serializer_class):
+    """Возвращает select_related/prefetch_related/defer для сериализатора"""
+    plan = {'select_related': set(), 'prefetch_related': set(), 'defer': set()}
+    serializer = serializer_class()
+    _collect(serializer, serializer.Meta.model, '', plan)
+    return plan
+
+
+def optimize_queryset(queryset, serializer_class, through=None):
+    """Применяет к queryset план загрузки колонок для serializer_class.
+
+    through - имя FK, через которое queryset ссылается на модель
+    сериализатора (например, 'related' для RelatedNews -> News).
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    if meta is None:
+        return queryset
+    if through:
+        prefix = f'{through}__'
+        queryset = queryset.select_related(through)
+    elif issubclass(queryset.model, meta.model):
+        prefix = ''
+    else:
+        return queryset
+    plan = get_column_plan(serializer_class)
+    if plan['select_related']:
+        queryset = queryset.select_related(*sorted(prefix + lookup for lookup in plan['select_related']))
+    if plan['prefetch_related']:
+        queryset = queryset.prefetch_related(*sorted(prefix + lookup for lookup in plan['prefetch_related']))
+    if plan['defer']:
+        queryset = queryset.defer(*sorted(prefix + lookup for lookup in plan['defer']))
+    return queryset
+
+
+class SerializerColumnsMixin:
+    """Для GenericAPIView/ViewSet: списочные действия загружают только нужные колонки.
+
+    Действия перечисляются в serializer_columns_actions; у generics-вью
+    без ViewSet атрибута action нет, и они считаются действием 'list'.
+    """
+    serializer_columns_actions = ['list']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, 'action', 'list') in self.serializer_columns_actions:
+            queryset = optimize_queryset(queryset, self.get_serializer_class())
+        return queryset
+
+
+def _language_columns(model, prefix, select_related, keep):
+    columns = [
+        f'{prefix}{field.name}' for field in model._meta.concrete_fields
+        if (match := LANGUAGE_FIELD_RE.match(field.name)) and match['suffix'] not in keep
+    ]
+    if isinstance(select_related, dict):
+        for name, nested in select_related.items():
+            model_field = _get_model_field(model, name)
+            if model_field is not None and model_field.is_relation and model_field.concrete:
+                columns += _language_columns(model_field.related_model, f'{prefix}{name}__', nested, keep)
+    return columns
+
+
+def defer_other_languages(queryset, language):
+    """Откладывает колонки переводов, кроме языка language и русского (запасного)"""
+    columns = _language_columns(queryset.model, '', queryset.query.select_related, kept_suffixes(language))
+    return queryset.defer(*columns) if columns else queryset
+
+
+class LanguageColumnsMixin:
+    """Для GenericAPIView/ViewSet: ?compact=1 загружает только колонки языка запроса.
+
+    Сериализатор при этом должен использовать CompactLanguageMixin,
+    иначе отложенные колонки будут догружаться по одной.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if is_compact(self.request):
+            queryset = defer_other_languages(queryset, get_request_language(self.request))
+        return queryset
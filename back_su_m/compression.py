@@ -0,0 +1,52 @@
+"""
+Сжатие больших ответов API.
+
+CompressionMiddleware - GZipMiddleware Django с порогом размера
+(RESPONSE_COMPRESSION_MIN_SIZE) и brotli, если установлен пакет brotli
+и клиент его принимает. Потоковые ответы сжимаются, только если это
+JSON: файлы (FileResponse) и статика WhiteNoise отдаются как есть.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+
+    @property
+    def min_size(self):
+        return getattr(settings, 'RESPONSE_COMPRESSION_MIN_SIZE', 1024)
+
+    def process_response(self, request, response):
+        if response.streaming:
+            if not response.get('Content-Type', '').startswith('application/json'):
+                return response
+        elif len(response.content) < self.min_size:
+            return response
+        if brotli is not None and not response.streaming and not response.has_header('Content-Encoding'):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            if re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+                return self.compress_brotli(response)
+        return super().process_response(request, response)
+
+    @staticmethod
+    def compress_brotli(response):
+        compressed = brotli.compress(response.content, quality=5)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
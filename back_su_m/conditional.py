@@ -0,0 +1,144 @@
+"""
+Условные GET-запросы (ETag / Last-Modified) для read-only API.
+
+Валидаторы вычисляются без сериализации: ETag - хэш от эндпоинта,
+query-параметров, языка и версий моделей из back_su_m.response_cache,
+Last-Modified - время последнего изменения этих моделей. Версии и время
+меняет любая запись в таблицы моделей (back_su_m.content_versions).
+
+Если клиент прислал If-None-Match / If-Modified-Since и данные не
+менялись, ответ 304 отдается до обращения к ORM и сериализаторам.
+
+- ConditionalGetMixin - для APIView/ViewSet (conditional_models,
+  conditional_actions, cache_control);
+- conditional_response - декоратор для функций-вью (поверх @api_view).
+
+Cache-Control по умолчанию - CONDITIONAL_CACHE_CONTROL из settings
+(public, no-cache: браузер хранит ответ, но перепроверяет его).
+"""
+
+import functools
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .locale import get_request_language
+from .response_cache import get_last_modified, get_versions, invalidate_on, wants_html
+
+DEFAULT_CACHE_CONTROL = {'public': True, 'no_cache': True}
+
+
+def default_cache_control():
+    return getattr(settings, 'CONDITIONAL_CACHE_CONTROL', DEFAULT_CACHE_CONTROL)
+
+
+def is_conditional(request):
+    return request.method in ('GET', 'HEAD') and not wants_html(request)
+
+
+def get_validators(request, name, models, extra=''):
+    """(etag, last_modified) ответа эндпоинта name, зависящего от models"""
+    query = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    parts = [name, request.path, repr(query), get_request_language(request), extra]
+    parts += get_versions(models)
+    etag = quote_etag(hashlib.md5('|'.join(parts).encode()).hexdigest())
+    return etag, get_last_modified(models)
+
+
+def not_modified(request, etag, last_modified):
+    """HttpResponseNotModified, если у клиента актуальная версия, иначе None"""
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, etag, last_modified, cache_control):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, **cache_control)
+    return response
+
+
+class NotModified(Exception):
+    """Прерывает обработку запроса DRF-вью ответом 304"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """ETag/Last-Modified и 304 для GET-действий APIView/ViewSet.
+
+    conditional_models  - модели, от которых зависит ответ (по умолчанию
+                          модель queryset); отслеживаются с момента
+                          объявления класса
+    conditional_actions - действия ViewSet, к которым применяется проверка
+                          (None - все GET-запросы)
+    cache_control       - аргументы patch_cache_control (None - из settings)
+    """
+    conditional_models = None
+    conditional_actions = None
+    cache_control = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        invalidate_on(*cls.get_conditional_models())
+
+    @classmethod
+    def get_conditional_models(cls):
+        if cls.conditional_models is not None:
+            return list(cls.conditional_models)
+        queryset = getattr(cls, 'queryset', None)
+        return [queryset.model] if queryset is not None else []
+
+    def get_conditional_key(self):
+        """Дополнительная часть ETag, например, для ответов, зависящих от времени"""
+        return ''
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        actions = self.conditional_actions
+        if not is_conditional(request) or (actions is not None and getattr(self, 'action', None) not in actions):
+            return
+        models = self.get_conditional_models()
+        if not models:
+            return
+        name = f'{type(self).__module__}.{type(self).__name__}:{getattr(self, "action", "")}'
+        self._validators = get_validators(request, name, models, self.get_conditional_key())
+        response = not_modified(request, *self._validators)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, '_validators', None):
+            set_validators(response, *self._validators, self.cache_control or default_cache_control())
+        return response
+
+
+def conditional_response(name, models, cache_control=None):
+    """Декоратор для функций-вью (поверх @api_view и cached_response).
+
+    name   - имя эндпоинта в ETag
+    models - модели, изменение которых меняет ответ
+    """
+    invalidate_on(*models)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_conditional(request):
+                return view(request, *args, **kwargs)
+            validators = get_validators(request, name, models, repr(sorted(kwargs.items())))
+            response = not_modified(request, *validators) or view(request, *args, **kwargs)
+            return set_validators(response, *validators, cache_control or default_cache_control())
+        return wrapper
+    return decorator
@@ -0,0 +1,272 @@
+"""
+Реестр версий контента.
+
+У каждой модели проекта и у каждого приложения есть счетчик версии
+(пространства имен 'news.news' и 'news'). Любая запись в таблицу
+модели - save(), delete(), queryset.update(), bulk_create, действия
+админки, populate-скрипты и даже raw SQL через курсор Django -
+увеличивает версии модели и ее приложения. Кэши строят ключи из версий
+(get_versions) и не подписываются на сигналы сами.
+
+Записи отслеживаются на уровне SQL: обертка execute_wrapper на каждом
+соединении смотрит на INSERT/UPDATE/DELETE и по имени таблицы находит
+модель. Внутри транзакции версия увеличивается сразу и еще раз после
+коммита: читатель, успевший между записью и коммитом закэшировать
+старые данные под новой версией, не сохранит их надолго.
+
+Отслеживаются приложения из CONTENT_VERSION_APPS (по умолчанию - все
+приложения из каталога проекта) и модели, переданные в track(), кроме
+моделей из untrack() (журналы просмотров). Служебные записи в таблицы
+контента (сброс счетчиков просмотров) выполняются внутри
+untracked_writes() и версии не меняют.
+Счетчики хранятся в кэше CONTENT_VERSION_CACHE_ALIAS, общем для всех
+процессов: с кэшем в памяти процесса запись в одном воркере не меняла
+бы версии в остальных, поэтому такой бэкенд допускается только при
+DEBUG или CONTENT_VERSION_SINGLE_PROCESS (системная проверка
+back_su_m.E001; WSGI/ASGI-приложение с ошибкой не запускается).
+Начальное значение счетчика - текущее время в микросекундах, поэтому
+после вытеснения ключа версия не повторяет прежнюю.
+
+Просмотр и ручное увеличение версий - команда content_versions;
+подписаться на изменения можно сигналом content_changed.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal
+
+VERSION_KEY = 'content-version:{}'
+CHANGED_KEY = 'content-version:changed:{}'
+
+WRITE_RE = re.compile(
+    r'^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+[`"\[]?(\w+)',
+    re.IGNORECASE,
+)
+
+# Отправляется после увеличения версий: namespaces - список пространств имен
+content_changed = Signal()
+
+_tracked = set()  # модели, переданные в track()
+_untracked = set()  # модели, переданные в untrack()
+_tables = None  # имя таблицы -> пространства имен
+
+
+def get_cache():
+    return caches[getattr(settings, 'CONTENT_VERSION_CACHE_ALIAS', 'default')]
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """Системная проверка: кэш версий общий для всех процессов"""
+    if settings.DEBUG or getattr(settings, 'CONTENT_VERSION_SINGLE_PROCESS', False):
+        return []
+    alias = getattr(settings, 'CONTENT_VERSION_CACHE_ALIAS', 'default')
+    cache = caches[alias]
+    if not isinstance(cache, (LocMemCache, DummyCache)):
+        return []
+    return [checks.Error(
+        f'Версии контента хранятся в кэше {alias!r} ({type(cache).__name__}), '
+        f'у каждого процесса он свой: ETag и кэш ответов устаревают',
+        hint='Укажите общий бэкенд (FileBasedCache, RedisCache) или '
+             'CONTENT_VERSION_SINGLE_PROCESS=True, если процесс один.',
+        id='back_su_m.E001',
+    )]
+
+
+def ensure_shared_cache():
+    """Останавливает запуск WSGI/ASGI-приложения с кэшем версий в памяти процесса"""
+    errors = check_shared_cache()
+    if errors:
+        raise ImproperlyConfigured(f'{errors[0].id}: {errors[0].msg}. {errors[0].hint}')
+
+
+def namespace(item):
+    """Пространство имен модели ('news.news') или строка как есть"""
+    return item if isinstance(item, str) else item._meta.label_lower
+
+
+def model_namespaces(model):
+    """Пространства имен, версии которых меняет запись в таблицу модели"""
+    names = [model._meta.label_lower]
+    # Автоматическая промежуточная таблица M2M меняет модель с полем
+    owner = model._meta.auto_created
+    if owner:
+        names.append(owner._meta.label_lower)
+    names.append(model._meta.app_label)
+    return tuple(dict.fromkeys(names))
+
+
+def _initial_version():
+    return time.time_ns() // 1000
+
+
+def get_versions(items):
+    """{пространство имен: версия}; отсутствующие счетчики создаются"""
+    cache = get_cache()
+    names = [namespace(item) for item in items]
+    keys = {VERSION_KEY.format(name): name for name in names}
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), None)
+            found[key] = cache.get(key)
+    return {keys[key]: found[key] for key in keys}
+
+
+def get_version(item):
+    return get_versions([item])[namespace(item)]
+
+
+def get_last_modified(items):
+    """Время последнего изменения (unix time, целые секунды).
+
+    Если отметки нет (еще не менялась или вытеснена), считается, что
+    изменение было сейчас.
+    """
+    cache = get_cache()
+    keys = [CHANGED_KEY.format(namespace(item)) for item in items]
+    changed = cache.get_many(keys)
+    for key in keys:
+        if key not in changed:
+            cache.add(key, int(time.time()), None)
+            changed[key] = cache.get(key)
+    return max(changed.values(), default=int(time.time()))
+
+
+def bump(*items):
+    """Увеличивает версии моделей (вместе с их приложениями) и пространств имен"""
+    names = []
+    for item in items:
+        names += [item] if isinstance(item, str) else model_namespaces(item)
+    names = list(dict.fromkeys(names))
+    cache = get_cache()
+    for name in names:
+        key = VERSION_KEY.format(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, _initial_version(), None):
+                cache.incr(key)
+    # Last-Modified с точностью до секунды: два изменения в одну секунду
+    # должны давать разные отметки
+    now = int(time.time())
+    keys = [CHANGED_KEY.format(name) for name in names]
+    previous = cache.get_many(keys)
+    cache.set_many({key: max(now, previous.get(key, 0) + 1) for key in keys}, None)
+    content_changed.send(sender=None, namespaces=names)
+
+
+def track(*models):
+    """Отслеживает записи в таблицы моделей вне CONTENT_VERSION_APPS"""
+    global _tables
+    new = set(models) - _tracked
+    if new:
+        _tracked.update(new)
+        _tables = None
+
+
+def untrack(*models):
+    """Исключает таблицы моделей из отслеживания (журналы, не влияющие на ответы)"""
+    global _tables
+    new = set(models) - _untracked
+    if new:
+        _untracked.update(new)
+        _tables = None
+
+
+@contextmanager
+def untracked_writes(using=DEFAULT_DB_ALIAS):
+    """Записи на соединении using внутри блока не меняют версии"""
+    connection = connections[using]
+    previous = getattr(connection, 'content_versions_paused', False)
+    connection.content_versions_paused = True
+    try:
+        yield
+    finally:
+        connection.content_versions_paused = previous
+
+
+def tracked_app_labels():
+    labels = getattr(settings, 'CONTENT_VERSION_APPS', None)
+    if labels is not None:
+        return set(labels)
+    base_dir = str(settings.BASE_DIR)
+    return {config.label for config in apps.get_app_configs() if config.path.startswith(base_dir)}
+
+
+def tracked_tables():
+    """{таблица: пространства имен} для отслеживаемых моделей"""
+    global _tables
+    if _tables is None:
+        labels = tracked_app_labels()
+        models = [model for model in apps.get_models(include_auto_created=True)
+                  if model._meta.app_label in labels]
+        tables = {}
+        for model in [*models, *_tracked]:
+            if model not in _untracked:
+                tables[model._meta.db_table] = model_namespaces(model)
+        _tables = tables
+    return _tables
+
+
+def tracked_namespaces():
+    names = set()
+    for namespaces in tracked_tables().values():
+        names.update(namespaces)
+    return sorted(names)
+
+
+def changed(connection, namespaces):
+    """Запись в таблицы пространств имен на соединении connection"""
+    bump(*namespaces)
+    if connection.in_atomic_block:
+        _bump_on_commit(connection, namespaces)
+
+
+def _bump_on_commit(connection, namespaces):
+    # Одна отложенная операция на транзакцию; после отката колбэк
+    # исчезает из run_on_commit и регистрируется заново
+    callback = getattr(connection, 'content_versions_callback', None)
+    if callback is None or not any(entry[1] is callback for entry in connection.run_on_commit):
+        pending = set()
+
+        def callback():
+            bump(*pending)
+
+        callback.pending = pending
+        connection.content_versions_callback = callback
+        transaction.on_commit(callback, using=connection.alias)
+    callback.pending.update(namespaces)
+
+
+def track_writes(execute, sql, params, many, context):
+    """execute_wrapper: увеличивает версии после успешной записи в таблицу модели"""
+    result = execute(sql, params, many, context)
+    match = WRITE_RE.match(sql)
+    if match and not getattr(context['connection'], 'content_versions_paused', False):
+        namespaces = tracked_tables().get(match[1])
+        if namespaces:
+            changed(context['connection'], namespaces)
+    return result
+
+
+def install(connection, **kwargs):
+    if track_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_writes)
+
+
+def install_all():
+    """Подключает отслеживание к открытым и будущим соединениям"""
+    connection_created.connect(install, dispatch_uid='content-versions')
+    for connection in connections.all(initialized_only=True):
+        install(connection)
@@ -0,0 +1,193 @@
+"""
+Аудит индексов по записанному трафику API.
+
+Запросы берутся из access-лога gunicorn (строка запроса "GET /path?query
+HTTP/1.1") или из JSONL-записи ({"method": "GET", "path": "/api/news/",
+"query": "page=2"} либо {"url": "https://.../api/news/?page=2"}).
+Каждый уникальный GET-запрос выполняется через тестовый клиент Django
+со всеми middleware внутри транзакции, которая откатывается; все SELECT
+запроса проходят через EXPLAIN (EXPLAIN QUERY PLAN в SQLite).
+
+В отчете:
+- эндпоинты: число запросов в логе, медианное время ответа, число SQL и
+  полных сканирований;
+- полные сканирования таблиц (SCAN table в SQLite, Seq Scan в
+  PostgreSQL) с числом строк таблицы, эндпоинтами и примером SQL;
+- сортировки без индекса (USE TEMP B-TREE / Sort).
+
+Таблицы меньше min_rows строк не попадают в отчет: их дешевле читать
+целиком, чем поддерживать индекс. Записи в БД откатываются, а учет
+просмотров (back_su_m.view_counter) на время воспроизведения
+приостановлен: буфер счетчиков сбрасывается в БД вне транзакции и
+оставил бы просмотры после аудита. Запуск - командой index_audit.
+"""
+
+import json
+import re
+import statistics
+import time
+from collections import Counter, namedtuple
+from urllib.parse import urlencode, urlsplit
+
+from django.db import connection, transaction
+from django.test import Client
+
+from .snapshots import snapshot_host
+from .view_counter import recording_paused
+
+ACCESS_LOG_RE = re.compile(r'"(?P<method>[A-Z]+) (?P<target>\S+) HTTP/[\d.]+"')
+
+SCAN_RE = {
+    'sqlite': re.compile(r'^SCAN (?:TABLE )?(?P<table>\w+)(?: AS \w+)?$'),
+    'postgresql': re.compile(r'Seq Scan on (?P<table>\w+)'),
+}
+SORT_RE = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY)'),
+    'postgresql': re.compile(r'^\s*(?:->\s*)?Sort\b'),
+}
+
+REPLAY_METHODS = ('GET', 'HEAD')
+
+# sql - текст запроса, plan - строки плана, scans - таблицы, прочитанные
+# целиком, temp_sort - сортировка без индекса
+QueryPlan = namedtuple('QueryPlan', 'sql plan scans temp_sort')
+EndpointResult = namedtuple('EndpointResult', 'target hits status milliseconds queries plans')
+
+
+class AuditError(Exception):
+    """Аудит невозможен (неподдерживаемая СУБД, пустой лог)"""
+
+
+def parse_line(line):
+    """Путь с query-строкой из строки лога или None, если запрос не воспроизводится"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        method = str(record.get('method', 'GET')).upper()
+        target = record.get('url') or record.get('path') or ''
+        query = record.get('query')
+        if query:
+            query = query if isinstance(query, str) else urlencode(query, doseq=True)
+            target = f'{target}{"&" if "?" in target else "?"}{query.lstrip("?")}'
+    else:
+        match = ACCESS_LOG_RE.search(line)
+        if not match:
+            return None
+        method, target = match['method'], match['target']
+    if method not in REPLAY_METHODS:
+        return None
+    parts = urlsplit(target)
+    if not parts.path.startswith('/'):
+        return None
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+def read_requests(lines):
+    """Counter {путь с query: число запросов}"""
+    return Counter(target for target in map(parse_line, lines) if target)
+
+
+def explain(sql, params):
+    """Строки плана запроса"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+        rows = cursor.fetchall()
+    # SQLite: (id, parent, notused, detail); PostgreSQL: (строка,)
+    return [str(row[-1] if connection.vendor == 'sqlite' else row[0]) for row in rows]
+
+
+def analyze_plan(plan):
+    """(таблицы, прочитанные целиком, есть ли сортировка без индекса)"""
+    scan_re, sort_re = SCAN_RE[connection.vendor], SORT_RE[connection.vendor]
+    scans = []
+    for line in plan:
+        match = scan_re.search(line.strip())
+        if match:
+            scans.append(match['table'])
+    return scans, any(sort_re.search(line) for line in plan)
+
+
+class IndexAudit:
+    """Воспроизводит запросы и собирает планы их SELECT.
+
+    repeat   - сколько раз выполнить запрос для замера времени
+    min_rows - таблицы меньше этого размера не считаются проблемой
+    """
+
+    def __init__(self, repeat=3, min_rows=1000):
+        if connection.vendor not in SCAN_RE:
+            raise AuditError(f'Аудит планов не поддерживается для {connection.vendor}')
+        self.repeat = max(repeat, 1)
+        self.min_rows = min_rows
+        self.client = Client(HTTP_HOST=snapshot_host(), HTTP_ACCEPT='application/json')
+        self._plans = {}
+        self._table_rows = {}
+
+    def run(self, requests):
+        """[EndpointResult] в порядке убывания числа запросов"""
+        if not requests:
+            raise AuditError('В логе нет GET-запросов к приложению')
+        return [self.replay(target, hits) for target, hits in requests.most_common()]
+
+    def replay(self, target, hits):
+        statements = []
+
+        def capture(execute, sql, params, many, context):
+            if not many and sql.lstrip()[:6].upper() == 'SELECT':
+                statements.append((sql, params))
+            return execute(sql, params, many, context)
+
+        timings = []
+        for _ in range(self.repeat):
+            statements.clear()
+            with transaction.atomic(), connection.execute_wrapper(capture), recording_paused():
+                started = time.perf_counter()
+                response = self.client.get(target, secure=True)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                timings.append((time.perf_counter() - started) * 1000)
+                transaction.set_rollback(True)
+        plans = [self.plan(sql, params) for sql, params in statements]
+        return EndpointResult(target, hits, response.status_code, statistics.median(timings), len(statements), plans)
+
+    def plan(self, sql, params):
+        # Один план на текст запроса: параметры обычно не меняют выбор индекса
+        if sql not in self._plans:
+            plan = explain(sql, params)
+            scans, temp_sort = analyze_plan(plan)
+            scans = [table for table in scans if self.table_rows(table) >= self.min_rows]
+            self._plans[sql] = QueryPlan(sql, plan, scans, temp_sort)
+        return self._plans[sql]
+
+    def table_rows(self, table):
+        if table not in self._table_rows:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                self._table_rows[table] = cursor.fetchone()[0]
+        return self._table_rows[table]
+
+    def summarize(self, results):
+        """Сводка по таблицам: {таблица: {'rows', 'hits', 'endpoints', 'statements'}}.
+
+        statements - {SQL: {'hits', 'plan'}} запросов, читающих таблицу целиком
+        """
+        tables = {}
+        for result in results:
+            path = result.target.split('?')[0]
+            plans = {plan.sql: plan for plan in result.plans}.values()
+            for table in {table for plan in plans for table in plan.scans}:
+                entry = tables.setdefault(table, {
+                    'rows': self.table_rows(table), 'hits': 0, 'endpoints': Counter(), 'statements': {},
+                })
+                entry['hits'] += result.hits
+                entry['endpoints'][path] += result.hits
+                for plan in plans:
+                    if table in plan.scans:
+                        statement = entry['statements'].setdefault(plan.sql, {'hits': 0, 'plan': plan.plan})
+                        statement['hits'] += result.hits
+        return dict(sorted(tables.items(), key=lambda item: -item[1]['hits']))
@@ -0,0 +1,262 @@
+"""
+Язык запроса и локализованные поля сериализаторов.
+
+Язык определяется один раз на запрос в RequestLanguageMiddleware:
+сначала ?lang=, затем Accept-Language (с учетом q), иначе LANGUAGE_CODE.
+Кыргызский принимается как 'ky', 'kg', 'ky-KG' и т.п. и всегда
+приводится к 'ky' - коду из settings.LANGUAGES. Результат хранится
+в request.site_language и активируется как язык Django.
+
+Колонки моделей называются по-разному: title_kg (news, careers,
+infrastructure) или name_ky (about_section). field_fallbacks() один раз
+на (модель, поле, язык) вычисляет список существующих атрибутов в
+порядке запасных вариантов: запрошенный язык, русский, базовое поле
+(в about_section и mission_section это и есть русский), английский.
+После этого локализация значения - пара getattr.
+
+Компактный режим (?compact=1, обычно вместе с ?lang=): вместо всех
+языковых колонок сериализатор отдает одно значение на языке запроса
+(CompactLanguageMixin), а queryset не загружает колонки остальных
+языков (back_su_m.columns.LanguageColumnsMixin).
+"""
+
+import re
+
+from django.conf import settings
+from django.middleware.locale import LocaleMiddleware
+from django.utils import translation
+from django.utils.translation.trans_real import parse_accept_lang_header
+from rest_framework import serializers
+
+SITE_LANGUAGES = ('ru', 'ky', 'en')
+LANGUAGE_ALIASES = {'ru': 'ru', 'en': 'en', 'ky': 'ky', 'kg': 'ky', 'kir': 'ky'}
+
+# Суффиксы колонок для языка сайта в порядке проверки
+COLUMN_SUFFIXES = {'ru': ('ru',), 'ky': ('kg', 'ky'), 'en': ('en',)}
+COMPACT_VALUES = ('1', 'true', 'yes')
+
+LANGUAGE_FIELD_RE = re.compile(r'^(?P<base>.+)_(?P<suffix>ru|kg|ky|en)$')
+
+_fallbacks = {}
+
+
+def normalize_language(code):
+    """'ky-KG', 'kg', 'EN_us' -> код языка сайта; None для неподдерживаемых"""
+    if not code:
+        return None
+    primary = code.strip().lower().replace('_', '-').split('-')[0]
+    return LANGUAGE_ALIASES.get(primary)
+
+
+def default_language():
+    return normalize_language(settings.LANGUAGE_CODE) or 'ru'
+
+
+def negotiate_language(request):
+    """?lang=, затем Accept-Language, затем LANGUAGE_CODE"""
+    language = normalize_language(request.GET.get('lang'))
+    if language:
+        return language
+    for code, _ in parse_accept_lang_header(request.META.get('HTTP_ACCEPT_LANGUAGE', '')):
+        language = normalize_language(code)
+        if language:
+            return language
+    return default_language()
+
+
+def get_request_language(request):
+    """Язык сайта ('ru', 'ky', 'en') для запроса.
+
+    Обычно уже вычислен middleware; без запроса (сериализатор вызван
+    из кода) - текущий активный язык Django.
+    """
+    if request is None:
+        return normalize_language(translation.get_language()) or default_language()
+    language = getattr(request, 'site_language', None)
+    if language is None:
+        language = negotiate_language(request)
+        request.site_language = language
+    return language
+
+
+def is_compact(request):
+    """Запрошен ли компактный ответ (?compact=1) - только для чтения"""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return False
+    return request.GET.get('compact', '').lower() in COMPACT_VALUES
+
+
+def kept_suffixes(language):
+    """Суффиксы колонок, которые нужны в компактном режиме: язык запроса и русский"""
+    return set(COLUMN_SUFFIXES[language]) | {'ru'}
+
+
+def column_suffix(language):
+    """Суффикс колонок с переводом в моделях с _kg ('ky' -> 'kg')"""
+    return COLUMN_SUFFIXES[language][0]
+
+
+class RequestLanguageMiddleware(LocaleMiddleware):
+    """LocaleMiddleware с правилами выбора языка проекта (см. модуль)"""
+
+    def process_request(self, request):
+        language = negotiate_language(request)
+        request.site_language = language
+        translation.activate(language)
+        request.LANGUAGE_CODE = translation.get_language()
+
+
+def field_fallbacks(model, name, language, compact=False):
+    """Атрибуты модели, из которых берется поле name на языке language.
+
+    compact - только колонки, которые загружает компактный режим
+    (без английского как последнего запасного варианта).
+    """
+    key = (model, name, language, compact)
+    attrs = _fallbacks.get(key)
+    if attrs is None:
+        candidates = []
+        for lang in (language, 'ru'):
+            candidates += [f'{name}_{suffix}' for suffix in COLUMN_SUFFIXES[lang]]
+        candidates.append(name)
+        if not compact:
+            candidates += [f'{name}_{suffix}' for suffix in COLUMN_SUFFIXES['en']]
+        attrs = tuple(dict.fromkeys(attr for attr in candidates if hasattr(model, attr)))
+        _fallbacks[key] = attrs
+    return attrs
+
+
+def localize(instance, name, language, compact=False):
+    """Значение поля name на языке language с запасными языками; '' если пусто"""
+    for attr in field_fallbacks(type(instance), name, language, compact):
+        value = getattr(instance, attr)
+        if value:
+            return value
+    return ''
+
+
+class LocalizedField(serializers.Field):
+    """Поле только для чтения: значение на языке запроса.
+
+    Базовое имя колонки - имя поля сериализатора (или field=...),
+    source указывает объект, у которого оно читается (по умолчанию сам
+    объект, например source='news' для полей новости у события).
+    compact=True - для компактного режима (см. field_fallbacks).
+    """
+
+    def __init__(self, field=None, compact=False, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', '*')
+        self.base_name = field
+        self.compact = compact
+        self._language = None
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.base_name = self.base_name or field_name
+
+    def to_representation(self, instance):
+        if self._language is None:
+            self._language = get_request_language(self.context.get('request'))
+        return localize(instance, self.base_name, self._language, self.compact)
+
+
+class LocalizedSerializerMixin:
+    """Язык запроса для сериализатора, вычисленный один раз"""
+
+    @property
+    def language(self):
+        language = getattr(self, '_language', None)
+        if language is None:
+            language = self._language = get_request_language(self.context.get('request'))
+        return language
+
+    @property
+    def column_suffix(self):
+        """Суффикс колонок модели для языка запроса ('kg' для кыргызского)"""
+        return column_suffix(self.language)
+
+    def get_localized_field(self, instance, field_name):
+        """Поле на языке запроса с запасными языками (см. localize)"""
+        return localize(instance, field_name, self.language)
+
+
+def compact_fields(fields, model=None):
+    """Заменяет группы полей title_ru/title_kg/title_en одним полем на языке запроса.
+
+    - есть display_title (about_section, mission_section) - остается только
+      он, базовое title (русский текст) убирается, в том числе когда
+      сериализатор не отдает title_en/title_ky, но они есть в модели;
+    - title уже локализован (SerializerMethodField, LocalizedField) -
+      остается он;
+    - title - отдельное значение (например, код категории), а переводы в
+      title_ru и т.д. - локализованное значение отдается как display_title;
+    - иначе добавляется title с локализованным значением.
+    """
+    groups = {}
+    for name, field in fields.items():
+        match = LANGUAGE_FIELD_RE.match(name)
+        if match:
+            groups.setdefault(match['base'], []).append((match['suffix'], field))
+
+    # base -> (ключ локализованного значения или None, убрать ли базовое поле)
+    plan = {}
+    for base, members in groups.items():
+        if len(members) < 2:
+            continue
+        base_field = fields.get(base)
+        russian_base = all(suffix != 'ru' for suffix, _ in members)
+        if base_field is not None and base_field.source == '*':
+            plan[base] = (None, False)
+        elif f'display_{base}' in fields:
+            plan[base] = (None, base_field is not None and russian_base)
+        elif base_field is not None and not russian_base:
+            plan[base] = (f'display_{base}', False)
+        else:
+            plan[base] = (base, base_field is not None)
+    if model is not None:
+        for name, field in fields.items():
+            if (name not in plan and f'display_{name}' in fields and field.source != '*'
+                    and _has_russian_base(model, name)):
+                plan[name] = (None, True)
+    if not plan:
+        return fields
+
+    result = {}
+    for name, field in fields.items():
+        match = LANGUAGE_FIELD_RE.match(name)
+        if match and match['base'] in plan:
+            base = match['base']
+            key, drop_base = plan[base]
+            if key and key not in result and not (key == base and drop_base):
+                result[key] = _localized_field(base, field)
+        elif name in plan and plan[name][1]:
+            key = plan[name][0]
+            if key == name:
+                result[key] = _localized_field(name, groups[name][0][1])
+        else:
+            result[name] = field
+    return result
+
+
+def _has_russian_base(model, name):
+    # name_en/name_ky без name_ru: русский текст хранится в самом name
+    return (not hasattr(model, f'{name}_ru')
+            and any(hasattr(model, f'{name}_{suffix}') for suffix in ('en', 'ky', 'kg')))
+
+
+def _localized_field(base, member):
+    # source колонки перевода: 'title_ru' или 'news.title_ru'
+    source = (member.source or '').rpartition('.')[0]
+    return LocalizedField(field=base, compact=True, source=source or '*')
+
+
+class CompactLanguageMixin:
+    """Для сериализаторов с языковыми колонками: ?compact=1 отдает только язык запроса"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if is_compact(self.context.get('request')):
+            fields = compact_fields(fields, getattr(getattr(self, 'Meta', None), 'model', None))
+        return fields
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from back_su_m.content_versions import bump, get_last_modified, get_versions, tracked_namespaces
+
+
+class Command(BaseCommand):
+    help = 'Показывает версии контента (news, news.news, ...) и увеличивает их'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'namespaces', nargs='*',
+            help='Приложения или модели (app_label.model); по умолчанию - все отслеживаемые'
+        )
+        parser.add_argument(
+            '--bump', action='store_true',
+            help='Увеличить версии, сбросив зависящие от них кэши'
+        )
+
+    def handle(self, *args, **options):
+        known = tracked_namespaces()
+        namespaces = [name.lower() for name in options['namespaces']] or known
+        unknown = sorted(set(namespaces) - set(known))
+        if unknown:
+            raise CommandError(f'Неизвестные пространства имен: {", ".join(unknown)}')
+
+        if options['bump']:
+            bump(*namespaces)
+            self.stdout.write(self.style.SUCCESS(f'Версии увеличены: {len(namespaces)}'))
+
+        versions = get_versions(namespaces)
+        width = max(map(len, namespaces))
+        for name in namespaces:
+            changed = datetime.fromtimestamp(get_last_modified([name])).isoformat(sep=' ')
+            self.stdout.write(f'{name:<{width}}  {versions[name]}  {changed}')
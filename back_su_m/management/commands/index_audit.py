@@ -0,0 +1,82 @@
+import json
+import sys
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from back_su_m.index_audit import AuditError, IndexAudit, read_requests
+
+
+class Command(BaseCommand):
+    help = 'Воспроизводит GET-запросы из access-лога или JSONL и ищет полные сканирования таблиц в планах'
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='+', help='Access-лог gunicorn или JSONL-запись трафика; "-" - stdin')
+        parser.add_argument('--limit', type=int, default=None, help='Только N самых частых запросов')
+        parser.add_argument('--repeat', type=int, default=3, help='Повторов каждого запроса для замера времени')
+        parser.add_argument(
+            '--min-rows', type=int, default=1000,
+            help='Не сообщать о сканировании таблиц меньше этого размера (по умолчанию 1000)'
+        )
+        parser.add_argument('--json', dest='json_path', help='Сохранить отчет в JSON')
+
+    def handle(self, *args, **options):
+        requests = read_requests(self.read_lines(options['logs']))
+        if options['limit']:
+            requests = Counter(dict(requests.most_common(options['limit'])))
+        try:
+            audit = IndexAudit(repeat=options['repeat'], min_rows=options['min_rows'])
+            results = audit.run(requests)
+        except AuditError as error:
+            raise CommandError(str(error))
+        tables = audit.summarize(results)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Эндпоинты'))
+        width = min(max(len(result.target) for result in results), 70)
+        self.stdout.write(f'{"запрос":<{width}}  {"хитов":>6}  {"код":>3}  {"мс":>8}  {"SQL":>4}  {"scan":>4}  {"sort":>4}')
+        for result in results:
+            scans = sum(len(plan.scans) for plan in result.plans)
+            sorts = sum(plan.temp_sort for plan in result.plans)
+            self.stdout.write(
+                f'{result.target[:width]:<{width}}  {result.hits:>6}  {result.status:>3}  '
+                f'{result.milliseconds:>8.2f}  {result.queries:>4}  {scans:>4}  {sorts:>4}'
+            )
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Полные сканирования (таблицы от {options["min_rows"]} строк)'))
+        if not tables:
+            self.stdout.write(self.style.SUCCESS('Не найдено'))
+        for table, entry in tables.items():
+            self.stdout.write(self.style.WARNING(f'{table}: {entry["rows"]} строк, {entry["hits"]} запросов'))
+            for path, hits in entry['endpoints'].most_common(5):
+                self.stdout.write(f'    {hits:>6}  {path}')
+            statements = sorted(entry['statements'].items(), key=lambda item: -item[1]['hits'])
+            for sql, statement in statements[:3]:
+                self.stdout.write(f'    SQL ({statement["hits"]}): {sql[:300]}')
+                for line in statement['plan']:
+                    self.stdout.write(f'      | {line}')
+
+        if options['json_path']:
+            report = {
+                'endpoints': [{
+                    'request': result.target, 'hits': result.hits, 'status': result.status,
+                    'milliseconds': round(result.milliseconds, 3), 'queries': result.queries,
+                    'scans': sorted({table for plan in result.plans for table in plan.scans}),
+                    'temp_sorts': sum(plan.temp_sort for plan in result.plans),
+                    'statements': [{'sql': plan.sql, 'plan': plan.plan} for plan in result.plans],
+                } for result in results],
+                'tables': tables,
+            }
+            with open(options['json_path'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+            self.stdout.write(f'Отчет сохранен: {options["json_path"]}')
+
+    def read_lines(self, paths):
+        for path in paths:
+            if path == '-':
+                yield from sys.stdin
+                continue
+            try:
+                with open(path, encoding='utf-8', errors='replace') as log:
+                    yield from log
+            except OSError as error:
+                raise CommandError(f'Не удалось прочитать {path}: {error}')
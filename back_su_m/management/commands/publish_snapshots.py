@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from back_su_m.snapshots import SNAPSHOTS, SnapshotError, SnapshotPublisher
+
+
+class Command(BaseCommand):
+    help = 'Публикует статические JSON-снимки публичных эндпоинтов и manifest.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names', nargs='*',
+            help=f'Снимки ({", ".join(snapshot.name for snapshot in SNAPSHOTS)}); по умолчанию - все'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Перестроить снимки, даже если версии контента не менялись'
+        )
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Удалить файлы снимков, на которые больше не ссылается манифест'
+        )
+
+    def handle(self, *args, **options):
+        publisher = SnapshotPublisher()
+        try:
+            result = publisher.publish(options['names'], force=options['force'])
+        except SnapshotError as error:
+            raise CommandError(str(error))
+
+        for name, published in result.items():
+            self.stdout.write(f'{name}: {"опубликован" if published else "без изменений"}')
+        if options['prune']:
+            self.stdout.write(f'Удалено устаревших файлов: {publisher.prune()}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Опубликовано снимков: {sum(result.values())} из {len(result)}, манифест: {publisher.manifest_path}'
+        ))
@@ -0,0 +1,235 @@
+"""
+Пагинация списков: номера страниц, режим без COUNT(*) и курсоры (keyset).
+
+KeysetPagination - пагинация по умолчанию (DEFAULT_PAGINATION_CLASS).
+Без дополнительных параметров она работает как PageNumberPagination
+DRF: ?page=N, ответ с count. Клиент может выбрать режим:
+
+- ?count=0 - те же номера страниц, но без COUNT(*): запрашивается
+  page_size + 1 строка, в ответе has_next вместо count;
+- ?cursor= - курсор по ключу сортировки. Страница выбирается условием
+  WHERE (published_at, id) < (значения последней строки), а не OFFSET,
+  поэтому время ответа не зависит от глубины страницы. Курсор следующей
+  и предыдущей страницы - в next/previous; count не считается.
+
+Ключ курсора - сортировка queryset (ordering вью или Meta.ordering
+модели) плюс pk для однозначного порядка при одинаковых значениях.
+Поддерживаются поля без NULL, в том числе через внешние ключи
+(-issue__year). Если сортировку нельзя использовать как ключ (NULL,
+выражения, order_by('?')), ?cursor работает как ?count=0.
+Для быстрых курсоров нужен составной индекс по полям ключа и id.
+"""
+
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+def resolve_key_field(model, path):
+    """Поле модели для элемента сортировки path или None, если оно не годится для ключа"""
+    opts = model._meta
+    parts = path.split('__')
+    try:
+        for part in parts[:-1]:
+            relation = opts.get_field(part)
+            if not (relation.many_to_one or relation.one_to_one) or not relation.concrete or relation.null:
+                return None
+            opts = relation.related_model._meta
+        field = opts.get_field(parts[-1])
+    except FieldDoesNotExist:
+        return None
+    # ForeignKey в ordering сортирует по Meta.ordering связанной модели
+    if not field.concrete or field.is_relation or field.null:
+        return None
+    return field
+
+
+def keyset_ordering(queryset):
+    """[(путь, по убыванию, поле)] ключа курсора или None.
+
+    Последний элемент - всегда pk: ключ однозначно задает порядок строк.
+    Для списков (уже загруженных объектов) ключа нет.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    query = queryset.query
+    if not query.standard_ordering or query.extra_order_by:
+        return None
+    model = queryset.model
+    ordering = list(query.order_by) or (list(model._meta.ordering) if query.default_ordering else [])
+    pk_name = model._meta.pk.name
+    key = []
+    for item in ordering:
+        if not isinstance(item, str) or item == '?':
+            return None
+        descending = item.startswith('-')
+        path = item.lstrip('-+')
+        if path == 'pk':
+            path = pk_name
+        if any(existing == path for existing, _, _ in key):
+            continue
+        field = resolve_key_field(model, path)
+        if field is None:
+            return None
+        key.append((path, descending, field))
+        if path == pk_name:
+            # Поля после pk не влияют на порядок
+            return key
+    key.append((pk_name, key[0][1] if key else False, model._meta.pk))
+    return key
+
+
+def key_values(obj, key):
+    """Значения ключа для объекта страницы"""
+    values = []
+    for path, _, field in key:
+        value = obj
+        for part in path.split('__')[:-1]:
+            value = getattr(value, part)
+        values.append(getattr(value, field.attname))
+    return values
+
+
+def key_order_by(key, reverse=False):
+    """Аргументы order_by для ключа (reverse - в обратном порядке)"""
+    return [f'{"-" if descending != reverse else ""}{path}' for path, descending, _ in key]
+
+
+def encode_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def keyset_filter(key, values, reverse=False):
+    """Q для строк после (reverse - до) строки со значениями ключа values"""
+    conditions = []
+    equal = {}
+    for (path, descending, _), value in zip(key, values):
+        lookup = 'lt' if descending != reverse else 'gt'
+        conditions.append(Q(**equal, **{f'{path}__{lookup}': value}))
+        equal[path] = value
+    # Избыточное условие по первому полю - диапазон для индекса
+    path, descending, _ = key[0]
+    bound = Q(**{f'{path}__{"lte" if descending != reverse else "gte"}': values[0]})
+    return bound & reduce(or_, conditions)
+
+
+class KeysetPagination(PageNumberPagination):
+    """PageNumberPagination с режимом без COUNT(*) (?count=0) и курсорами (?cursor=)"""
+
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.mode = 'pages'
+        if self.cursor_query_param in request.query_params:
+            key = keyset_ordering(queryset)
+            if key is not None:
+                return self.paginate_by_cursor(queryset, request, key)
+            return self.paginate_without_count(queryset, request)
+        if request.query_params.get(self.count_query_param, '').lower() in FALSE_VALUES:
+            return self.paginate_without_count(queryset, request, keyset_ordering(queryset))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode == 'pages':
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.next_link,
+            'previous': self.previous_link,
+            'has_next': self.has_next,
+            'results': data,
+        })
+
+    # Номера страниц без COUNT(*)
+
+    def paginate_without_count(self, queryset, request, key=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.mode = 'without_count'
+        self.display_page_controls = False
+        number = request.query_params.get(self.page_query_param) or 1
+        try:
+            number = int(number)
+            if number < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message)
+        if key is not None:
+            # Строки с одинаковыми значениями сортировки не переходят между страницами
+            queryset = queryset.order_by(*key_order_by(key))
+        offset = (number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(rows) > page_size
+        url = self.request.build_absolute_uri()
+        self.next_link = replace_query_param(url, self.page_query_param, number + 1) if self.has_next else None
+        if number == 1:
+            self.previous_link = None
+        elif number == 2:
+            self.previous_link = remove_query_param(url, self.page_query_param)
+        else:
+            self.previous_link = replace_query_param(url, self.page_query_param, number - 1)
+        return rows[:page_size]
+
+    # Курсоры
+
+    def paginate_by_cursor(self, queryset, request, key):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.mode = 'cursor'
+        self.display_page_controls = False
+        values, reverse = self.decode_cursor(request.query_params[self.cursor_query_param], key)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(key, values, reverse))
+        rows = list(queryset.order_by(*key_order_by(key, reverse))[:page_size + 1])
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_previous, self.has_next = more, True
+        else:
+            has_previous, self.has_next = values is not None, more
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        self.next_link = self.cursor_link(url, key, rows[-1], False) if self.has_next and rows else None
+        self.previous_link = self.cursor_link(url, key, rows[0], True) if has_previous and rows else None
+        if reverse and not rows:
+            # Перед первой строкой ничего нет - ссылка на начало списка
+            self.next_link = replace_query_param(url, self.cursor_query_param, '')
+        return rows
+
+    def cursor_link(self, url, key, obj, reverse):
+        payload = {'k': key_order_by(key), 'v': [encode_value(value) for value in key_values(obj, key)]}
+        if reverse:
+            payload['r'] = 1
+        cursor = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(url, self.cursor_query_param, cursor.rstrip('='))
+
+    def decode_cursor(self, cursor, key):
+        """(значения ключа, назад ли); (None, False) - первая страница"""
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            # Курсор другой сортировки (например, ?ordering) недействителен
+            if payload['k'] != key_order_by(key) or len(payload['v']) != len(key):
+                raise ValueError
+            values = [field.to_python(value) for (_, _, field), value in zip(key, payload['v'])]
+            return values, bool(payload.get('r'))
+        except (binascii.Error, TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,64 @@
+"""
+Быстрый JSON-рендерер и Browsable API только для персонала.
+
+FastJSONRenderer выдает тот же JSON, что и стандартный JSONRenderer DRF
+(компактный, UTF-8, даты и Decimal как у rest_framework.utils.encoders),
+но кодирует его orjson, если пакет установлен: большие агрегаты вроде
+gallery_data рендерятся в несколько раз быстрее. Без orjson и для
+запросов с отступами (?indent, Accept: ...; indent=2) используется
+стандартный рендерер.
+
+StaffBrowsableNegotiation отдает HTML Browsable API только сотрудникам
+(is_staff); остальные клиенты, в том числе браузеры, получают JSON.
+"""
+
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+# Типы, которые orjson кодирует иначе, чем DRF, передаются в default
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+) if orjson else 0
+
+LINE_SEPARATORS = (b'\xe2\x80\xa8', b'\xe2\x80\xa9')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson с кодированием нестандартных типов как в DRF"""
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            # Например, int больше 64 бит - кодирует стандартный рендерер
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как JSONRenderer: U+2028/U+2029 допустимы в JSON, но не в JavaScript
+        if LINE_SEPARATORS[0] in content or LINE_SEPARATORS[1] in content:
+            content = content.replace(LINE_SEPARATORS[0], b'\\u2028').replace(LINE_SEPARATORS[1], b'\\u2029')
+        return content
+
+
+class StaffBrowsableNegotiation(DefaultContentNegotiation):
+    """Browsable API - только для is_staff, остальным - следующий подходящий рендерер"""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        if not self.is_staff(request):
+            renderers = [renderer for renderer in renderers if not isinstance(renderer, BrowsableAPIRenderer)]
+        return super().select_renderer(request, renderers, format_suffix)
+
+    @staticmethod
+    def is_staff(request):
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_staff)
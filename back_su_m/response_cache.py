@@ -0,0 +1,104 @@
+"""
+Кэш готовых JSON-ответов для почти статичных эндпоинтов.
+
+Ключ - (эндпоинт, язык, перечисленные query-параметры, версии моделей).
+При попадании ответ отдается готовыми байтами: ни ORM, ни сериализации,
+ни рендеринга.
+
+Инвалидация - через версии моделей из back_su_m.content_versions:
+любая запись в таблицу модели увеличивает ее версию, и все ключи со
+старой версией перестают находиться. Бэкенд версий общий для всех
+процессов (файловый кэш, Redis; см. back_su_m.E001), поэтому сброс
+виден всем воркерам.
+
+Бэкенд - алиас RESPONSE_CACHE_ALIAS в CACHES (по умолчанию 'responses').
+"""
+
+import functools
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from . import content_versions
+from .locale import get_request_language
+
+RESPONSE_KEY = 'response-cache:{}:{}'
+CACHED_HEADERS = ('Vary', 'Allow', 'Content-Language')
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'responses')]
+
+
+def get_timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60)
+
+
+def get_versions(models):
+    """Версии моделей из реестра в порядке имен"""
+    versions = content_versions.get_versions(models)
+    return [str(versions[name]) for name in sorted(versions)]
+
+
+def get_last_modified(models):
+    """Время последнего изменения моделей (unix time, целые секунды)"""
+    return content_versions.get_last_modified(models)
+
+
+def invalidate_model(model):
+    """Сбрасывает все закэшированные ответы, зависящие от модели"""
+    content_versions.bump(model)
+
+
+def invalidate_on(*models):
+    """Следит за записями в таблицы моделей (см. back_su_m.content_versions)"""
+    content_versions.track(*models)
+
+
+def wants_html(request):
+    # Browsable API не кэшируем
+    return 'text/html' in request.META.get('HTTP_ACCEPT', '')
+
+
+def cached_response(name, models, params=()):
+    """Декоратор для функций-вью (поверх @api_view).
+
+    name   - имя эндпоинта в ключе
+    models - модели, изменение которых сбрасывает кэш
+    params - query-параметры, от которых зависит ответ (кроме lang)
+    """
+    invalidate_on(*models)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or wants_html(request):
+                return view(request, *args, **kwargs)
+
+            parts = [get_request_language(request)]
+            parts += [f'{param}={request.GET.get(param, "")}' for param in params]
+            parts += [str(value) for value in kwargs.values()]
+            parts += get_versions(models)
+            key = RESPONSE_KEY.format(name, ':'.join(parts))
+
+            cache = get_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+                response = HttpResponse(content, content_type=content_type)
+                for header, value in headers.items():
+                    response[header] = value
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and getattr(response, 'accepted_media_type', '').startswith('application/json'):
+                def store(rendered):
+                    headers = {header: rendered[header] for header in CACHED_HEADERS if rendered.has_header(header)}
+                    cache.set(key, (rendered.content, rendered['Content-Type'], headers), get_timeout())
+                response.add_post_render_callback(store)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -4,6 +4,7 @@ Django settings for back_su_m project
 """
 
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 import dj_database_url
@@ -37,6 +38,7 @@ INSTALLED_APPS = [
     'modeltranslation',
 
     # Local
+    'back_su_m.apps.BackSuMConfig',  # Общие механизмы: версии контента, команды
     'news',
     'research',
     'careers',
@@ -56,9 +58,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'back_su_m.compression.CompressionMiddleware',  # gzip/brotli для ответов от RESPONSE_COMPRESSION_MIN_SIZE
     'whitenoise.middleware.WhiteNoiseMiddleware',  # можно убрать, если всё через S3
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.locale.LocaleMiddleware',
+    'back_su_m.locale.RequestLanguageMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -150,8 +153,24 @@ STORAGES = {
             "location": "static",
         },
     },
+    "snapshots": {  # JSON-снимки публичных эндпоинтов (back_su_m/snapshots.py)
+        "BACKEND": "back_su_m.storage.SnapshotStorage",
+        "OPTIONS": {
+            "location": "public",
+        },
+    },
 }
 
+# Снимки: manifest.json и файлы в <location>/snapshots/. SNAPSHOT_HOST -
+# хост для абсолютных ссылок в снимках (по умолчанию из ALLOWED_HOSTS).
+# SNAPSHOT_AUTO_PUBLISH - перестраивать снимки после изменений контента
+# (через SNAPSHOT_PUBLISH_DELAY секунд, в фоне воркера, где была правка).
+SNAPSHOT_STORAGE_ALIAS = 'snapshots'
+SNAPSHOT_PREFIX = 'snapshots'
+SNAPSHOT_HOST = config('SNAPSHOT_HOST', default='')
+SNAPSHOT_AUTO_PUBLISH = config('SNAPSHOT_AUTO_PUBLISH', default=False, cast=bool)
+SNAPSHOT_PUBLISH_DELAY = config('SNAPSHOT_PUBLISH_DELAY', default=30, cast=int)
+
 MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 STATIC_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/static/"
 
@@ -160,19 +179,88 @@ STATIC_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/static/"
 # -------------------
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticatedOrReadOnly'],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # ?page=N как у PageNumberPagination, плюс ?count=0 и курсоры ?cursor= (back_su_m/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'back_su_m.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # JSON через orjson, если он установлен (back_su_m/renderers.py);
+    # Browsable API видят только сотрудники (is_staff)
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'back_su_m.renderers.FastJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'back_su_m.renderers.StaffBrowsableNegotiation',
+}
+
+# Ответы меньше этого размера (байт) не сжимаются
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
+# Размер пачки для потоковых списков (?stream=1, back_su_m/streaming.py)
+STREAMING_CHUNK_SIZE = config('STREAMING_CHUNK_SIZE', default=500, cast=int)
+
+# -------------------
+# Cache
+# -------------------
+# По умолчанию кэш в памяти процесса; для нескольких воркеров gunicorn
+# укажите общий бэкенд, например
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://...
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='su-medical-school'),
+    },
+    # Готовые ответы *_for_frontend эндпоинтов (back_su_m/response_cache.py)
+    # и версии контента. Кэш общий для всех процессов: по умолчанию файлы
+    # во временном каталоге (общие для воркеров одного сервера), для
+    # нескольких серверов - RESPONSE_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+    # RESPONSE_CACHE_LOCATION=redis://...
+    'responses': {
+        'BACKEND': config('RESPONSE_CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config(
+            'RESPONSE_CACHE_LOCATION',
+            default=os.path.join(tempfile.gettempdir(), 'su-medical-school-responses'),
+        ),
+    },
 }
 
+# Реестр версий контента (back_su_m/content_versions.py): счетчики в
+# кэше 'responses'. CONTENT_VERSION_APPS - приложения, записи в таблицы
+# которых меняют версии (по умолчанию - все приложения проекта).
+# Кэш в памяти процесса (LocMemCache, DummyCache) допустим только при
+# DEBUG или CONTENT_VERSION_SINGLE_PROCESS=True, иначе проект не
+# запускается (проверка back_su_m.E001): запись, обработанная одним
+# воркером или командой manage.py, не меняла бы версии в других.
+CONTENT_VERSION_CACHE_ALIAS = 'responses'
+CONTENT_VERSION_SINGLE_PROCESS = config('CONTENT_VERSION_SINGLE_PROCESS', default=False, cast=bool)
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Cache-Control для ответов с ETag/Last-Modified (back_su_m/conditional.py).
+# Версии моделей для ETag - в общем кэше 'responses' (см. выше).
+CONDITIONAL_CACHE_CONTROL = {'public': True, 'no_cache': True}
+
+# Время жизни кэша статистики новостей, секунд (см. news/stats.py)
+NEWS_STATS_CACHE_TIMEOUT = config('NEWS_STATS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Массовый импорт новостей (news/importer.py): строк в пачке и максимум ошибок в отчете
+NEWS_IMPORT_CHUNK_SIZE = config('NEWS_IMPORT_CHUNK_SIZE', default=500, cast=int)
+NEWS_IMPORT_MAX_ERRORS = config('NEWS_IMPORT_MAX_ERRORS', default=1000, cast=int)
+
+# -------------------
+# Счетчики просмотров (back_su_m/view_counter.py)
+# -------------------
+# Интервал фонового сброса буфера в БД, секунд (0 - только вручную)
+VIEW_COUNTER_FLUSH_INTERVAL = config('VIEW_COUNTER_FLUSH_INTERVAL', default=60, cast=int)
+# Окно, в течение которого повторный просмотр с того же IP не учитывается, секунд
+VIEW_COUNTER_DEDUP_WINDOW = config('VIEW_COUNTER_DEDUP_WINDOW', default=24 * 60 * 60, cast=int)
+VIEW_COUNTER_MAX_SEEN = 100_000
+VIEW_COUNTER_MAX_PENDING = 5_000
+
 # -------------------
 # CORS
 # -------------------
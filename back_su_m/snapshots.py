@@ -0,0 +1,236 @@
+"""
+Статические JSON-снимки публичных эндпоинтов.
+
+Тяжелые публичные ответы (списки новостей, complete_data миссии, система
+качества, *_for_frontend секции "О нас", обзор инфраструктуры, галерея)
+рендерятся на каждом языке сайта и сохраняются в хранилище
+SNAPSHOT_STORAGE_ALIAS (S3 за CDN) под версионированными именами:
+
+    snapshots/news/ru.<sha256[:16]>.json
+    snapshots/manifest.json
+
+manifest.json - единственный изменяемый файл: для каждого снимка в нем
+исходный путь API, версии контента (back_su_m.content_versions), по
+которым он построен, и файлы по языкам (path, url, size, sha256).
+Фронтенд читает манифест и берет файлы с CDN; Django получает только
+запросы, которых в снимках нет.
+
+Снимок перестраивается, только если изменились версии его приложений
+(или с force=True). Публикация - командой publish_snapshots или
+автоматически после изменений контента (SNAPSHOT_AUTO_PUBLISH, с
+задержкой SNAPSHOT_PUBLISH_DELAY секунд, чтобы собрать пачку правок).
+"""
+
+import hashlib
+import json
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone, translation
+
+from .content_versions import content_changed, get_versions
+from .locale import SITE_LANGUAGES
+
+MANIFEST_NAME = 'manifest.json'
+
+# name - каталог снимка, path - эндпоинт API, namespaces - версии контента
+Snapshot = namedtuple('Snapshot', 'name path namespaces')
+
+SNAPSHOTS = (
+    Snapshot('news', '/api/news/', ('news',)),
+    Snapshot('news-featured', '/api/news/featured/', ('news',)),
+    Snapshot('news-pinned', '/api/news/pinned/', ('news',)),
+    Snapshot('mission', '/api/mission/api/complete/complete_data/', ('mission_section',)),
+    Snapshot('quality-system', '/api/hsm/quality/system/', ('hsm',)),
+    Snapshot('about-partners', '/api/about-section/partners/frontend/', ('about_section',)),
+    Snapshot('about-with-partners', '/api/about-section/about-with-partners/', ('about_section',)),
+    Snapshot('about-structure', '/api/about-section/structure/frontend/', ('about_section',)),
+    Snapshot('about-achievements', '/api/about-section/achievements/frontend/', ('about_section',)),
+    Snapshot('about-statistics', '/api/about-section/statistics/frontend/', ('about_section',)),
+    Snapshot('infrastructure-overview', '/api/infrastructure/overview/', ('infrastructure',)),
+    Snapshot('student-life-gallery', '/api/student-life/api/data/gallery_data/', ('student_life',)),
+)
+
+
+class SnapshotError(Exception):
+    """Эндпоинт снимка ответил ошибкой"""
+
+
+def get_storage():
+    return storages[getattr(settings, 'SNAPSHOT_STORAGE_ALIAS', 'default')]
+
+
+def get_snapshots(names=None):
+    if not names:
+        return list(SNAPSHOTS)
+    by_name = {snapshot.name: snapshot for snapshot in SNAPSHOTS}
+    unknown = sorted(set(names) - set(by_name))
+    if unknown:
+        raise SnapshotError(f'Неизвестные снимки: {", ".join(unknown)}')
+    return [by_name[name] for name in names]
+
+
+def snapshot_host():
+    host = getattr(settings, 'SNAPSHOT_HOST', None)
+    if host:
+        return host
+    hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+class SnapshotPublisher:
+    """Рендерит снимки и публикует их вместе с манифестом.
+
+    storage - хранилище (по умолчанию SNAPSHOT_STORAGE_ALIAS)
+    prefix  - каталог снимков в хранилище
+    """
+
+    def __init__(self, storage=None, prefix=None):
+        self.storage = storage or get_storage()
+        prefix = getattr(settings, 'SNAPSHOT_PREFIX', 'snapshots') if prefix is None else prefix
+        self.prefix = f'{prefix.strip("/")}/' if prefix.strip('/') else ''
+        self.factory = RequestFactory()
+
+    @property
+    def manifest_path(self):
+        return f'{self.prefix}{MANIFEST_NAME}'
+
+    def load_manifest(self):
+        if not self.storage.exists(self.manifest_path):
+            return {'snapshots': {}}
+        with self.storage.open(self.manifest_path) as manifest:
+            return json.loads(manifest.read())
+
+    def render(self, snapshot, language):
+        """JSON ответа эндпоинта на языке language; None, если данных нет (404)"""
+        request = self.factory.get(
+            snapshot.path, {'lang': language},
+            HTTP_ACCEPT='application/json', HTTP_HOST=snapshot_host(), secure=True,
+        )
+        match = resolve(snapshot.path)
+        with translation.override(language):
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            raise SnapshotError(f'{snapshot.path} ({language}): HTTP {response.status_code}')
+        return response.content
+
+    def publish(self, names=None, force=False):
+        """Публикует снимки names (по умолчанию все); возвращает {имя: опубликован ли}"""
+        manifest = self.load_manifest()
+        entries = manifest.setdefault('snapshots', {})
+        result = {}
+        for snapshot in get_snapshots(names):
+            # Версии берутся до рендера: изменения во время рендера
+            # попадут в следующую публикацию
+            versions = get_versions(snapshot.namespaces)
+            entry = entries.get(snapshot.name)
+            if not force and self.is_current(entry, snapshot, versions):
+                result[snapshot.name] = False
+                continue
+            files = {language: self.save(snapshot, language) for language in SITE_LANGUAGES}
+            entries[snapshot.name] = {
+                'source': snapshot.path,
+                'versions': versions,
+                # Языки без данных отсутствуют - фронтенд обращается к API
+                'files': {language: info for language, info in files.items() if info},
+            }
+            result[snapshot.name] = True
+        if any(result.values()):
+            manifest['generated_at'] = timezone.now().isoformat()
+            self.write_manifest(manifest)
+        return result
+
+    def is_current(self, entry, snapshot, versions):
+        if not entry or entry.get('source') != snapshot.path or entry.get('versions') != versions:
+            return False
+        return all(self.storage.exists(info['path']) for info in entry.get('files', {}).values())
+
+    def save(self, snapshot, language):
+        content = self.render(snapshot, language)
+        if content is None:
+            return None
+        digest = hashlib.sha256(content).hexdigest()
+        path = f'{self.prefix}{snapshot.name}/{language}.{digest[:16]}.json'
+        # Имя зависит от содержимого: такой файл уже опубликован
+        if not self.storage.exists(path):
+            self.storage.save(path, ContentFile(content))
+        return {'path': path, 'url': self.storage.url(path), 'size': len(content), 'sha256': digest}
+
+    def write_manifest(self, manifest):
+        content = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode()
+        # FileSystemStorage не перезаписывает файлы, а добавляет суффикс
+        if self.storage.exists(self.manifest_path):
+            self.storage.delete(self.manifest_path)
+        self.storage.save(self.manifest_path, ContentFile(content))
+
+    def prune(self):
+        """Удаляет файлы снимков, на которые не ссылается манифест; возвращает их число"""
+        manifest = self.load_manifest()
+        removed = 0
+        for name, entry in manifest.get('snapshots', {}).items():
+            current = {info['path'] for info in entry.get('files', {}).values()}
+            directory = f'{self.prefix}{name}'
+            try:
+                _, files = self.storage.listdir(directory)
+            except FileNotFoundError:
+                continue
+            for filename in files:
+                path = f'{directory}/{filename}'
+                if path not in current:
+                    self.storage.delete(path)
+                    removed += 1
+        return removed
+
+
+class AutoPublisher:
+    """Публикует затронутые снимки через SNAPSHOT_PUBLISH_DELAY после изменений"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._timer = None
+
+    @property
+    def delay(self):
+        return getattr(settings, 'SNAPSHOT_PUBLISH_DELAY', 30)
+
+    def content_changed(self, sender, namespaces, **kwargs):
+        names = {snapshot.name for snapshot in SNAPSHOTS if set(snapshot.namespaces) & set(namespaces)}
+        if not names:
+            return
+        with self._lock:
+            self._pending |= names
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._publish_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def publish_pending(self):
+        with self._lock:
+            names, self._pending = self._pending, set()
+            self._timer = None
+        if names:
+            SnapshotPublisher().publish(sorted(names))
+
+    def _publish_in_background(self):
+        try:
+            self.publish_pending()
+        finally:
+            connection.close()
+
+
+auto_publisher = AutoPublisher()
+
+
+def enable_auto_publish():
+    content_changed.connect(auto_publisher.content_changed, dispatch_uid='snapshots-auto-publish')
@@ -0,0 +1,27 @@
+"""
+Хранилища проекта поверх django-storages.
+"""
+
+from storages.backends.s3boto3 import S3Boto3Storage
+
+from .snapshots import MANIFEST_NAME
+
+
+class SnapshotStorage(S3Boto3Storage):
+    """JSON-снимки (back_su_m/snapshots.py).
+
+    Файлы снимков версионированы по содержимому и кэшируются CDN навсегда,
+    manifest.json перезаписывается и кэшируется ненадолго.
+    """
+    file_overwrite = True
+    manifest_cache_control = 'public, max-age=60'
+    snapshot_cache_control = 'public, max-age=31536000, immutable'
+
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        params['ContentType'] = 'application/json; charset=utf-8'
+        if name.rsplit('/', 1)[-1] == MANIFEST_NAME:
+            params['CacheControl'] = self.manifest_cache_control
+        else:
+            params['CacheControl'] = self.snapshot_cache_control
+        return params
@@ -0,0 +1,91 @@
+"""
+Потоковые JSON-ответы для списков без пагинации.
+
+С ?stream=1 списочное действие не собирает всю таблицу в памяти:
+queryset читается через .iterator(chunk_size=...), каждая пачка
+сериализуется и кодируется отдельно, а StreamingHttpResponse отдает
+JSON-массив по частям. Память не зависит от размера таблицы. Без
+параметра ответ прежний (обычный Response), поэтому существующие
+клиенты ничего не замечают.
+
+Ошибка посреди потока уже не может поменять статус ответа: соединение
+обрывается, и клиент получает невалидный JSON.
+
+- StreamingListMixin.list_response - для действий ViewSet;
+- stream_chunks / json_array / json_object_with_array - для функций-вью.
+"""
+
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.response import Response
+
+from .renderers import FastJSONRenderer
+
+STREAM_VALUES = ('1', 'true', 'yes')
+
+renderer = FastJSONRenderer()
+
+
+def get_chunk_size():
+    return getattr(settings, 'STREAMING_CHUNK_SIZE', 500)
+
+
+def wants_stream(request):
+    """Запрошен ли потоковый ответ (?stream=1)"""
+    return request.method == 'GET' and request.GET.get('stream', '').lower() in STREAM_VALUES
+
+
+def stream_chunks(queryset, serializer_class, context, chunk_size=None):
+    """Пачки сериализованных объектов queryset (списки словарей)"""
+    chunk_size = chunk_size or get_chunk_size()
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        objects = list(islice(rows, chunk_size))
+        if not objects:
+            return
+        yield serializer_class(objects, many=True, context=context).data
+
+
+def json_array(chunks, prefix=b'[', suffix=b']'):
+    """Байты JSON-массива из пачек элементов"""
+    yield prefix
+    first = True
+    for items in chunks:
+        if not items:
+            continue
+        # '[a,b]' -> 'a,b': кодирование то же, что у обычного ответа
+        body = renderer.render(list(items))[1:-1]
+        yield body if first else b',' + body
+        first = False
+    yield suffix
+
+
+def json_object_with_array(head, key, chunks):
+    """Байты JSON-объекта: поля head и потоковый массив key последним полем"""
+    opening = renderer.render(head)[:-1]
+    if head:
+        opening += b','
+    opening += json.dumps(key).encode() + b':['
+    return json_array(chunks, prefix=opening, suffix=b']}')
+
+
+def streaming_json_response(content):
+    return StreamingHttpResponse(content, content_type='application/json')
+
+
+class StreamingListMixin:
+    """?stream=1 для списочных действий ViewSet, отдающих всю выборку"""
+
+    stream_chunk_size = None
+
+    def list_response(self, queryset, serializer_class=None):
+        """Response со списком или, при ?stream=1, потоковый JSON-массив"""
+        serializer_class = serializer_class or self.get_serializer_class()
+        context = self.get_serializer_context()
+        if wants_stream(self.request):
+            chunks = stream_chunks(queryset, serializer_class, context, self.stream_chunk_size)
+            return streaming_json_response(json_array(chunks))
+        return Response(serializer_class(queryset, many=True, context=context).data)
@@ -0,0 +1,478 @@
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+from io import StringIO
+import gzip
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from about_section.models import Partner
+from media_coverage.models import MediaArticle
+from news.models import News, NewsCategory, NewsView
+from news.serializers import NewsListSerializer
+from news.views import NewsViewSet
+from research.models import Publication, ResearchArea
+from research.serializers import PublicationListSerializer
+from research.views import PublicationViewSet
+
+from .columns import get_column_plan
+from .renderers import FastJSONRenderer
+from .index_audit import IndexAudit, parse_line, read_requests
+from .pagination import keyset_ordering
+from .content_versions import (
+    check_shared_cache, content_changed, ensure_shared_cache, get_last_modified, get_version, get_versions,
+    tracked_namespaces,
+)
+from .snapshots import SNAPSHOTS, AutoPublisher, SnapshotPublisher
+from .view_counter import flush_all
+
+
+class ContentVersionTests(TestCase):
+    """Любая запись в таблицу модели увеличивает версии модели и приложения"""
+
+    def setUp(self):
+        caches['responses'].clear()
+
+    def versions(self):
+        return get_versions(['about_section.partner', 'about_section', 'news'])
+
+    def create_partner(self, **kwargs):
+        return Partner.objects.create(name='Партнер', name_en='Partner', name_ky='Өнөктөш', **kwargs)
+
+    def assertBumped(self, before, *names):
+        after = self.versions()
+        for name in before:
+            if name in names:
+                self.assertGreater(after[name], before[name], name)
+            else:
+                self.assertEqual(after[name], before[name], name)
+
+    def test_save_delete_and_update(self):
+        before = self.versions()
+        partner = self.create_partner()
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+        before = self.versions()
+        list(Partner.objects.all())
+        self.assertBumped(before)
+
+        Partner.objects.filter(pk=partner.pk).update(order=7)
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+        before = self.versions()
+        Partner.objects.all().delete()
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+    def test_raw_sql(self):
+        partner = self.create_partner()
+        before = self.versions()
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE "{Partner._meta.db_table}" SET "order" = 3 WHERE id = %s', [partner.pk])
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+    def test_admin_edits(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        first, second = self.create_partner(), self.create_partner()
+
+        before = self.versions()
+        response = self.client.post(f'/admin/about_section/partner/{first.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+        before = self.versions()
+        response = self.client.post('/admin/about_section/partner/', {
+            'action': 'delete_selected', '_selected_action': [second.pk], 'post': 'yes',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Partner.objects.exists())
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+    def test_populate_scripts(self):
+        before = self.versions()
+        call_command('populate_partners', stdout=StringIO())
+        self.assertTrue(Partner.objects.exists())
+        self.assertBumped(before, 'about_section.partner', 'about_section')
+
+    def test_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.create_partner()
+                self.create_partner()
+                in_transaction = get_version(Partner)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(get_version(Partner), in_transaction)
+
+    def test_last_modified(self):
+        self.create_partner()
+        changed = get_last_modified([Partner])
+        self.create_partner()
+        self.assertGreater(get_last_modified([Partner]), changed)
+        self.assertEqual(get_last_modified([Partner, News]), max(
+            get_last_modified([Partner]), get_last_modified([News])
+        ))
+
+    def test_command(self):
+        self.assertIn('news.news', tracked_namespaces())
+        self.assertNotIn('auth.user', tracked_namespaces())
+
+        before = get_version(News)
+        out = StringIO()
+        call_command('content_versions', 'news.news', '--bump', stdout=out)
+        self.assertGreater(get_version(News), before)
+        self.assertIn('news.news', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('content_versions', 'unknown', stdout=StringIO())
+
+    def test_process_local_cache_is_rejected(self):
+        local = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        with override_settings(CACHES={**settings.CACHES, 'local': local}, CONTENT_VERSION_CACHE_ALIAS='local'):
+            self.assertEqual([error.id for error in check_shared_cache()], ['back_su_m.E001'])
+            with self.assertRaises(ImproperlyConfigured):
+                ensure_shared_cache()
+            with override_settings(CONTENT_VERSION_SINGLE_PROCESS=True):
+                self.assertEqual(check_shared_cache(), [])
+        self.assertEqual(check_shared_cache(), [])
+
+
+class SnapshotPublisherTests(TestCase):
+    """Снимки публикуются в хранилище с манифестом и перестраиваются по версиям контента"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        storages_setting = {
+            **settings.STORAGES,
+            'snapshots': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.directory.name, 'base_url': 'https://cdn.example.com/'},
+            },
+        }
+        override = self.settings(STORAGES=storages_setting, SNAPSHOT_STORAGE_ALIAS='snapshots')
+        override.enable()
+        self.addCleanup(override.disable)
+
+        category = NewsCategory.objects.create(
+            name=NewsCategory.NEWS, slug='news', name_ru='Новости', name_kg='Жаңылыктар', name_en='News'
+        )
+        News.objects.create(
+            title_ru='Новость', title_kg='Жаңылык', title_en='News', slug='news-1',
+            summary_ru='Описание', content_ru='Текст', category=category,
+        )
+        self.partner = Partner.objects.create(name='Партнер', name_en='Partner', name_ky='Өнөктөш')
+
+    def manifest(self):
+        with open(os.path.join(self.directory.name, 'snapshots', 'manifest.json'), encoding='utf-8') as manifest:
+            return json.load(manifest)
+
+    def read(self, info):
+        with open(os.path.join(self.directory.name, info['path']), encoding='utf-8') as snapshot:
+            return json.load(snapshot)
+
+    def test_publish_all(self):
+        out = StringIO()
+        call_command('publish_snapshots', stdout=out)
+        manifest = self.manifest()
+        self.assertEqual(set(manifest['snapshots']), {snapshot.name for snapshot in SNAPSHOTS})
+
+        files = manifest['snapshots']['news']['files']
+        self.assertEqual(set(files), {'ru', 'ky', 'en'})
+        self.assertTrue(files['ky']['url'].startswith('https://cdn.example.com/snapshots/news/ky.'))
+        self.assertEqual(self.read(files['ky']), self.client.get('/api/news/', {'lang': 'ky'}).json())
+        self.assertEqual(self.read(files['en'])['results'][0]['title_en'], 'News')
+
+        partners = self.read(manifest['snapshots']['about-partners']['files']['ky'])
+        self.assertEqual(partners['data'][0]['name'], 'Өнөктөш')
+        # Раздела "О нас" нет (404) - файлов нет, фронтенд идет в API
+        self.assertEqual(manifest['snapshots']['about-with-partners']['files'], {})
+
+    def test_republished_only_on_change(self):
+        publisher = SnapshotPublisher()
+        publisher.publish()
+        old_path = self.manifest()['snapshots']['about-partners']['files']['en']['path']
+
+        self.assertFalse(any(publisher.publish().values()))
+
+        self.partner.name_en = 'Renamed partner'
+        self.partner.save()
+        result = publisher.publish()
+        self.assertTrue(result['about-partners'])
+        self.assertFalse(result['news'])
+        files = self.manifest()['snapshots']['about-partners']['files']
+        self.assertNotEqual(files['en']['path'], old_path)
+        self.assertEqual(self.read(files['en'])['data'][0]['name'], 'Renamed partner')
+
+        # Старые файлы остаются для клиентов со старым манифестом до prune
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, old_path)))
+        self.assertGreater(publisher.prune(), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, old_path)))
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, files['en']['path'])))
+
+    def test_auto_publish(self):
+        publisher = AutoPublisher()
+        content_changed.connect(publisher.content_changed, dispatch_uid='test-auto-publish')
+        self.addCleanup(content_changed.disconnect, dispatch_uid='test-auto-publish')
+        with self.settings(SNAPSHOT_PUBLISH_DELAY=3600):
+            self.partner.save()
+        publisher._timer.cancel()
+        self.assertTrue({'about-partners', 'about-statistics'} <= publisher._pending)
+        self.assertNotIn('news', publisher._pending)
+
+        publisher.publish_pending()
+        self.assertIn('about-partners', self.manifest()['snapshots'])
+        self.assertNotIn('news', self.manifest()['snapshots'])
+
+
+class RenderingTests(TestCase):
+    """orjson-рендерер совпадает с JSONRenderer, Browsable API - только персоналу, сжатие"""
+
+    def test_fast_renderer_matches_drf(self):
+        data = ReturnDict({
+            'datetime': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'date': date(2026, 1, 2),
+            'time': dt_time(3, 4, 5, 678901),
+            'decimal': Decimal('1.50'),
+            'lazy': gettext_lazy('Новости'),
+            'separator': 'a b',
+            1: ('x', None, True, 1.5),
+        }, serializer=None)
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_browsable_api_for_staff_only(self):
+        url = '/api/about-section/partners/'
+        response = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        self.client.force_login(User.objects.create_user('staff', password='password', is_staff=True))
+        response = self.client.get(url, HTTP_ACCEPT='text/html')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+    def test_compression(self):
+        for index in range(30):
+            Partner.objects.create(name=f'Партнер {index}', name_en='Partner', name_ky='Өнөктөш')
+        url = '/api/about-section/partners/'
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 30)
+
+        response = self.client.get('/api/about-section/partners/stats/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class KeysetPaginationTests(TestCase):
+    """Курсоры и режим без COUNT(*) выдают те же строки, что и номера страниц"""
+
+    def setUp(self):
+        category = NewsCategory.objects.create(
+            name=NewsCategory.NEWS, slug='news', name_ru='Новости', name_kg='Жаңылыктар', name_en='News'
+        )
+        # Пары новостей с одинаковой датой: порядок задает id
+        published = [datetime(2026, 1, 1 + index // 2, tzinfo=timezone.utc) for index in range(45)]
+        News.objects.bulk_create([
+            News(title_ru=f'Новость {index}', slug=f'news-{index}', summary_ru='Описание', content_ru='Текст',
+                 category=category, published_at=published_at)
+            for index, published_at in enumerate(published)
+        ])
+        self.expected = list(News.objects.order_by('-published_at', '-id').values_list('id', flat=True))
+
+    def collect(self, url):
+        ids, pages = [], []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                data = self.client.get(url).json()
+            self.assertFalse([query for query in queries if 'COUNT(' in query['sql'].upper()])
+            self.assertNotIn('count', data)
+            ids += [item['id'] for item in data['results']]
+            pages.append(data)
+            url = data['next']
+        return ids, pages
+
+    def test_cursor_walk(self):
+        ids, pages = self.collect('/api/news/?cursor=')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([page['has_next'] for page in pages], [True, True, False])
+        self.assertIsNone(pages[0]['previous'])
+
+        previous = self.client.get(pages[2]['previous']).json()
+        self.assertEqual([item['id'] for item in previous['results']], self.expected[20:40])
+        self.assertTrue(previous['has_next'])
+
+    def test_without_count(self):
+        ids, pages = self.collect('/api/news/?count=0')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(len(pages), 3)
+
+        self.assertEqual(self.client.get('/api/news/?count=0&page=4').status_code, 404)
+        self.assertEqual(self.client.get('/api/news/').json()['count'], 45)
+
+    def test_cursor_follows_ordering(self):
+        ids, _ = self.collect('/api/news/?cursor=&ordering=published_at')
+        expected = list(News.objects.order_by('published_at', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+        cursor = self.client.get('/api/news/?cursor=').json()['next'].split('cursor=')[1]
+        response = self.client.get(f'/api/news/?ordering=published_at&cursor={cursor}')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get('/api/news/?cursor=garbage').status_code, 404)
+
+    def test_media_key_matches_index(self):
+        key = keyset_ordering(MediaArticle.objects.filter(is_published=True))
+        index = next(index for index in MediaArticle._meta.indexes if index.name == 'media_article_published_idx')
+        self.assertEqual([path for path, _, _ in key], index.fields)
+
+
+class IndexAuditTests(TestCase):
+    """Разбор access-лога и JSONL, отчет о полных сканированиях"""
+
+    def test_parse_line(self):
+        self.assertEqual(
+            parse_line('10.0.0.1 - - [18/Oct/2026:10:00:00 +0000] "GET /api/news/?page=2 HTTP/1.1" 200 12 "-" "-"'),
+            '/api/news/?page=2',
+        )
+        self.assertEqual(parse_line('{"method": "GET", "url": "https://example.com/api/news/?lang=en"}'),
+                         '/api/news/?lang=en')
+        self.assertEqual(parse_line('{"path": "/api/news/", "query": {"page": 3}}'), '/api/news/?page=3')
+        self.assertIsNone(parse_line('10.0.0.1 - - [18/Oct/2026] "POST /api/careers/applications/ HTTP/1.1" 201'))
+        self.assertIsNone(parse_line('{"method": "GET"'))
+        self.assertIsNone(parse_line('garbage'))
+
+    def test_command_reports_scans(self):
+        for index in range(3):
+            Partner.objects.create(name=f'Партнер {index}', name_en='Partner', name_ky='Өнөктөш')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        log = os.path.join(directory.name, 'traffic.jsonl')
+        report = os.path.join(directory.name, 'report.json')
+        with open(log, 'w', encoding='utf-8') as traffic:
+            traffic.write('{"method": "GET", "path": "/api/about-section/partners/"}\n' * 2)
+            traffic.write('{"method": "DELETE", "path": "/api/about-section/partners/1/"}\n')
+
+        call_command('index_audit', log, '--min-rows', '0', '--repeat', '1', '--json', report, stdout=StringIO())
+        with open(report, encoding='utf-8') as output:
+            data = json.load(output)
+        self.assertEqual([(item['request'], item['hits'], item['status']) for item in data['endpoints']],
+                         [('/api/about-section/partners/', 2, 200)])
+        self.assertEqual(data['tables']['about_section_partner']['hits'], 2)
+        # Воспроизведение не меняет данные
+        self.assertEqual(Partner.objects.count(), 3)
+
+        with self.assertRaises(CommandError):
+            call_command('index_audit', report, stdout=StringIO())
+
+    @override_settings(VIEW_COUNTER_FLUSH_INTERVAL=0)
+    def test_replay_does_not_count_views(self):
+        category = NewsCategory.objects.create(
+            name=NewsCategory.NEWS, slug='news', name_ru='Новости', name_kg='Жаңылыктар', name_en='News'
+        )
+        news = News.objects.create(
+            title_ru='Новость', title_kg='Жаңылык', title_en='News', slug='news-1',
+            summary_ru='Описание', content_ru='Текст', category=category,
+        )
+        flush_all()
+        IndexAudit(repeat=2, min_rows=0).run(read_requests(['{"path": "/api/news/news-1/"}']))
+        self.assertEqual(flush_all(), 0)
+        news.refresh_from_db()
+        self.assertEqual(news.views_count, 0)
+        self.assertFalse(NewsView.objects.exists())
+
+
+class ColumnPlanTests(TestCase):
+    """Списки загружают только колонки сериализатора, без догрузки по строкам"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        category = NewsCategory.objects.create(
+            name=NewsCategory.NEWS, slug='news', name_ru='Новости', name_kg='Жаңылыктар', name_en='News'
+        )
+        for index in range(3):
+            News.objects.create(
+                title_ru=f'Новость {index}', title_kg='Жаңылык', title_en='News', slug=f'news-{index}',
+                summary_ru='Описание', summary_kg='Сүрөттөмө', summary_en='Summary',
+                content_ru='Текст', content_kg='Текст', content_en='Text', category=category,
+            )
+        area = ResearchArea.objects.create(
+            title_ru='Медицина', title_en='Medicine', title_kg='Медицина',
+            description_ru='-', description_en='-', description_kg='-',
+        )
+        for index in range(3):
+            Publication.objects.create(
+                title_ru=f'Статья {index}', title_en='Article', title_kg='Макала',
+                authors_ru='Иванов И.И.', authors_en='Ivanov I.I.', authors_kg='',
+                journal='Журнал', publication_date=date(2024, 1, 1 + index),
+                abstract_ru='Аннотация', research_area=area,
+            )
+
+    def list_queryset(self, viewset, query=''):
+        request = Request(APIRequestFactory().get(f'/?{query}'))
+        return viewset(action='list', request=request, format_kwarg=None, kwargs={}).get_queryset()
+
+    def deferred(self, queryset):
+        names, defer = queryset.query.deferred_loading
+        self.assertTrue(defer)
+        return names
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query['sql'] for query in context.captured_queries]
+
+    def test_plan_follows_serializer(self):
+        plan = get_column_plan(NewsListSerializer)
+        self.assertIn('category', plan['select_related'])
+        self.assertLessEqual({'content_ru', 'content_kg', 'content_en'}, plan['defer'])
+        self.assertFalse({'summary_ru', 'title_ru'} & plan['defer'])
+
+        plan = get_column_plan(PublicationListSerializer)
+        self.assertEqual(plan['select_related'], {'research_area', 'research_center'})
+        self.assertLessEqual({'abstract_ru', 'abstract_en', 'abstract_kg', 'keywords_ru'}, plan['defer'])
+
+    def test_news_list(self):
+        deferred = self.deferred(self.list_queryset(NewsViewSet))
+        self.assertLessEqual({'content_ru', 'content_kg', 'content_en'}, deferred)
+        self.assertNotIn('summary_ru', deferred)
+
+        # Страница, теги, счетчик - без запросов на каждую строку
+        with self.assertNumQueries(3):
+            data, statements = self.get('/api/news/')
+        self.assertEqual(len(data['results']), 3)
+        self.assertFalse(any('content_ru' in sql for sql in statements))
+
+    def test_publication_list(self):
+        deferred = self.deferred(self.list_queryset(PublicationViewSet))
+        self.assertLessEqual({'abstract_ru', 'abstract_en', 'abstract_kg'}, deferred)
+
+        with self.assertNumQueries(2):
+            data, statements = self.get('/research/api/publications/')
+        self.assertEqual(len(data['results']), 3)
+        self.assertEqual(data['results'][0]['research_area_name'], 'Медицина')
+        self.assertFalse(any('abstract_ru' in sql for sql in statements))
+
+    def test_compact_defers_other_languages(self):
+        deferred = self.deferred(self.list_queryset(NewsViewSet, 'lang=en&compact=1'))
+        self.assertLessEqual({'title_kg', 'summary_kg', 'category__name_kg'}, deferred)
+        self.assertFalse({'title_en', 'title_ru', 'summary_en'} & deferred)
+
+        with self.assertNumQueries(3):
+            data, statements = self.get('/api/news/?lang=en&compact=1')
+        self.assertEqual(data['results'][0]['title'], 'News')
+        self.assertFalse(any('title_kg' in sql or 'summary_kg' in sql for sql in statements))
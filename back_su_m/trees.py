@@ -0,0 +1,56 @@
+"""
+Иерархии (parent -> children) за один запрос.
+
+Сериализаторы иерархий - должности научного управления, организационная
+структура, руководство - получали детей запросом на каждый узел, и
+дерево из трех уровней стоило десятки запросов. NodeTree загружает все
+узлы одним запросом и раскладывает их по parent_id в памяти;
+TreeChildrenMixin отдает children из дерева, общего для всего ответа
+(хранится в context сериализатора), поэтому ответ любой глубины - это
+запрос корней и один запрос дерева.
+"""
+
+from collections import defaultdict
+
+TREES_CONTEXT_KEY = 'node_trees'
+
+
+class NodeTree:
+    """Узлы, сгруппированные по родителю; порядок детей - порядок nodes"""
+
+    def __init__(self, nodes, parent_attr='parent_id'):
+        self.nodes = list(nodes)
+        self._children = defaultdict(list)
+        for node in self.nodes:
+            self._children[getattr(node, parent_attr)].append(node)
+
+    def children(self, node):
+        return self._children.get(node.pk, [])
+
+    def roots(self):
+        return self._children.get(None, [])
+
+
+def get_tree(context, key, queryset, parent_attr='parent_id'):
+    """NodeTree из context; загружается один раз на ответ"""
+    trees = context.setdefault(TREES_CONTEXT_KEY, {})
+    if key not in trees:
+        trees[key] = NodeTree(queryset, parent_attr)
+    return trees[key]
+
+
+class TreeChildrenMixin:
+    """children сериализатора иерархии из NodeTree вместо запроса на узел.
+
+    tree_queryset    - все узлы, которые выводятся как дети, в порядке вывода
+    tree_parent_attr - атрибут с id родителя
+    """
+    tree_queryset = None
+    tree_parent_attr = 'parent_id'
+
+    def get_tree(self):
+        return get_tree(self.context, type(self), self.tree_queryset.all(), self.tree_parent_attr)
+
+    def get_children(self, obj):
+        children = self.get_tree().children(obj)
+        return type(self)(children, many=True, context=self.context).data
@@ -0,0 +1,254 @@
+"""
+Буферизованный счетчик просмотров.
+
+Детальные страницы не пишут в БД: просмотры копятся в памяти процесса
+и периодически сбрасываются пачкой (INSERT ... ON CONFLICT DO NOTHING
+журнала просмотров и один UPDATE счетчиков views_count). Счетчики
+увеличиваются только на действительно вставленные строки журнала, поэтому
+одновременный сброс одной пары (объект, IP) из нескольких процессов
+учитывается один раз. Если запись в БД не удалась, просмотры
+возвращаются в буфер до следующего сброса.
+
+Журнал просмотров и сброс views_count не меняют версии контента
+(back_su_m.content_versions): обычные просмотры не должны сбрасывать
+ETag и кэш ответов.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from .content_versions import untrack, untracked_writes
+
+logger = logging.getLogger(__name__)
+
+# Строк журнала в одном INSERT
+INSERT_BATCH_SIZE = 250
+
+# Поток, в котором учет просмотров приостановлен (recording_paused)
+_paused = threading.local()
+
+
+class BufferedViewCounter:
+    """Копит просмотры и сбрасывает их в БД агрегированно.
+
+    model       - модель со счетчиком views_count (News, MediaArticle)
+    view_model  - журнал просмотров с unique_together (объект, ip_address)
+    field_name  - имя FK на model в view_model
+    """
+
+    def __init__(self, model, view_model, field_name):
+        self.model = model
+        self.view_model = view_model
+        self.field_name = field_name
+        self._lock = threading.Lock()
+        self._pending = {}  # (object_id, ip) -> user_agent
+        self._seen = OrderedDict()  # (object_id, ip) -> время последнего учета
+        self._timer = None
+        untrack(view_model)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'VIEW_COUNTER_FLUSH_INTERVAL', 60)
+
+    @property
+    def dedup_window(self):
+        return getattr(settings, 'VIEW_COUNTER_DEDUP_WINDOW', 24 * 60 * 60)
+
+    @property
+    def max_seen(self):
+        return getattr(settings, 'VIEW_COUNTER_MAX_SEEN', 100_000)
+
+    @property
+    def max_pending(self):
+        return getattr(settings, 'VIEW_COUNTER_MAX_PENDING', 5_000)
+
+    def record(self, object_id, ip_address, user_agent=''):
+        """Учитывает просмотр без обращения к БД"""
+        if not ip_address or getattr(_paused, 'active', False):
+            return
+        key = (object_id, ip_address)
+        now = time.monotonic()
+        with self._lock:
+            seen_at = self._seen.get(key)
+            if seen_at is not None and now - seen_at < self.dedup_window:
+                return
+            self._seen[key] = now
+            self._seen.move_to_end(key)
+            while len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+            self._pending.setdefault(key, user_agent)
+            overflow = len(self._pending) >= self.max_pending
+        self._schedule_flush(immediately=overflow)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Сбрасывает накопленные просмотры в БД, возвращает число новых просмотров.
+
+        Просмотры удаленных объектов отбрасываются. При ошибке БД просмотры
+        возвращаются в буфер, исключение пробрасывается.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with transaction.atomic(), untracked_writes():
+                pending = self._drop_deleted(pending)
+                increments = self._insert_views(pending)
+                self._increment(increments)
+        except Exception:
+            self._restore(pending)
+            raise
+        return sum(increments.values())
+
+    def _drop_deleted(self, pending):
+        """Просмотры существующих объектов; строки блокируются до конца транзакции.
+
+        Иначе INSERT журнала падал бы на внешнем ключе, а возвращенный в
+        буфер просмотр ломал бы и все следующие сбросы.
+        """
+        object_ids = {object_id for object_id, _ in pending}
+        existing = set(
+            self.model.objects.select_for_update().filter(pk__in=object_ids)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        if len(existing) == len(object_ids):
+            return pending
+        return {key: user_agent for key, user_agent in pending.items() if key[0] in existing}
+
+    def _restore(self, pending):
+        with self._lock:
+            for key, user_agent in pending.items():
+                self._pending.setdefault(key, user_agent)
+
+    def _insert_views(self, pending):
+        """Вставляет журнал просмотров, возвращает Counter {object_id: вставлено строк}"""
+        if not connection.features.can_return_rows_from_bulk_insert:
+            return self._insert_views_one_by_one(pending)
+        meta = self.view_model._meta
+        quote = connection.ops.quote_name
+        fields = [meta.get_field(self.field_name), meta.get_field('ip_address'),
+                  meta.get_field('user_agent'), meta.get_field('viewed_at')]
+        fk_column = quote(fields[0].column)
+        columns = ', '.join(quote(field.column) for field in fields)
+        viewed_at = fields[3].get_db_prep_value(timezone.now(), connection)
+        rows = [(object_id, ip, user_agent, viewed_at) for (object_id, ip), user_agent in pending.items()]
+        increments = Counter()
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                batch = rows[start:start + INSERT_BATCH_SIZE]
+                values = ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+                cursor.execute(
+                    f'INSERT INTO {quote(meta.db_table)} ({columns}) VALUES {values} '
+                    f'ON CONFLICT DO NOTHING RETURNING {fk_column}',
+                    [value for row in batch for value in row],
+                )
+                increments.update(object_id for object_id, in cursor.fetchall())
+        return increments
+
+    def _insert_views_one_by_one(self, pending):
+        # СУБД без INSERT ... RETURNING для нескольких строк
+        increments = Counter()
+        for (object_id, ip), user_agent in pending.items():
+            _, created = self.view_model.objects.get_or_create(
+                **{f'{self.field_name}_id': object_id, 'ip_address': ip},
+                defaults={'user_agent': user_agent},
+            )
+            if created:
+                increments[object_id] += 1
+        return increments
+
+    def _increment(self, increments):
+        if not increments:
+            return
+        self.model.objects.filter(pk__in=increments).update(
+            views_count=Case(
+                *[When(pk=object_id, then=F('views_count') + count)
+                  for object_id, count in increments.items()],
+                default=F('views_count'),
+                output_field=self.model._meta.get_field('views_count'),
+            )
+        )
+
+    def _schedule_flush(self, immediately=False):
+        """Планирует фоновый сброс; VIEW_COUNTER_FLUSH_INTERVAL = 0 отключает его"""
+        interval = self.flush_interval
+        if not interval:
+            return
+        with self._lock:
+            if self._timer is not None:
+                if not immediately:
+                    return
+                self._timer.cancel()
+            self._timer = threading.Timer(0 if immediately else interval, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Не удалось сбросить просмотры %s, повтор при следующем сбросе', self.model._meta.label)
+            self._schedule_flush()
+        finally:
+            connection.close()
+
+
+@contextmanager
+def recording_paused():
+    """Просмотры в текущем потоке внутри блока не учитываются (воспроизведение запросов)"""
+    previous = getattr(_paused, 'active', False)
+    _paused.active = True
+    try:
+        yield
+    finally:
+        _paused.active = previous
+
+
+_counters = []
+
+
+def get_view_counter(model, view_model, field_name):
+    """Возвращает общий для процесса счетчик для пары моделей"""
+    for counter in _counters:
+        if counter.model is model and counter.view_model is view_model:
+            return counter
+    counter = BufferedViewCounter(model, view_model, field_name)
+    _counters.append(counter)
+    return counter
+
+
+def flush_all():
+    """Сбрасывает все счетчики процесса"""
+    return sum(counter.flush() for counter in _counters)
+
+
+@atexit.register
+def _flush_on_exit():
+    for counter in _counters:
+        try:
+            counter.flush()
+        except Exception:
+            logger.exception('Просмотры %s не сохранены при завершении процесса', counter.model._meta.label)
+
+
+def get_client_ip(request):
+    """IP клиента с учетом X-Forwarded-For"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
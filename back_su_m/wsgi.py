@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'back_su_m.settings')
 
 application = get_wsgi_application()
+
+# Воркеры не запускаются с версиями контента в памяти процесса
+from back_su_m.content_versions import ensure_shared_cache  # noqa: E402
+
+ensure_shared_cache()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0003_vacancy_tags_en_vacancy_tags_kg_vacancy_tags_ru_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vacancyapplication',
+            index=models.Index(fields=['submitted_at', 'id'], name='careers_app_submitted_idx'),
+        ),
+    ]
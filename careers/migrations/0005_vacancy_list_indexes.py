@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0004_application_submitted_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'is_featured', 'posted_date'], name='careers_vac_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'posted_date'], name='careers_vac_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'deadline'], name='careers_vac_deadline_idx'),
+        ),
+    ]
@@ -396,6 +396,10 @@ class Vacancy(models.Model):
             models.Index(fields=['status', 'category']),
             models.Index(fields=['posted_date']),
             models.Index(fields=['deadline']),
+            # Списки опубликованных вакансий: сортировка, последние, истекающие
+            models.Index(fields=['status', 'is_featured', 'posted_date'], name='careers_vac_featured_idx'),
+            models.Index(fields=['status', 'posted_date'], name='careers_vac_posted_idx'),
+            models.Index(fields=['status', 'deadline'], name='careers_vac_deadline_idx'),
         ]
     
     def __str__(self):
@@ -571,6 +575,10 @@ class VacancyApplication(models.Model):
         verbose_name_plural = _('Заявки на вакансии')
         ordering = ['-submitted_at']
         unique_together = ['vacancy', 'email']
+        indexes = [
+            # Ключ курсорной пагинации списка заявок
+            models.Index(fields=['submitted_at', 'id'], name='careers_app_submitted_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.vacancy.title_ru}"
@@ -1,54 +1,16 @@
 from rest_framework import serializers
-from django.utils import translation
+from back_su_m.locale import LocalizedField, LocalizedSerializerMixin
 from .models import CareerCategory, Department, Vacancy, VacancyApplication
 
 
-class LanguageAwareSerializer(serializers.ModelSerializer):
-    """Базовый сериализатор с поддержкой языков"""
-    
-    def get_localized_field(self, instance, field_name):
-        """Получить переведенное поле в зависимости от текущего языка"""
-        # Получаем язык из заголовка запроса или используем текущий язык Django
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-            # Преобразуем 'ky' в 'kg' для совместимости с полями базы данных
-            if current_language == 'ky':
-                current_language = 'kg'
-        else:
-            current_language = translation.get_language() or 'ru'
-            if current_language == 'ky':
-                current_language = 'kg'
-        
-        # Попробуем получить поле для текущего языка
-        localized_field = f"{field_name}_{current_language}"
-        if hasattr(instance, localized_field):
-            value = getattr(instance, localized_field)
-            if value:
-                return value
-        
-        # Если нет перевода для текущего языка, попробуем русский (по умолчанию)
-        default_field = f"{field_name}_ru"
-        if hasattr(instance, default_field):
-            value = getattr(instance, default_field)
-            if value:
-                return value
-        
-        # Если русского тоже нет, попробуем английский
-        english_field = f"{field_name}_en"
-        if hasattr(instance, english_field):
-            value = getattr(instance, english_field)
-            if value:
-                return value
-        
-        # Если ничего нет, вернем пустую строку
-        return ""
+class LanguageAwareSerializer(LocalizedSerializerMixin, serializers.ModelSerializer):
+    """Базовый сериализатор с поддержкой языков (язык запроса - back_su_m.locale)"""
 
 
 class CareerCategorySerializer(LanguageAwareSerializer):
     """Сериализатор для категорий карьеры"""
-    display_name = serializers.SerializerMethodField()
-    description = serializers.SerializerMethodField()
+    display_name = LocalizedField()
+    description = LocalizedField()
     
     class Meta:
         model = CareerCategory
@@ -61,19 +23,13 @@ class CareerCategorySerializer(LanguageAwareSerializer):
             'is_active',
             'order'
         ]
-    
-    def get_display_name(self, obj):
-        return self.get_localized_field(obj, 'display_name')
-    
-    def get_description(self, obj):
-        return self.get_localized_field(obj, 'description')
 
 
 class DepartmentSerializer(LanguageAwareSerializer):
     """Сериализатор для подразделений"""
-    name = serializers.SerializerMethodField()
-    description = serializers.SerializerMethodField()
-    head_name = serializers.SerializerMethodField()
+    name = LocalizedField()
+    description = LocalizedField()
+    head_name = LocalizedField()
     
     class Meta:
         model = Department
@@ -87,15 +43,6 @@ class DepartmentSerializer(LanguageAwareSerializer):
             'contact_phone',
             'is_active'
         ]
-    
-    def get_name(self, obj):
-        return self.get_localized_field(obj, 'name')
-    
-    def get_description(self, obj):
-        return self.get_localized_field(obj, 'description')
-    
-    def get_head_name(self, obj):
-        return self.get_localized_field(obj, 'head_name')
 
 
 class VacancyListSerializer(LanguageAwareSerializer):
@@ -107,11 +54,11 @@ class VacancyListSerializer(LanguageAwareSerializer):
     is_expired = serializers.ReadOnlyField()
     
     # Мультиязычные поля
-    title = serializers.SerializerMethodField()
-    location = serializers.SerializerMethodField()
-    experience_years = serializers.SerializerMethodField()
-    education_level = serializers.SerializerMethodField()
-    short_description = serializers.SerializerMethodField()
+    title = LocalizedField()
+    location = LocalizedField()
+    experience_years = LocalizedField()
+    education_level = LocalizedField()
+    short_description = LocalizedField()
     
     class Meta:
         model = Vacancy
@@ -137,33 +84,8 @@ class VacancyListSerializer(LanguageAwareSerializer):
             'applications_count'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj, 'title')
-    
-    def get_location(self, obj):
-        return self.get_localized_field(obj, 'location')
-    
-    def get_experience_years(self, obj):
-        return self.get_localized_field(obj, 'experience_years')
-    
-    def get_education_level(self, obj):
-        return self.get_localized_field(obj, 'education_level')
-    
-    def get_short_description(self, obj):
-        return self.get_localized_field(obj, 'short_description')
-    
     def get_tags_list(self, obj):
-        # Получаем текущий язык из запроса
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-            # Преобразуем 'ky' в 'kg' для совместимости с полями базы данных
-            if current_language == 'ky':
-                current_language = 'kg'
-        else:
-            current_language = 'ru'
-        
-        return obj.get_tags_list(current_language)
+        return obj.get_tags_list(self.language)
 
 
 class VacancyDetailSerializer(LanguageAwareSerializer):
@@ -178,15 +100,15 @@ class VacancyDetailSerializer(LanguageAwareSerializer):
     is_expired = serializers.ReadOnlyField()
     
     # Мультиязычные поля
-    title = serializers.SerializerMethodField()
-    location = serializers.SerializerMethodField()
-    experience_years = serializers.SerializerMethodField()
-    education_level = serializers.SerializerMethodField()
-    short_description = serializers.SerializerMethodField()
-    description = serializers.SerializerMethodField()
-    responsibilities = serializers.SerializerMethodField()
-    requirements = serializers.SerializerMethodField()
-    conditions = serializers.SerializerMethodField()
+    title = LocalizedField()
+    location = LocalizedField()
+    experience_years = LocalizedField()
+    education_level = LocalizedField()
+    short_description = LocalizedField()
+    description = LocalizedField()
+    responsibilities = LocalizedField()
+    requirements = LocalizedField()
+    conditions = LocalizedField()
     
     class Meta:
         model = Vacancy
@@ -223,75 +145,17 @@ class VacancyDetailSerializer(LanguageAwareSerializer):
             'applications_count'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj, 'title')
-    
-    def get_location(self, obj):
-        return self.get_localized_field(obj, 'location')
-    
-    def get_experience_years(self, obj):
-        return self.get_localized_field(obj, 'experience_years')
-    
-    def get_education_level(self, obj):
-        return self.get_localized_field(obj, 'education_level')
-    
-    def get_short_description(self, obj):
-        return self.get_localized_field(obj, 'short_description')
-    
-    def get_description(self, obj):
-        return self.get_localized_field(obj, 'description')
-    
-    def get_responsibilities(self, obj):
-        return self.get_localized_field(obj, 'responsibilities')
-    
-    def get_requirements(self, obj):
-        return self.get_localized_field(obj, 'requirements')
-    
-    def get_conditions(self, obj):
-        return self.get_localized_field(obj, 'conditions')
-    
     def get_tags_list(self, obj):
-        # Получаем текущий язык из запроса
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-            # Преобразуем 'ky' в 'kg' для совместимости с полями базы данных
-            if current_language == 'ky':
-                current_language = 'kg'
-        else:
-            current_language = 'ru'
-        
-        return obj.get_tags_list(current_language)
+        return obj.get_tags_list(self.language)
     
     def get_responsibilities_list(self, obj):
-        # Получаем текущий язык из запроса
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-        else:
-            current_language = 'ru'
-        
-        return obj.get_responsibilities_list(current_language)
+        return obj.get_responsibilities_list(self.language)
     
     def get_requirements_list(self, obj):
-        # Получаем текущий язык из запроса
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-        else:
-            current_language = 'ru'
-        
-        return obj.get_requirements_list(current_language)
+        return obj.get_requirements_list(self.language)
     
     def get_conditions_list(self, obj):
-        # Получаем текущий язык из запроса
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-        else:
-            current_language = 'ru'
-        
-        return obj.get_conditions_list(current_language)
+        return obj.get_conditions_list(self.language)
 
 
 class VacancyApplicationSerializer(serializers.ModelSerializer):
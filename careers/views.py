@@ -1,10 +1,5 @@
 from django.shortcuts import render
 from django.db.models import Q, Count
-from django.utils import translation
-from django.utils.translation import activate
-import logging
-
-logger = logging.getLogger(__name__)
 from rest_framework import generics, filters, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -12,6 +7,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
 
+from back_su_m.columns import SerializerColumnsMixin
 from .models import CareerCategory, Department, Vacancy, VacancyApplication
 from .serializers import (
     CareerCategorySerializer,
@@ -29,19 +25,6 @@ class CareerCategoryListAPIView(generics.ListAPIView):
     queryset = CareerCategory.objects.filter(is_active=True)
     serializer_class = CareerCategorySerializer
     permission_classes = [AllowAny]
-    
-    def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"CareerCategoryListAPIView - Accept-Language: {lang}")
-        logger.info(f"CareerCategoryListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"CareerCategoryListAPIView - Language activated: {lang}")
-        
-        logger.info(f"CareerCategoryListAPIView - Current language after activation: {translation.get_language()}")
-        return super().get_queryset()
 
 
 class DepartmentListAPIView(generics.ListAPIView):
@@ -49,19 +32,6 @@ class DepartmentListAPIView(generics.ListAPIView):
     queryset = Department.objects.filter(is_active=True)
     serializer_class = DepartmentSerializer
     permission_classes = [AllowAny]
-    
-    def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"DepartmentListAPIView - Accept-Language: {lang}")
-        logger.info(f"DepartmentListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"DepartmentListAPIView - Language activated: {lang}")
-        
-        logger.info(f"DepartmentListAPIView - Current language after activation: {translation.get_language()}")
-        return super().get_queryset()
 
 
 class VacancyFilter(django_filters.FilterSet):
@@ -88,8 +58,9 @@ class VacancyFilter(django_filters.FilterSet):
         ]
 
 
-class VacancyListAPIView(generics.ListAPIView):
+class VacancyListAPIView(SerializerColumnsMixin, generics.ListAPIView):
     """API для получения списка вакансий"""
+    queryset = Vacancy.objects.filter(status='published')
     serializer_class = VacancyListSerializer
     permission_classes = [AllowAny]
     filter_backends = [
@@ -103,22 +74,8 @@ class VacancyListAPIView(generics.ListAPIView):
     ordering = ['-is_featured', '-posted_date']
     
     def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"VacancyListAPIView - Accept-Language: {lang}")
-        logger.info(f"VacancyListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"VacancyListAPIView - Language activated: {lang}")
-        
-        logger.info(f"VacancyListAPIView - Current language after activation: {translation.get_language()}")
-            
-        return Vacancy.objects.filter(
-            status='published'
-        ).select_related(
-            'category', 'department'
-        ).prefetch_related()
+        # select_related и отложенные колонки выводятся из VacancyListSerializer
+        return super().get_queryset()
 
 
 class VacancyDetailAPIView(generics.RetrieveAPIView):
@@ -128,17 +85,6 @@ class VacancyDetailAPIView(generics.RetrieveAPIView):
     lookup_field = 'slug'
     
     def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"VacancyDetailAPIView - Accept-Language: {lang}")
-        logger.info(f"VacancyDetailAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"VacancyDetailAPIView - Language activated: {lang}")
-        
-        logger.info(f"VacancyDetailAPIView - Current language after activation: {translation.get_language()}")
-            
         return Vacancy.objects.filter(
             status='published'
         ).select_related('category', 'department')
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hsm', '0009_leadership_bio_leadership_bio_en_leadership_bio_kg_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leadership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'name'], name='hsm_leadership_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leadership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['department', 'order'], name='hsm_leadership_dept_idx'),
+        ),
+    ]
@@ -301,6 +301,13 @@ class Leadership(models.Model):
         verbose_name = "Руководитель"
         verbose_name_plural = "Руководство"
         ordering = ['order', 'name']
+        indexes = [
+            # Активные руководители: список и выборка по департаменту
+            models.Index(fields=['order', 'name'], name='hsm_leadership_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['department', 'order'], name='hsm_leadership_dept_idx',
+                         condition=models.Q(is_active=True)),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.position}"
@@ -4,6 +4,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db.models import Q
 from django.http import Http404
+
+from back_su_m.conditional import ConditionalGetMixin
+
 from .models import (
     Faculty, Accreditation, Leadership,
     QualityPrinciple, QualityDocument, QualityProcessGroup,
@@ -25,8 +28,12 @@ from .serializers import (
 )
 
 
-class QualityManagementSystemView(APIView):
+class QualityManagementSystemView(ConditionalGetMixin, APIView):
     """API для получения всех данных системы менеджмента качества"""
+    conditional_models = [
+        QualitySettings, QualityPrinciple, QualityDocument,
+        QualityProcessGroup, QualityProcess, QualityStatistic, QualityAdvantage,
+    ]
     
     def get(self, request):
         try:
@@ -58,13 +65,13 @@ class QualityManagementSystemView(APIView):
             )
 
 
-class QualityPrincipleViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityPrincipleViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для принципов качества"""
     queryset = QualityPrinciple.objects.filter(is_active=True).order_by('order')
     serializer_class = QualityPrincipleSerializer
 
 
-class QualityDocumentViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityDocumentViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для документов качества"""
     queryset = QualityDocument.objects.filter(is_active=True).order_by('category', 'order')
     serializer_class = QualityDocumentSerializer
@@ -108,16 +115,18 @@ class QualityDocumentViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(result)
 
 
-class QualityProcessGroupViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityProcessGroupViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для групп процессов качества"""
     queryset = QualityProcessGroup.objects.filter(is_active=True).prefetch_related('processes').order_by('order')
     serializer_class = QualityProcessGroupSerializer
+    conditional_models = [QualityProcessGroup, QualityProcess]
 
 
-class QualityProcessViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityProcessViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для процессов качества"""
     queryset = QualityProcess.objects.filter(is_active=True).select_related('group').order_by('group__order', 'order')
     serializer_class = QualityProcessSerializer
+    conditional_models = [QualityProcess, QualityProcessGroup]
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -129,20 +138,21 @@ class QualityProcessViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class QualityStatisticViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityStatisticViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для статистики качества"""
     queryset = QualityStatistic.objects.filter(is_active=True).order_by('order')
     serializer_class = QualityStatisticSerializer
 
 
-class QualityAdvantageViewSet(viewsets.ReadOnlyModelViewSet):
+class QualityAdvantageViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API для преимуществ качества"""
     queryset = QualityAdvantage.objects.filter(is_active=True).order_by('order')
     serializer_class = QualityAdvantageSerializer
 
 
-class QualitySettingsView(APIView):
+class QualitySettingsView(ConditionalGetMixin, APIView):
     """API для настроек системы качества"""
+    conditional_models = [QualitySettings]
     
     def get(self, request):
         try:
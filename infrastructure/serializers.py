@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from back_su_m.locale import column_suffix, get_request_language
 from .models import (
     Hospital, HospitalDepartment, Laboratory, LaboratoryEquipment,
     AcademicBuilding, BuildingFacility, BuildingPhoto,
@@ -412,17 +413,7 @@ class ClassroomLanguageAwareSerializer(serializers.ModelSerializer):
         ]
     
     def get_language(self):
-        request = self.context.get('request')
-        if request:
-            lang = request.GET.get('lang')
-            if lang in ['ru', 'kg', 'en']:
-                return lang
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
-            if 'kg' in accept_language:
-                return 'kg'
-            elif 'en' in accept_language:
-                return 'en'
-        return 'ru'
+        return column_suffix(get_request_language(self.context.get('request')))
     
     def get_name(self, obj):
         lang = self.get_language()
@@ -526,17 +517,7 @@ class StartupLanguageAwareSerializer(serializers.ModelSerializer):
         ]
     
     def get_language(self):
-        request = self.context.get('request')
-        if request:
-            lang = request.GET.get('lang')
-            if lang in ['ru', 'kg', 'en']:
-                return lang
-            accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
-            if 'kg' in accept_language:
-                return 'kg'
-            elif 'en' in accept_language:
-                return 'en'
-        return 'ru'
+        return column_suffix(get_request_language(self.context.get('request')))
     
     def get_name(self, obj):
         lang = self.get_language()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_coverage', '0002_mediaarticle_official_site_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mediaarticle',
+            index=models.Index(fields=['publication_date', 'id'], name='media_article_pub_date_idx'),
+        ),
+    ]
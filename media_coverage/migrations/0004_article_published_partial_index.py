@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_coverage', '0003_article_publication_date_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='mediaarticle',
+            name='media_article_pub_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='mediaarticle',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['publication_date', 'id'], name='media_article_published_idx'),
+        ),
+    ]
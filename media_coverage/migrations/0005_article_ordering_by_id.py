@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('media_coverage', '0004_article_published_partial_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='mediaarticle',
+            options={'ordering': ['-publication_date', '-id'], 'verbose_name': 'Медиа-публикация', 'verbose_name_plural': 'Медиа-публикации'},
+        ),
+    ]
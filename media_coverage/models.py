@@ -174,8 +174,15 @@ class MediaArticle(models.Model):
     class Meta:
         verbose_name = 'Медиа-публикация'
         verbose_name_plural = 'Медиа-публикации'
-        ordering = ['-publication_date', '-created_at']
+        # id растет вместе с created_at; ключ курсора (publication_date, id)
+        # совпадает с индексом media_article_published_idx
+        ordering = ['-publication_date', '-id']
         unique_together = ['outlet', 'slug']
+        indexes = [
+            # Ключ курсорной пагинации списков опубликованных публикаций
+            models.Index(fields=['publication_date', 'id'], name='media_article_published_idx',
+                         condition=models.Q(is_published=True)),
+        ]
     
     def __str__(self):
         return f"{self.title_ru} - {self.outlet.name_ru}"
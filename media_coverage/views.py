@@ -6,9 +6,10 @@ from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 
+from back_su_m.pagination import KeysetPagination
+from back_su_m.view_counter import get_view_counter
 from .models import (
     MediaCategory, MediaOutlet, MediaArticle, 
     MediaTag, MediaView, MediaStatistics
@@ -21,8 +22,10 @@ from .serializers import (
     MediaSearchSerializer, MediaAnalyticsSerializer
 )
 
+media_view_counter = get_view_counter(MediaArticle, MediaView, 'article')
 
-class StandardResultsPagination(PageNumberPagination):
+
+class StandardResultsPagination(KeysetPagination):
     """Стандартная пагинация для медиа-контента"""
     page_size = 20
     page_size_query_param = 'page_size'
@@ -141,16 +144,12 @@ class MediaArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
         """Переопределяем для подсчета просмотров"""
         instance = self.get_object()
         
-        # Увеличиваем счетчик просмотров
-        if request.META.get('REMOTE_ADDR'):
-            MediaView.objects.get_or_create(
-                article=instance,
-                ip_address=request.META.get('REMOTE_ADDR'),
-                defaults={'user_agent': request.META.get('HTTP_USER_AGENT', '')}
-            )
-            # Обновляем счетчик в статье
-            instance.views_count = instance.article_views.count()
-            instance.save(update_fields=['views_count'])
+        # Просмотр учитывается в буфере и сбрасывается в БД пачкой
+        media_view_counter.record(
+            instance.pk,
+            request.META.get('REMOTE_ADDR'),
+            request.META.get('HTTP_USER_AGENT', '')
+        )
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from back_su_m.locale import CompactLanguageMixin, get_request_language
 from .models import MissionSection, HistoryMilestone, Value, Priority, Achievement
 
 
-class MissionSectionSerializer(serializers.ModelSerializer):
+class MissionSectionSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """
     Сериализатор для основной секции миссии с поддержкой мультиязычности
     """
@@ -48,96 +49,80 @@ class MissionSectionSerializer(serializers.ModelSerializer):
                            'display_approach_title', 'display_approach_text', 'display_achievements_subtitle',
                            'display_impact_title', 'display_impact_text', 'display_future_title', 'display_future_text']
 
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'kg' in accept_language or 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
     def get_display_title(self, obj):
         """Get display title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_title(language)
 
     def get_display_subtitle(self, obj):
         """Get display subtitle based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_subtitle(language)
 
     def get_display_mission_text(self, obj):
         """Get display mission text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_mission_text(language)
 
     def get_display_vision_title(self, obj):
         """Get display vision title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_vision_title(language)
 
     def get_display_vision_text(self, obj):
         """Get display vision text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_vision_text(language)
 
     def get_display_approach_title(self, obj):
         """Get display approach title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_approach_title(language)
 
     def get_display_approach_text(self, obj):
         """Get display approach text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_approach_text(language)
 
     def get_display_achievements_subtitle(self, obj):
         """Get display achievements subtitle based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_achievements_subtitle(language)
 
     def get_display_impact_title(self, obj):
         """Get display impact title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_impact_title(language)
 
     def get_display_impact_text(self, obj):
         """Get display impact text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_impact_text(language)
 
     def get_display_future_title(self, obj):
         """Get display future title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_future_title(language)
 
     def get_display_future_text(self, obj):
         """Get display future text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_future_text(language)
 
 
-class HistoryMilestoneSerializer(serializers.ModelSerializer):
+class HistoryMilestoneSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """
     Сериализатор для исторических вех с поддержкой мультиязычности
     """
@@ -156,36 +141,20 @@ class HistoryMilestoneSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'display_title', 'display_description']
 
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'kg' in accept_language or 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
     def get_display_title(self, obj):
         """Get display title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_title(language)
 
     def get_display_description(self, obj):
         """Get display description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_description(language)
 
 
-class ValueSerializer(serializers.ModelSerializer):
+class ValueSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """
     Сериализатор для ценностей с поддержкой мультиязычности
     """
@@ -203,36 +172,20 @@ class ValueSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'display_title', 'display_description']
 
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'kg' in accept_language or 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
     def get_display_title(self, obj):
         """Get display title based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_title(language)
 
     def get_display_description(self, obj):
         """Get display description based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_description(language)
 
 
-class PrioritySerializer(serializers.ModelSerializer):
+class PrioritySerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """
     Сериализатор для приоритетов с поддержкой мультиязычности
     """
@@ -248,30 +201,14 @@ class PrioritySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'display_text']
 
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'kg' in accept_language or 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
     def get_display_text(self, obj):
         """Get display text based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_text(language)
 
 
-class AchievementSerializer(serializers.ModelSerializer):
+class AchievementSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """
     Сериализатор для достижений с поддержкой мультиязычности
     """
@@ -287,26 +224,10 @@ class AchievementSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'display_label']
 
-    def _get_language(self, request):
-        """Extract language from request"""
-        language = 'ru'  # default
-        
-        if request:
-            language = request.GET.get('lang', 'ru')
-            # Also check Accept-Language header
-            if not request.GET.get('lang'):
-                accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-                if 'en' in accept_language:
-                    language = 'en'
-                elif 'kg' in accept_language or 'ky' in accept_language:
-                    language = 'ky'
-        
-        return language
-
     def get_display_label(self, obj):
         """Get display label based on request language"""
         request = self.context.get('request')
-        language = self._get_language(request)
+        language = get_request_language(request)
         return obj.get_display_label(language)
 
 
@@ -5,6 +5,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from django.utils.translation import get_language
 
+from back_su_m.columns import LanguageColumnsMixin
+from back_su_m.conditional import ConditionalGetMixin
+
 from .models import MissionSection, HistoryMilestone, Value, Priority, Achievement
 from .serializers import (
     MissionSectionSerializer, HistoryMilestoneSerializer, 
@@ -13,7 +16,7 @@ from .serializers import (
 )
 
 
-class MissionSectionViewSet(viewsets.ModelViewSet):
+class MissionSectionViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления секциями миссии
     """
@@ -25,7 +28,7 @@ class MissionSectionViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
 
-class HistoryMilestoneViewSet(viewsets.ModelViewSet):
+class HistoryMilestoneViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления историческими вехами
     """
@@ -37,7 +40,7 @@ class HistoryMilestoneViewSet(viewsets.ModelViewSet):
     ordering = ['order', 'year']
 
 
-class ValueViewSet(viewsets.ModelViewSet):
+class ValueViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления ценностями
     """
@@ -49,7 +52,7 @@ class ValueViewSet(viewsets.ModelViewSet):
     ordering = ['order']
 
 
-class PriorityViewSet(viewsets.ModelViewSet):
+class PriorityViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления приоритетами
     """
@@ -61,7 +64,7 @@ class PriorityViewSet(viewsets.ModelViewSet):
     ordering = ['order']
 
 
-class AchievementViewSet(viewsets.ModelViewSet):
+class AchievementViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления достижениями
     """
@@ -73,11 +76,12 @@ class AchievementViewSet(viewsets.ModelViewSet):
     ordering = ['order']
 
 
-class MissionCompleteViewSet(viewsets.ViewSet):
+class MissionCompleteViewSet(ConditionalGetMixin, viewsets.ViewSet):
     """
     Специальный ViewSet для получения всех данных миссии одним запросом
     Идеально подходит для фронтенда с поддержкой мультиязычности
     """
+    conditional_models = [MissionSection, HistoryMilestone, Value, Priority, Achievement]
     
     @action(detail=False, methods=['get'])
     def complete_data(self, request):
@@ -82,7 +82,7 @@ class NewsAdmin(admin.ModelAdmin):
     ]
     search_fields = ['title_ru', 'title_kg', 'title_en', 'summary_ru', 'summary_kg', 'summary_en', 'content_ru', 'content_kg', 'content_en', 'author_ru', 'author_kg', 'author_en']
     prepopulated_fields = {'slug': ('title_ru',)}
-    readonly_fields = ['created_at', 'updated_at', 'views_count', 'image_preview']
+    readonly_fields = ['created_at', 'updated_at', 'views_count', 'image_preview', 'read_time_ru', 'read_time_kg', 'read_time_en']
     date_hierarchy = 'published_at'
     
     fieldsets = (
@@ -104,7 +104,7 @@ class NewsAdmin(admin.ModelAdmin):
             'fields': ('published_at', 'is_published', 'is_featured', 'is_pinned')
         }),
         ('Метаинформация', {
-            'fields': ('created_at', 'updated_at', 'views_count'),
+            'fields': ('created_at', 'updated_at', 'views_count', ('read_time_ru', 'read_time_kg', 'read_time_en')),
             'classes': ['collapse']
         }),
     )
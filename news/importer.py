@@ -0,0 +1,364 @@
+"""
+Массовый импорт новостей, событий и объявлений.
+
+Источник - NDJSON (один JSON-объект в строке) или CSV с заголовком.
+Строка - плоский набор полей новости (title_ru/kg/en, summary_*,
+content_*, author_*, slug, category, published_at, is_* ...) плюс поля
+события (event_date, event_time, location_* ...) для category=events
+или объявления (announcement_type, priority, deadline ...) для
+category=announcements.
+
+- tags - список slug тегов (в CSV - через запятую), теги должны существовать;
+- image - путь к уже загруженному файлу в хранилище (news/images/x.jpg).
+
+Строки читаются потоком и обрабатываются пачками по
+NEWS_IMPORT_CHUNK_SIZE: проверка без запросов к БД, затем upsert по
+slug через bulk_create(update_conflicts=True). Обновляются только
+переданные в строке поля. Ошибочные строки пропускаются и попадают в
+отчет с номером строки; ошибка БД откатывает только свою пачку.
+
+bulk_create не вызывает сигналов, поэтому время чтения, поисковый
+индекс, теги, связанные новости и кэш статистики обновляются здесь.
+"""
+
+import codecs
+import csv
+import io
+import json
+import re
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.validators import ProhibitNullCharactersValidator
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.validators import ProhibitSurrogateCharactersValidator
+
+from .models import Announcement, Event, News, NewsCategory, NewsTag
+from .related import rebuild_all, schedule_rebuild
+from .search import update_news_many
+from .serializers import get_category_id, set_news_tags
+from .stats import invalidate_stats
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+FORMATS = (NDJSON, CSV)
+
+# До этого числа новостей связанные новости пересчитываются по одной,
+# для больших импортов - одной полной пересборкой
+RELATED_INCREMENTAL_LIMIT = 200
+
+
+# Заменяет посимвольные валидаторы DRF (ProhibitSurrogateCharactersValidator,
+# ProhibitNullCharactersValidator): на полных текстах они занимают большую
+# часть времени импорта
+INVALID_CHARACTERS_RE = re.compile('[\x00\ud800-\udfff]')
+
+
+class FastTextValidationMixin:
+    """Проверка запрещенных символов одним регулярным выражением на поле"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            if isinstance(field, serializers.CharField):
+                field.validators = [
+                    validator for validator in field.validators
+                    if not isinstance(validator, (ProhibitSurrogateCharactersValidator, ProhibitNullCharactersValidator))
+                ]
+        return fields
+
+    def validate(self, attrs):
+        errors = {
+            name: ['Недопустимый символ (NUL или суррогатная пара)']
+            for name, value in attrs.items()
+            if isinstance(value, str) and INVALID_CHARACTERS_RE.search(value)
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class NewsImportSerializer(FastTextValidationMixin, serializers.ModelSerializer):
+    """Поля новости в строке импорта (без запросов к БД)"""
+    category = serializers.ChoiceField(choices=NewsCategory.CATEGORY_CHOICES)
+    tags = serializers.ListField(child=serializers.SlugField(), required=False)
+    image = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+    class Meta:
+        model = News
+        fields = [
+            'slug', 'title_ru', 'title_kg', 'title_en',
+            'summary_ru', 'summary_kg', 'summary_en',
+            'content_ru', 'content_kg', 'content_en',
+            'author_ru', 'author_kg', 'author_en', 'image',
+            'published_at', 'is_published', 'is_featured', 'is_pinned',
+            'category', 'tags',
+        ]
+        # Уникальность slug не проверяется: повторный slug - это обновление
+        extra_kwargs = {'slug': {'validators': []}}
+
+    def validate_image(self, value):
+        if '://' in value or '..' in value or value.startswith('/'):
+            raise serializers.ValidationError('Ожидается путь к файлу в хранилище, например news/images/photo.jpg')
+        return value
+
+
+class EventImportSerializer(FastTextValidationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Event
+        fields = [
+            'event_date', 'event_time', 'end_time',
+            'location_ru', 'location_kg', 'location_en',
+            'event_category', 'status', 'max_participants', 'current_participants',
+            'registration_required', 'registration_deadline', 'registration_link',
+        ]
+
+
+class AnnouncementImportSerializer(FastTextValidationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Announcement
+        fields = [
+            'announcement_type', 'priority', 'deadline', 'attachment_name',
+            'target_students', 'target_staff', 'target_faculty',
+        ]
+
+
+DETAILS = {
+    NewsCategory.EVENTS: (Event, EventImportSerializer),
+    NewsCategory.ANNOUNCEMENTS: (Announcement, AnnouncementImportSerializer),
+}
+
+
+def _lines(stream):
+    """Строки источника: текстовый файл, бинарный файл, тело запроса или bytes"""
+    if isinstance(stream, (bytes, bytearray)):
+        stream = io.BytesIO(stream)
+    if isinstance(stream, io.TextIOBase):
+        return iter(stream)
+    return codecs.iterdecode(iter(stream), 'utf-8-sig')
+
+
+def read_records(stream, fmt):
+    """Построчно читает источник: (номер строки, dict или текст ошибки)"""
+    lines = _lines(stream)
+    if fmt == NDJSON:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_number, f'Некорректный JSON: {exc}'
+                continue
+            if not isinstance(record, dict):
+                yield line_number, 'Ожидается JSON-объект'
+                continue
+            yield line_number, record
+    elif fmt == CSV:
+        reader = csv.DictReader(lines)
+        for record in reader:
+            # Пустые ячейки - не переданные поля (берутся значения по умолчанию)
+            record = {key: value for key, value in record.items() if key and value not in ('', None)}
+            if 'tags' in record:
+                record['tags'] = [slug.strip() for slug in record['tags'].split(',') if slug.strip()]
+            yield reader.line_num, record
+    else:
+        raise ValueError(f'Неизвестный формат: {fmt}')
+
+
+class ImportReport:
+    """Итог импорта: счетчики и ошибки по строкам"""
+
+    def __init__(self, max_errors=None):
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = max_errors or getattr(settings, 'NEWS_IMPORT_MAX_ERRORS', 1000)
+        self.news_ids = set()
+
+    def add_error(self, line, slug, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'slug': slug, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['line']),
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+class NewsImporter:
+    """Потоковый импорт; import_stream() возвращает ImportReport"""
+
+    def __init__(self, chunk_size=None, rebuild_related=True):
+        self.chunk_size = chunk_size or getattr(settings, 'NEWS_IMPORT_CHUNK_SIZE', 500)
+        self.rebuild_related = rebuild_related
+        self.news_serializer = NewsImportSerializer()
+        self.detail_serializers = {
+            category: serializer_class() for category, (_, serializer_class) in DETAILS.items()
+        }
+        self.tag_ids = {}
+
+    def import_stream(self, stream, fmt):
+        report = ImportReport()
+        records = read_records(stream, fmt)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk, report)
+        self.finish(report)
+        return report
+
+    # Проверка
+
+    def validate(self, line, record, report):
+        """Возвращает (news_data, details_data) или None, если строка с ошибкой"""
+        if isinstance(record, str):
+            report.add_error(line, None, {'non_field_errors': [record]})
+            return None
+        slug = record.get('slug')
+        try:
+            news_data = self.news_serializer.run_validation(
+                {key: value for key, value in record.items() if key in self.news_serializer.fields}
+            )
+            details_data = None
+            detail_serializer = self.detail_serializers.get(news_data['category'])
+            if detail_serializer is not None:
+                details_data = detail_serializer.run_validation(
+                    {key: value for key, value in record.items() if key in detail_serializer.fields}
+                )
+        except serializers.ValidationError as exc:
+            report.add_error(line, slug, exc.detail)
+            return None
+        return news_data, details_data
+
+    def category_id(self, name):
+        try:
+            return get_category_id(name)
+        except NewsCategory.DoesNotExist:
+            return None
+
+    def resolve_references(self, rows, report):
+        """Подставляет id категорий и тегов (один запрос на неизвестные slug в пачке)"""
+        wanted = {slug for _, news_data, _ in rows for slug in news_data.get('tags', ())}
+        unknown = wanted - set(self.tag_ids)
+        if unknown:
+            self.tag_ids.update(NewsTag.objects.filter(slug__in=unknown).values_list('slug', 'id'))
+        resolved = []
+        for line, news_data, details_data in rows:
+            category_id = self.category_id(news_data['category'])
+            if category_id is None:
+                report.add_error(line, news_data['slug'], {'category': ['Категория не создана']})
+                continue
+            missing = [slug for slug in news_data.get('tags', ()) if slug not in self.tag_ids]
+            if missing:
+                report.add_error(line, news_data['slug'], {'tags': [f'Неизвестные теги: {", ".join(missing)}']})
+                continue
+            news_data['category_id'] = category_id
+            resolved.append((line, news_data, details_data))
+        return resolved
+
+    # Запись
+
+    def import_chunk(self, chunk, report):
+        rows = {}
+        for line, record in chunk:
+            validated = self.validate(line, record, report)
+            if validated is None:
+                continue
+            news_data, details_data = validated
+            slug = news_data['slug']
+            if slug in rows:
+                report.add_error(rows[slug][0], slug, {'slug': ['Повторяется ниже в той же пачке, строка пропущена']})
+            rows[slug] = (line, news_data, details_data)
+
+        rows = self.resolve_references(list(rows.values()), report)
+        if not rows:
+            return
+
+        try:
+            with transaction.atomic():
+                created, news_ids = self.write(rows)
+        except DatabaseError as exc:
+            for line, news_data, _ in rows:
+                report.add_error(line, news_data['slug'], {'non_field_errors': [str(exc)]})
+            return
+        report.created += created
+        report.updated += len(rows) - created
+        report.news_ids.update(news_ids.values())
+
+    def write(self, rows):
+        slugs = [news_data['slug'] for _, news_data, _ in rows]
+        existing = set(News.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+
+        groups = {}
+        for _, news_data, _ in rows:
+            data = {key: value for key, value in news_data.items() if key not in ('category', 'tags')}
+            news = News(**data)
+            news.update_reading_stats()
+            fields = set(data) | set(News.READING_STATS_FIELDS)
+            groups.setdefault(frozenset(fields), []).append(news)
+        for fields, objects in groups.items():
+            self.upsert(News, objects, ['slug'], fields - {'slug'})
+
+        news_ids = dict(News.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+
+        for category, (model, _) in DETAILS.items():
+            groups = {}
+            for _, news_data, details_data in rows:
+                if news_data['category'] != category:
+                    continue
+                data = dict(details_data)
+                if model is Announcement:
+                    data['is_deadline_approaching'] = self.deadline_approaching(data.get('deadline'))
+                groups.setdefault(frozenset(data), []).append(
+                    model(news_id=news_ids[news_data['slug']], **data)
+                )
+            for fields, objects in groups.items():
+                self.upsert(model, objects, ['news'], fields)
+
+        set_news_tags(
+            {
+                news_ids[news_data['slug']]: [self.tag_ids[slug] for slug in news_data['tags']]
+                for _, news_data, _ in rows
+                if 'tags' in news_data
+            },
+            rebuild_related=False,
+        )
+        update_news_many(news_ids.values())
+        return len(set(slugs) - existing), news_ids
+
+    @staticmethod
+    def upsert(model, objects, unique_fields, update_fields):
+        if update_fields:
+            model.objects.bulk_create(
+                objects, update_conflicts=True,
+                unique_fields=unique_fields, update_fields=sorted(update_fields),
+            )
+        else:
+            model.objects.bulk_create(objects, ignore_conflicts=True)
+
+    @staticmethod
+    def deadline_approaching(deadline):
+        # Как в Announcement.save()
+        return bool(deadline) and deadline <= timezone.now() + timedelta(days=7)
+
+    def finish(self, report):
+        if not report.news_ids:
+            return
+        if self.rebuild_related:
+            if len(report.news_ids) <= RELATED_INCREMENTAL_LIMIT:
+                for news_id in report.news_ids:
+                    schedule_rebuild(news_id)
+            else:
+                rebuild_all()
+        invalidate_stats()
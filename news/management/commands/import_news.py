@@ -0,0 +1,38 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from news.importer import FORMATS, NewsImporter
+
+
+class Command(BaseCommand):
+    help = 'Массовый импорт новостей, событий и объявлений из NDJSON или CSV (upsert по slug)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу .ndjson/.jsonl или .csv')
+        parser.add_argument('--format', choices=FORMATS, help='Формат файла (по умолчанию - по расширению)')
+        parser.add_argument('--chunk-size', type=int, help='Строк в пачке (по умолчанию NEWS_IMPORT_CHUNK_SIZE)')
+        parser.add_argument(
+            '--skip-related', action='store_true',
+            help='Не пересчитывать связанные новости (запустите rebuild_related_news позже)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format']
+        if fmt is None:
+            extension = os.path.splitext(path)[1].lower()
+            fmt = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(extension)
+        if fmt is None:
+            raise CommandError('Не удалось определить формат по расширению, укажите --format')
+
+        importer = NewsImporter(chunk_size=options['chunk_size'], rebuild_related=not options['skip_related'])
+        with open(path, 'rb') as stream:
+            report = importer.import_stream(stream, fmt)
+
+        for error in report.errors:
+            self.stderr.write(f"Строка {error['line']} ({error['slug']}): {error['errors']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f'... и еще {report.failed - len(report.errors)} ошибок')
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: {report.created}, обновлено: {report.updated}, с ошибками: {report.failed}'
+        ))
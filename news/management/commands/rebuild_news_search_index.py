@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from news.search import backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересобирает полнотекстовый индекс новостей, событий и объявлений'
+
+    def handle(self, *args, **options):
+        if backend() is None:
+            self.stdout.write(self.style.WARNING('СУБД не поддерживает полнотекстовый индекс, используется icontains'))
+            return
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в поисковом индексе: {count}')
+        )
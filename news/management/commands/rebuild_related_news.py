@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from news.related import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересобирает индекс связанных новостей'
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в индексе связанных новостей: {count}')
+        )
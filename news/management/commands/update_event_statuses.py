@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from news.models import Event, local_now
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводит хранимый статус событий (upcoming/ongoing/past) по текущей дате. '
+        'API вычисляет статус сам, команда нужна для админки; запускать по расписанию'
+    )
+
+    def handle(self, *args, **options):
+        now = local_now()
+        updated = {}
+        with transaction.atomic():
+            for event_status in ('upcoming', 'ongoing', 'past'):
+                queryset = Event.objects.with_status(event_status, now).exclude(status=event_status)
+                updated[event_status] = queryset.update(status=event_status)
+        summary = ', '.join(f'{key}: {value}' for key, value in updated.items())
+        self.stdout.write(self.style.SUCCESS(f'Обновлено событий - {summary}'))
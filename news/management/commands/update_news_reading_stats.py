@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество слов и время чтения для всех новостей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Количество новостей, обрабатываемых за один запрос'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = News.objects.only('id', *News.CONTENT_FIELDS).order_by('id')
+
+        batch = []
+        updated = 0
+        for news in queryset.iterator(chunk_size=batch_size):
+            news.update_reading_stats()
+            batch.append(news)
+            if len(batch) >= batch_size:
+                News.objects.bulk_update(batch, News.READING_STATS_FIELDS)
+                updated += len(batch)
+                batch = []
+        if batch:
+            News.objects.bulk_update(batch, News.READING_STATS_FIELDS)
+            updated += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено новостей: {updated}')
+        )
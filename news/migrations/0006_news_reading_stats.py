@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+def fill_reading_stats(apps, schema_editor):
+    News = apps.get_model('news', 'News')
+    languages = ('ru', 'kg', 'en')
+    fields = [f'word_count_{language}' for language in languages] + [f'read_time_{language}' for language in languages]
+    batch = []
+    for news in News.objects.only('id', 'content_ru', 'content_kg', 'content_en').iterator(chunk_size=500):
+        for language in languages:
+            word_count = len((getattr(news, f'content_{language}') or '').split())
+            setattr(news, f'word_count_{language}', word_count)
+            setattr(news, f'read_time_{language}', max(1, word_count // 200))
+        batch.append(news)
+        if len(batch) >= 500:
+            News.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        News.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_remove_announcement_image_url_remove_event_image_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='read_time_en',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (английский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='read_time_kg',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (кыргызский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='read_time_ru',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (русский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_en',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (английский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_kg',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (кыргызский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_ru',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (русский)'),
+        ),
+        migrations.RunPython(fill_reading_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_reading_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Оценка близости')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Позиция')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='news.news', verbose_name='Новость')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='news.news', verbose_name='Связанная новость')),
+            ],
+            options={
+                'verbose_name': 'Связанная новость',
+                'verbose_name_plural': 'Связанные новости',
+                'ordering': ['news', 'position'],
+                'unique_together': {('news', 'related')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from news.search import create_index, rebuild_index
+    create_index(schema_editor)
+    rebuild_index()
+
+
+def drop_search_index(apps, schema_editor):
+    from news.search import drop_index
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_relatednews'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
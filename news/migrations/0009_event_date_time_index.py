@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_news_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'event_time'], name='news_event_date_time_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_event_date_time_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['published_at', 'id'], name='news_published_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0010_news_published_at_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='news',
+            name='news_published_at_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['published_at', 'id'], name='news_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_published', True)), fields=['published_at'], name='news_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_pinned', True), ('is_published', True)), fields=['published_at'], name='news_pinned_idx'),
+        ),
+    ]
@@ -73,13 +73,129 @@ class News(models.Model):
     # Счетчики
     views_count = models.PositiveIntegerField(default=0, verbose_name='Количество просмотров')
     
+    # Статистика текста, пересчитывается при сохранении (см. update_reading_stats)
+    word_count_ru = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (русский)')
+    word_count_kg = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (кыргызский)')
+    word_count_en = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (английский)')
+    
+    read_time_ru = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (русский)')
+    read_time_kg = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (кыргызский)')
+    read_time_en = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Время чтения, мин (английский)')
+    
+    LANGUAGES = ('ru', 'kg', 'en')
+    WORDS_PER_MINUTE = 200
+    CONTENT_FIELDS = ['content_ru', 'content_kg', 'content_en']
+    READING_STATS_FIELDS = [
+        'word_count_ru', 'word_count_kg', 'word_count_en',
+        'read_time_ru', 'read_time_kg', 'read_time_en',
+    ]
+    
     class Meta:
         verbose_name = 'Новость'
         verbose_name_plural = 'Новости'
         ordering = ['-published_at']
+        indexes = [
+            # Частичные индексы: API читает только опубликованные новости.
+            # Первый - ключ курсорной пагинации списка
+            models.Index(fields=['published_at', 'id'], name='news_published_idx',
+                         condition=models.Q(is_published=True)),
+            models.Index(fields=['published_at'], name='news_featured_idx',
+                         condition=models.Q(is_published=True, is_featured=True)),
+            models.Index(fields=['published_at'], name='news_pinned_idx',
+                         condition=models.Q(is_published=True, is_pinned=True)),
+        ]
     
     def __str__(self):
         return self.title_ru
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.update_reading_stats()
+        elif set(update_fields) & set(self.CONTENT_FIELDS):
+            self.update_reading_stats()
+            kwargs['update_fields'] = set(update_fields) | set(self.READING_STATS_FIELDS)
+        super().save(*args, **kwargs)
+    
+    def update_reading_stats(self):
+        """Пересчитывает количество слов и время чтения по всем языкам.
+
+        Вызывается из save(); для bulk_create/update() вызывайте вручную
+        или используйте команду update_news_reading_stats.
+        """
+        deferred = self.get_deferred_fields()
+        for language in self.LANGUAGES:
+            if f'content_{language}' in deferred:
+                continue
+            word_count = len((getattr(self, f'content_{language}') or '').split())
+            setattr(self, f'word_count_{language}', word_count)
+            setattr(self, f'read_time_{language}', max(1, word_count // self.WORDS_PER_MINUTE))
+    
+    @property
+    def read_time(self):
+        """Время чтения первой заполненной языковой версии (ru, kg, en)"""
+        for language in self.LANGUAGES:
+            if getattr(self, f'word_count_{language}'):
+                return getattr(self, f'read_time_{language}')
+        return 1
+
+
+def local_now():
+    """Текущие дата и время в часовом поясе проекта (TIME_ZONE)"""
+    now = timezone.localtime()
+    return now.date(), now.time().replace(microsecond=0)
+
+
+class EventQuerySet(models.QuerySet):
+    """Статус события по дате и времени на момент запроса.
+
+    Хранимое поле status используется только для отмены ('cancelled');
+    остальные статусы вычисляются по (event_date, event_time, end_time),
+    чтобы не зависеть от того, обновлял ли кто-то запись.
+    Все условия - диапазоны по индексу (event_date, event_time).
+    """
+
+    def _now(self, now=None):
+        return now or local_now()
+
+    def not_cancelled(self):
+        return self.exclude(status='cancelled')
+
+    @staticmethod
+    def upcoming_q(now=None):
+        """Условие "предстоящее" для filter() и агрегатов"""
+        today, time = now or local_now()
+        return ~models.Q(status='cancelled') & (
+            models.Q(event_date__gt=today) | models.Q(event_date=today, event_time__gt=time)
+        )
+
+    def upcoming(self, now=None):
+        return self.filter(self.upcoming_q(now))
+
+    def ongoing(self, now=None):
+        today, time = self._now(now)
+        return self.not_cancelled().filter(
+            models.Q(end_time__isnull=True) | models.Q(end_time__gt=time),
+            event_date=today, event_time__lte=time,
+        )
+
+    def past(self, now=None):
+        today, time = self._now(now)
+        return self.not_cancelled().filter(
+            models.Q(event_date__lt=today) | models.Q(event_date=today, end_time__lte=time)
+        )
+
+    def with_status(self, status, now=None):
+        """Фильтр по статусу: upcoming/ongoing/past/cancelled"""
+        if status == 'cancelled':
+            return self.filter(status='cancelled')
+        if status in ('upcoming', 'ongoing', 'past'):
+            return getattr(self, status)(now)
+        return self.none()
+
+    def in_range(self, date_from, date_to):
+        """События в календарном окне [date_from, date_to]"""
+        return self.filter(event_date__range=(date_from, date_to))
 
 
 class Event(models.Model):
@@ -126,13 +242,37 @@ class Event(models.Model):
     registration_deadline = models.DateTimeField(blank=True, null=True, verbose_name='Крайний срок регистрации')
     registration_link = models.URLField(blank=True, null=True, verbose_name='Ссылка на регистрацию')
     
+    objects = EventQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Событие'
         verbose_name_plural = 'События'
         ordering = ['event_date', 'event_time']
+        indexes = [
+            models.Index(fields=['event_date', 'event_time'], name='news_event_date_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.news.title_ru} - {self.event_date}"
+    
+    def get_current_status(self, now=None):
+        """Статус на текущий момент (см. EventQuerySet)"""
+        if self.status == 'cancelled':
+            return 'cancelled'
+        today, time = now or local_now()
+        if self.event_date > today or (self.event_date == today and self.event_time > time):
+            return 'upcoming'
+        if self.event_date == today and (self.end_time is None or self.end_time > time):
+            return 'ongoing'
+        return 'past'
+    
+    @property
+    def current_status(self):
+        return self.get_current_status()
+    
+    @property
+    def current_status_display(self):
+        return dict(self.EVENT_STATUS)[self.current_status]
 
 
 class Announcement(models.Model):
@@ -233,3 +373,20 @@ class NewsTagRelation(models.Model):
         unique_together = ['news', 'tag']
         verbose_name = 'Связь новости с тегом'
         verbose_name_plural = 'Связи новостей с тегами'
+
+
+class RelatedNews(models.Model):
+    """Предрассчитанные связанные новости (пересчитываются в news/related.py)"""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_entries', verbose_name='Новость')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='+', verbose_name='Связанная новость')
+    score = models.FloatField(verbose_name='Оценка близости')
+    position = models.PositiveSmallIntegerField(verbose_name='Позиция')
+    
+    class Meta:
+        unique_together = ['news', 'related']
+        ordering = ['news', 'position']
+        verbose_name = 'Связанная новость'
+        verbose_name_plural = 'Связанные новости'
+    
+    def __str__(self):
+        return f"{self.news_id} -> {self.related_id} ({self.score:.2f})"
@@ -0,0 +1,189 @@
+"""
+Индекс связанных новостей.
+
+Для каждой опубликованной новости хранится топ-RELATED_NEWS_LIMIT
+похожих новостей (модель RelatedNews). Оценка близости симметрична:
+
+    CATEGORY_WEIGHT за общую категорию
+    + TAG_WEIGHT за каждый общий тег
+    + RECENCY_WEIGHT * 0.5 ** (разница дат публикации в днях / RECENCY_HALF_LIFE_DAYS)
+
+Кандидаты - новости той же категории или с хотя бы одним общим тегом.
+Индекс обновляется инкрементально из сигналов (news/signals.py) и
+полностью пересобирается командой rebuild_related_news.
+"""
+
+import threading
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import News, NewsTagRelation, RelatedNews
+
+RELATED_NEWS_LIMIT = 3
+CATEGORY_WEIGHT = 10.0
+TAG_WEIGHT = 5.0
+RECENCY_WEIGHT = 3.0
+RECENCY_HALF_LIFE_DAYS = 30
+
+Item = namedtuple('Item', ['id', 'category_id', 'published_at', 'tags'])
+
+
+def score(item, other):
+    """Оценка близости двух новостей"""
+    value = 0.0
+    if item.category_id == other.category_id:
+        value += CATEGORY_WEIGHT
+    value += TAG_WEIGHT * len(item.tags & other.tags)
+    days = abs((item.published_at - other.published_at).total_seconds()) / 86400
+    value += RECENCY_WEIGHT * 0.5 ** (days / RECENCY_HALF_LIFE_DAYS)
+    return value
+
+
+def is_candidate(item, other):
+    return item.id != other.id and (item.category_id == other.category_id or bool(item.tags & other.tags))
+
+
+def load_items(queryset):
+    """Загружает новости в виде Item двумя запросами"""
+    rows = list(queryset.values_list('id', 'category_id', 'published_at'))
+    tags = defaultdict(set)
+    for news_id, tag_id in NewsTagRelation.objects.filter(
+        news_id__in=[row[0] for row in rows]
+    ).values_list('news_id', 'tag_id'):
+        tags[news_id].add(tag_id)
+    return {
+        news_id: Item(news_id, category_id, published_at, frozenset(tags[news_id]))
+        for news_id, category_id, published_at in rows
+    }
+
+
+def load_candidates(item):
+    """Опубликованные новости той же категории или с общими тегами"""
+    condition = Q(category_id=item.category_id)
+    if item.tags:
+        condition |= Q(tags__tag_id__in=item.tags)
+    return load_items(
+        News.objects.filter(condition, is_published=True).exclude(id=item.id).distinct()
+    )
+
+
+def top_related(item, candidates):
+    """Топ связанных новостей: список (score, id) по убыванию"""
+    scored = [
+        (score(item, other), other.id)
+        for other in candidates
+        if is_candidate(item, other)
+    ]
+    scored.sort(key=lambda entry: (-entry[0], -entry[1]))
+    return scored[:RELATED_NEWS_LIMIT]
+
+
+def _entries(news_id, top):
+    return [
+        RelatedNews(news_id=news_id, related_id=related_id, score=value, position=position)
+        for position, (value, related_id) in enumerate(top)
+    ]
+
+
+def _replace(lists):
+    """Заменяет списки связанных новостей: {news_id: [(score, id), ...]}"""
+    if not lists:
+        return
+    RelatedNews.objects.filter(news_id__in=lists).delete()
+    RelatedNews.objects.bulk_create(
+        [entry for news_id, top in lists.items() for entry in _entries(news_id, top)]
+    )
+
+
+def _recompute(news_ids, known=None):
+    """Полный пересчет списков для news_ids"""
+    known = known or {}
+    missing = set(news_ids) - set(known)
+    items = dict(known)
+    if missing:
+        items.update(load_items(News.objects.filter(id__in=missing, is_published=True)))
+    return {
+        news_id: top_related(items[news_id], load_candidates(items[news_id]).values())
+        for news_id in news_ids
+        if news_id in items
+    }
+
+
+@transaction.atomic
+def rebuild_for(news_id):
+    """Пересчитывает список новости и обновляет списки затронутых новостей"""
+    # Новости, в списках которых она уже есть: после изменения пересчитываем полностью
+    holders = set(
+        RelatedNews.objects.filter(related_id=news_id).values_list('news_id', flat=True)
+    )
+
+    item = load_items(News.objects.filter(id=news_id, is_published=True)).get(news_id)
+    if item is None:
+        RelatedNews.objects.filter(Q(news_id=news_id) | Q(related_id=news_id)).delete()
+        _replace(_recompute(holders))
+        return
+
+    candidates = load_candidates(item)
+    lists = _recompute(holders, {key: value for key, value in candidates.items() if key in holders})
+    lists[news_id] = top_related(item, candidates.values())
+
+    # Остальным кандидатам достаточно сравнить новость с их текущим списком
+    current = defaultdict(list)
+    others = set(candidates) - holders
+    for owner_id, related_id, value in RelatedNews.objects.filter(
+        news_id__in=others
+    ).values_list('news_id', 'related_id', 'score'):
+        current[owner_id].append((value, related_id))
+    for other_id in others:
+        value = score(candidates[other_id], item)
+        top = current[other_id]
+        if len(top) < RELATED_NEWS_LIMIT or value > min(top)[0]:
+            top = sorted(top + [(value, news_id)], key=lambda entry: (-entry[0], -entry[1]))
+            lists[other_id] = top[:RELATED_NEWS_LIMIT]
+
+    _replace(lists)
+
+
+def rebuild_all():
+    """Полностью пересобирает индекс, возвращает количество записей"""
+    items = load_items(News.objects.filter(is_published=True))
+    by_category = defaultdict(set)
+    by_tag = defaultdict(set)
+    for item in items.values():
+        by_category[item.category_id].add(item.id)
+        for tag_id in item.tags:
+            by_tag[tag_id].add(item.id)
+
+    entries = []
+    for item in items.values():
+        candidate_ids = set(by_category[item.category_id])
+        for tag_id in item.tags:
+            candidate_ids |= by_tag[tag_id]
+        top = top_related(item, (items[candidate_id] for candidate_id in candidate_ids))
+        entries.extend(_entries(item.id, top))
+
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        RelatedNews.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
+
+
+_pending = threading.local()
+
+
+def schedule_rebuild(news_id):
+    """Откладывает пересчет до коммита транзакции, объединяя повторы"""
+    ids = getattr(_pending, 'ids', None)
+    if ids is None:
+        ids = _pending.ids = set()
+    ids.add(news_id)
+    transaction.on_commit(_run_pending)
+
+
+def _run_pending():
+    ids = getattr(_pending, 'ids', None) or set()
+    _pending.ids = set()
+    for news_id in sorted(ids):
+        rebuild_for(news_id)
@@ -0,0 +1,313 @@
+"""
+Полнотекстовый поиск по новостям, событиям и объявлениям.
+
+Индекс - отдельная таблица news_search_index, одна строка на новость
+(события и объявления - это новости с event_details/announcement_details,
+для событий в индекс добавляется место проведения):
+
+- PostgreSQL: колонка tsvector с GIN-индексом. Русский текст
+  индексируется конфигурацией 'russian', английский - 'english'
+  (стемминг), кыргызский - 'simple'. Вес A - заголовок, B - описание
+  и место проведения, C - полный текст. Ранжирование ts_rank_cd.
+- SQLite (локальная разработка): виртуальная таблица FTS5 с токенайзером
+  porter (стемминг английского); для остальных языков слова запроса
+  ищутся по префиксу. Ранжирование bm25 с весами колонок.
+- Остальные СУБД: индекса нет, поиск через icontains.
+
+Ранжированный список (search_news) ограничен SEARCH_MAX_RESULTS; фильтр
+?search= и число найденных записей считаются подзапросом к индексу без
+ограничения (matching_news, count_matches).
+
+Индекс обновляется из сигналов (news/signals.py) и полностью
+пересобирается командой rebuild_news_search_index.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Event, News
+
+SEARCH_INDEX_TABLE = 'news_search_index'
+SEARCH_MAX_RESULTS = 1000
+LANGUAGES = ('ru', 'kg', 'en')
+
+# Колонки FTS5 и их веса для bm25 в том же порядке
+FTS5_COLUMNS = ('title', 'summary', 'content', 'location')
+FTS5_WEIGHTS = (10.0, 4.0, 1.0, 4.0)
+
+POSTGRES_CONFIGS = {'ru': 'russian', 'kg': 'simple', 'en': 'english'}
+POSTGRES_WEIGHTS = {'title': 'A', 'summary': 'B', 'location': 'B', 'content': 'C'}
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def backend():
+    """'postgresql', 'sqlite' или None, если индекс не поддерживается"""
+    if connection.vendor in ('postgresql', 'sqlite'):
+        return connection.vendor
+    return None
+
+
+def _tables():
+    return News._meta.db_table, Event._meta.db_table
+
+
+def _postgres_document():
+    parts = []
+    for field, weight in POSTGRES_WEIGHTS.items():
+        table = 'e' if field == 'location' else 'n'
+        for language in LANGUAGES:
+            parts.append(
+                f"setweight(to_tsvector('{POSTGRES_CONFIGS[language]}', "
+                f"coalesce({table}.{field}_{language}, '')), '{weight}')"
+            )
+    return ' || '.join(parts)
+
+
+def _concat(table, field):
+    return " || ' ' || ".join(f"coalesce({table}.{field}_{language}, '')" for language in LANGUAGES)
+
+
+def create_index(schema_editor):
+    """Создает таблицу индекса (вызывается из миграции)"""
+    vendor = schema_editor.connection.vendor
+    news_table, _ = _tables()
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} ('
+            f'news_id bigint PRIMARY KEY REFERENCES {news_table} (id) '
+            f'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            f'document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_TABLE}_document_gin '
+            f'ON {SEARCH_INDEX_TABLE} USING gin (document)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5('
+            f'{", ".join(FTS5_COLUMNS)}, '
+            f"tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}')
+
+
+def _update(news_ids=None):
+    """Пересчитывает строки индекса для news_ids (None - для всех новостей)"""
+    vendor = backend()
+    if vendor is None:
+        return
+    news_table, event_table = _tables()
+    where, params = '', []
+    if news_ids is not None:
+        news_ids = list(news_ids)
+        if not news_ids:
+            return
+        where = f'WHERE n.id IN ({", ".join(["%s"] * len(news_ids))})'
+        params = news_ids
+    source = f'FROM {news_table} n LEFT JOIN {event_table} e ON e.news_id = n.id {where}'
+
+    with connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute(
+                f'INSERT INTO {SEARCH_INDEX_TABLE} (news_id, document) '
+                f'SELECT n.id, {_postgres_document()} {source} '
+                f'ON CONFLICT (news_id) DO UPDATE SET document = EXCLUDED.document',
+                params,
+            )
+        else:
+            _delete_rows(cursor, news_ids)
+            columns = ', '.join(
+                _concat('e' if column == 'location' else 'n', column) for column in FTS5_COLUMNS
+            )
+            cursor.execute(
+                f'INSERT INTO {SEARCH_INDEX_TABLE} (rowid, {", ".join(FTS5_COLUMNS)}) '
+                f'SELECT n.id, {columns} {source}',
+                params,
+            )
+
+
+def _delete_rows(cursor, news_ids):
+    if news_ids is None:
+        cursor.execute(f'DELETE FROM {SEARCH_INDEX_TABLE}')
+    else:
+        key = 'rowid' if backend() == 'sqlite' else 'news_id'
+        cursor.execute(
+            f'DELETE FROM {SEARCH_INDEX_TABLE} WHERE {key} IN ({", ".join(["%s"] * len(news_ids))})',
+            news_ids,
+        )
+
+
+def update_news(news_id):
+    """Обновляет строку индекса одной новости"""
+    _update([news_id])
+
+
+def update_news_many(news_ids):
+    """Обновляет строки индекса пачки новостей одним запросом (для bulk-операций)"""
+    _update(news_ids)
+
+
+def remove_news(news_id):
+    """Удаляет новость из индекса (в PostgreSQL это делает ON DELETE CASCADE)"""
+    if backend() == 'sqlite':
+        with connection.cursor() as cursor:
+            _delete_rows(cursor, [news_id])
+
+
+def rebuild_index():
+    """Полностью пересобирает индекс, возвращает количество строк"""
+    if backend() is None:
+        return 0
+    _update()
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT COUNT(*) FROM {SEARCH_INDEX_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def _fts5_query(query):
+    """Запрос FTS5: все слова обязательны, каждое ищется по префиксу"""
+    words = WORD_RE.findall(query.lower())
+    return ' AND '.join(f'"{word}"*' for word in words)
+
+
+def _postgres_tsquery():
+    return ' || '.join(
+        f"websearch_to_tsquery('{config}', %s)" for config in sorted(set(POSTGRES_CONFIGS.values()))
+    )
+
+
+def match_sql(query):
+    """(SQL, параметры) выборки id всех новостей, подходящих под запрос.
+
+    None - индекс не поддерживается СУБД.
+    """
+    vendor = backend()
+    if vendor is None:
+        return None
+    if vendor == 'postgresql':
+        return (
+            f'SELECT news_id FROM {SEARCH_INDEX_TABLE} WHERE document @@ ({_postgres_tsquery()})',
+            [query] * len(set(POSTGRES_CONFIGS.values())),
+        )
+    match = _fts5_query(query)
+    if not match:
+        return f'SELECT rowid FROM {SEARCH_INDEX_TABLE} WHERE 0 = 1', []
+    return f'SELECT rowid FROM {SEARCH_INDEX_TABLE} WHERE {SEARCH_INDEX_TABLE} MATCH %s', [match]
+
+
+def ranked_ids(query, limit=SEARCH_MAX_RESULTS):
+    """Список id новостей по убыванию релевантности, не больше limit.
+
+    None - индекс не поддерживается СУБД, нужно искать через icontains.
+    """
+    vendor = backend()
+    if vendor is None:
+        return None
+    with connection.cursor() as cursor:
+        if vendor == 'postgresql':
+            cursor.execute(
+                f'SELECT news_id FROM {SEARCH_INDEX_TABLE}, (SELECT {_postgres_tsquery()} AS query) AS q '
+                f'WHERE document @@ q.query '
+                f'ORDER BY ts_rank_cd(document, q.query) DESC, news_id DESC LIMIT %s',
+                [query] * len(set(POSTGRES_CONFIGS.values())) + [limit],
+            )
+        else:
+            match = _fts5_query(query)
+            if not match:
+                return []
+            weights = ', '.join(str(weight) for weight in FTS5_WEIGHTS)
+            cursor.execute(
+                f'SELECT rowid FROM {SEARCH_INDEX_TABLE} WHERE {SEARCH_INDEX_TABLE} MATCH %s '
+                f'ORDER BY bm25({SEARCH_INDEX_TABLE}, {weights}), rowid DESC LIMIT %s',
+                [match, limit],
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def multilingual_q(query, *fields):
+    """icontains по всем языковым версиям полей (_ru, _kg, _en)"""
+    condition = Q()
+    for field in fields:
+        for language in LANGUAGES:
+            condition |= Q(**{f'{field}_{language}__icontains': query})
+    return condition
+
+
+def _icontains_q(query):
+    return (
+        multilingual_q(query, 'title', 'summary', 'content')
+        | multilingual_q(query, 'event_details__location')
+    )
+
+
+def matching_news(query):
+    """Выражение для lookup __in: id всех новостей, подходящих под запрос, без ограничения"""
+    sql = match_sql(query)
+    if sql is None:
+        return News.objects.filter(_icontains_q(query)).values('id')
+    return RawSQL(*sql)
+
+
+def count_matches(query):
+    """Число опубликованных новостей, подходящих под запрос (один COUNT)"""
+    return News.objects.filter(id__in=matching_news(query), is_published=True).count()
+
+
+def search_news(query, limit=SEARCH_MAX_RESULTS):
+    """Ищет опубликованные новости.
+
+    Возвращает (ids, kinds): id в порядке релевантности и
+    {id: 'news' | 'event' | 'announcement'} - тип записи.
+    """
+    ids = ranked_ids(query, limit)
+    if ids is None:
+        queryset = News.objects.filter(
+            _icontains_q(query),
+            is_published=True,
+        ).order_by('-published_at').distinct()
+        rows = list(queryset.values_list('id', 'event_details__id', 'announcement_details__id')[:limit])
+        ids = [row[0] for row in rows]
+    else:
+        rows = News.objects.filter(id__in=ids, is_published=True).values_list(
+            'id', 'event_details__id', 'announcement_details__id'
+        )
+    kinds = {}
+    for news_id, event_id, announcement_id in rows:
+        if event_id is not None:
+            kinds[news_id] = 'event'
+        elif announcement_id is not None:
+            kinds[news_id] = 'announcement'
+        else:
+            kinds[news_id] = 'news'
+    return [news_id for news_id in ids if news_id in kinds], kinds
+
+
+def order_by_ids(objects, ids, key=lambda obj: obj.pk):
+    """Упорядочивает объекты в порядке ids"""
+    position = {value: index for index, value in enumerate(ids)}
+    return sorted(objects, key=lambda obj: position[key(obj)])
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """?search= через поисковый индекс.
+
+    search_index_lookup во вью - путь к id новости ('id' для News,
+    'news_id' для Event/Announcement). Фильтр - подзапрос к индексу без
+    ограничения числа записей, поэтому count пагинации точный.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = ' '.join(self.get_search_terms(request))
+        if not query:
+            return queryset
+        lookup = getattr(view, 'search_index_lookup', 'id')
+        return queryset.filter(**{f'{lookup}__in': matching_news(query)})
@@ -1,67 +1,57 @@
+from collections import defaultdict
+
 from rest_framework import serializers
-from django.utils import translation
-from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsTagRelation
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from back_su_m import content_versions
+from back_su_m.columns import optimize_queryset
+from back_su_m.locale import CompactLanguageMixin, LocalizedField, LocalizedSerializerMixin
+from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsTagRelation, RelatedNews
+from .related import schedule_rebuild
 
 
-class LanguageAwareSerializer(serializers.ModelSerializer):
-    """Базовый сериализатор с поддержкой языков"""
-    
-    def get_localized_field(self, instance, field_name):
-        """Получить переведенное поле в зависимости от текущего языка"""
-        # Получаем язык из заголовка запроса или используем текущий язык Django
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-        else:
-            current_language = translation.get_language() or 'ru'
-        
-        # Попробуем получить поле для текущего языка
-        localized_field = f"{field_name}_{current_language}"
-        if hasattr(instance, localized_field):
-            value = getattr(instance, localized_field)
-            if value:
-                return value
-        
-        # Если нет перевода для текущего языка, вернем русский (по умолчанию)
-        default_field = f"{field_name}_ru"
-        if hasattr(instance, default_field):
-            value = getattr(instance, default_field)
-            if value:
-                return value
-        
-        # Если и русского нет, вернем базовое поле
-        return getattr(instance, field_name, 'not given')
-    
-    def to_representation(self, instance):
-        """Переопределяем представление для автоматической локализации"""
-        data = super().to_representation(instance)
-        
-        # Переводимые поля
-        translatable_fields = getattr(self.Meta, 'translatable_fields', [])
-        
-        for field in translatable_fields:
-            if field in data:
-                data[field] = self.get_localized_field(instance, field)
-        
-        return data
+def with_tags(queryset, lookup='tags'):
+    """Подгружает теги для всех новостей queryset одним запросом.
+
+    lookup позволяет подгрузить теги через связь, например 'news__tags'
+    для queryset событий или объявлений.
+    """
+    return queryset.prefetch_related(
+        Prefetch(lookup, queryset=NewsTagRelation.objects.select_related('tag'))
+    )
+
+
+def get_news_tags(news):
+    """Возвращает теги новости, используя результат with_tags(), если он есть"""
+    if 'tags' in getattr(news, '_prefetched_objects_cache', {}):
+        tag_relations = news.tags.all()
+    else:
+        tag_relations = NewsTagRelation.objects.filter(news=news).select_related('tag')
+    return [relation.tag for relation in tag_relations]
 
 
-class NewsCategorySerializer(serializers.ModelSerializer):
+class LanguageAwareSerializer(LocalizedSerializerMixin, serializers.ModelSerializer):
+    """Базовый сериализатор с поддержкой языков (язык запроса - back_su_m.locale)"""
+
+
+class NewsCategorySerializer(CompactLanguageMixin, serializers.ModelSerializer):
     class Meta:
         model = NewsCategory
         fields = ['id', 'name', 'slug', 'name_ru', 'name_kg', 'name_en', 'description_ru', 'description_kg', 'description_en']
 
 
-class NewsTagSerializer(serializers.ModelSerializer):
+class NewsTagSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     class Meta:
         model = NewsTag
         fields = ['id', 'name_ru', 'name_kg', 'name_en', 'slug', 'color']
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Детализированный сериализатор для событий"""
     event_category_display = serializers.CharField(source='get_event_category_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    status = serializers.CharField(source='current_status', read_only=True)
+    status_display = serializers.CharField(source='current_status_display', read_only=True)
     participants_info = serializers.SerializerMethodField()
     
     class Meta:
@@ -116,12 +106,13 @@ class AnnouncementDetailSerializer(serializers.ModelSerializer):
         return audiences
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Сериализатор для списка новостей (краткая информация)"""
     category = NewsCategorySerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
+    # Хранится в модели, контент для расчета не загружается
+    read_time = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = News
@@ -143,21 +134,12 @@ class NewsListSerializer(serializers.ModelSerializer):
         return None
     
     def get_tags(self, obj):
-        # Получаем связанные теги через промежуточную модель
-        tag_relations = NewsTagRelation.objects.filter(news=obj).select_related('tag')
-        tags = [relation.tag for relation in tag_relations]
-        return NewsTagSerializer(tags, many=True, context=self.context).data
+        # Теги подгружаются для всей страницы через with_tags()
+        return NewsTagSerializer(get_news_tags(obj), many=True, context=self.context).data
     
-    def get_read_time(self, obj):
-        # Примерный расчет времени чтения (200 слов в минуту)
-        content = obj.content_ru or obj.content_kg or obj.content_en or ''
-        if content:
-            word_count = len(content.split())
-            return max(1, word_count // 200)
-        return 1
 
 
-class NewsDetailSerializer(serializers.ModelSerializer):
+class NewsDetailSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Детализированный сериализатор для новости"""
     category = NewsCategorySerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
@@ -165,7 +147,7 @@ class NewsDetailSerializer(serializers.ModelSerializer):
     event_details = EventDetailSerializer(read_only=True)
     announcement_details = AnnouncementDetailSerializer(read_only=True)
     related_news = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
+    read_time = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = News
@@ -189,41 +171,32 @@ class NewsDetailSerializer(serializers.ModelSerializer):
         return None
     
     def get_tags(self, obj):
-        # Получаем связанные теги
-        tag_relations = NewsTagRelation.objects.filter(news=obj).select_related('tag')
-        tags = [relation.tag for relation in tag_relations]
-        return NewsTagSerializer(tags, many=True, context=self.context).data
-    
-    def get_read_time(self, obj):
-        # Расчет времени чтения
-        content = obj.content_ru or obj.content_kg or obj.content_en or ''
-        if content:
-            word_count = len(content.split())
-            return max(1, word_count // 200)
-        return 1
+        return NewsTagSerializer(get_news_tags(obj), many=True, context=self.context).data
     
     def get_related_news(self, obj):
-        """Получение связанных новостей той же категории"""
-        related = News.objects.filter(
-            category=obj.category,
-            is_published=True
-        ).exclude(id=obj.id)[:3]
+        """Связанные новости из предрассчитанного индекса (news/related.py)"""
+        entries = with_tags(optimize_queryset(
+            RelatedNews.objects.filter(news=obj, related__is_published=True),
+            NewsListSerializer, through='related'
+        ), lookup='related__tags').order_by('position')
+        related = [entry.related for entry in entries]
         
         return NewsListSerializer(related, many=True, context=self.context).data
 
 
 class EventListSerializer(LanguageAwareSerializer):
     """Сериализатор для списка событий"""
-    title = serializers.SerializerMethodField()
+    title = LocalizedField(source='news')
     slug = serializers.CharField(source='news.slug', read_only=True)
-    summary = serializers.SerializerMethodField()
+    summary = LocalizedField(source='news')
     image_url = serializers.SerializerMethodField()
-    author = serializers.SerializerMethodField()
+    author = LocalizedField(source='news')
     published_at = serializers.DateTimeField(source='news.published_at', read_only=True)
-    location = serializers.SerializerMethodField()
+    location = LocalizedField()
     
     event_category_display = serializers.CharField(source='get_event_category_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    status = serializers.CharField(source='current_status', read_only=True)
+    status_display = serializers.CharField(source='current_status_display', read_only=True)
     participants_info = serializers.SerializerMethodField()
     
     class Meta:
@@ -236,24 +209,6 @@ class EventListSerializer(LanguageAwareSerializer):
             'participants_info', 'registration_required'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj.news, 'title')
-    
-    def get_summary(self, obj):
-        return self.get_localized_field(obj.news, 'summary')
-    
-    def get_author(self, obj):
-        return self.get_localized_field(obj.news, 'author')
-    
-    def get_location(self, obj):
-        """Получает локализованное поле места проведения события"""
-        language = self.context.get('request').headers.get('Accept-Language', 'ru')
-        if language == 'ky':
-            return obj.location_kg or obj.location_ru
-        elif language == 'en':
-            return obj.location_en or obj.location_ru
-        return obj.location_ru
-    
     def get_image_url(self, obj):
         """Возвращает только реальные изображения событий, загруженные через админку"""
         # Сначала проверяем собственное изображение события
@@ -278,9 +233,9 @@ class EventListSerializer(LanguageAwareSerializer):
 
 class AnnouncementListSerializer(LanguageAwareSerializer):
     """Сериализатор для списка объявлений"""
-    title = serializers.SerializerMethodField()
-    summary = serializers.SerializerMethodField()
-    content = serializers.SerializerMethodField()
+    title = LocalizedField(source='news')
+    summary = LocalizedField(source='news')
+    content = LocalizedField(source='news')
     slug = serializers.CharField(source='news.slug', read_only=True)
     author = serializers.CharField(source='news.author_ru', read_only=True)
     published_at = serializers.DateTimeField(source='news.published_at', read_only=True)
@@ -302,15 +257,6 @@ class AnnouncementListSerializer(LanguageAwareSerializer):
             'attachment_name', 'attachment_name_display'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj.news, 'title')
-    
-    def get_summary(self, obj):
-        return self.get_localized_field(obj.news, 'summary')
-    
-    def get_content(self, obj):
-        return self.get_localized_field(obj.news, 'content')
-    
     def get_image_url(self, obj):
         """Возвращает только реальные изображения объявлений, загруженные через админку"""
         # Сначала проверяем собственное изображение объявления
@@ -334,30 +280,108 @@ class AnnouncementListSerializer(LanguageAwareSerializer):
 
 
 # Сериализаторы для создания и обновления
+CATEGORY_CACHE_KEY = 'news:category:{}:{}'
+CATEGORY_CACHE_TIMEOUT = 60 * 60
+
+
+def category_cache_key(name):
+    # Версия NewsCategory из общего реестра: удаление или пересоздание
+    # категории в любом процессе меняет ключ у всех воркеров
+    return CATEGORY_CACHE_KEY.format(content_versions.get_version(NewsCategory), name)
+
+
+def get_category_id(name):
+    """id категории по имени"""
+    key = category_cache_key(name)
+    category_id = cache.get(key)
+    if category_id is None:
+        category_id = NewsCategory.objects.values_list('id', flat=True).get(name=name)
+        cache.set(key, category_id, CATEGORY_CACHE_TIMEOUT)
+    return category_id
+
+
+def invalidate_category_cache():
+    cache.delete_many([category_cache_key(name) for name, _ in NewsCategory.CATEGORY_CHOICES])
+
+
+def set_news_tags(tags_by_news, rebuild_related=True):
+    """Приводит теги новостей к заданным наборам: {news_id: [тег или id тега]}.
+
+    Сравнивает с текущими связями и применяет разницу одним DELETE и
+    одним bulk_create - число запросов не зависит от числа новостей и тегов.
+    bulk_create не вызывает сигналов, поэтому пересчет связанных новостей
+    планируется здесь (rebuild_related=False - вызывающий пересчитает сам).
+    """
+    wanted = {
+        news_id: {getattr(tag, 'pk', tag) for tag in tags}
+        for news_id, tags in tags_by_news.items()
+    }
+    if not wanted:
+        return set()
+
+    current = defaultdict(set)
+    stale = []
+    for relation_id, news_id, tag_id in NewsTagRelation.objects.filter(
+        news_id__in=wanted
+    ).values_list('id', 'news_id', 'tag_id'):
+        if tag_id in wanted[news_id]:
+            current[news_id].add(tag_id)
+        else:
+            stale.append((relation_id, news_id))
+
+    missing = [
+        NewsTagRelation(news_id=news_id, tag_id=tag_id)
+        for news_id, tags in wanted.items()
+        for tag_id in sorted(tags - current[news_id])
+    ]
+
+    with transaction.atomic():
+        if stale:
+            NewsTagRelation.objects.filter(id__in=[relation_id for relation_id, _ in stale]).delete()
+        if missing:
+            NewsTagRelation.objects.bulk_create(missing)
+
+    changed = {news_id for _, news_id in stale} | {relation.news_id for relation in missing}
+    if rebuild_related:
+        for news_id in changed:
+            schedule_rebuild(news_id)
+    return changed
+
+
+class NewsTagIdField(serializers.PrimaryKeyRelatedField):
+    """Принимает id тега; при выводе News.tags (связи NewsTagRelation) отдает id тега"""
+    
+    def to_representation(self, value):
+        return value.tag_id
+
+
 class NewsCreateUpdateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания и обновления новостей"""
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = NewsTagIdField(
         many=True, queryset=NewsTag.objects.all(), required=False
     )
     
     class Meta:
         model = News
         fields = [
-            'title', 'slug', 'summary', 'content', 'image', 'image_url',
-            'category', 'author', 'published_at', 'is_published',
+            'title_ru', 'title_kg', 'title_en', 'slug',
+            'summary_ru', 'summary_kg', 'summary_en',
+            'content_ru', 'content_kg', 'content_en', 'image',
+            'category', 'author_ru', 'author_kg', 'author_en', 'published_at', 'is_published',
             'is_featured', 'is_pinned', 'tags'
         ]
     
+    @transaction.atomic
     def create(self, validated_data):
         tags_data = validated_data.pop('tags', [])
         news = News.objects.create(**validated_data)
         
-        # Добавляем теги
-        for tag in tags_data:
-            NewsTagRelation.objects.create(news=news, tag=tag)
+        if tags_data:
+            set_news_tags({news.pk: tags_data})
         
         return news
     
+    @transaction.atomic
     def update(self, instance, validated_data):
         tags_data = validated_data.pop('tags', None)
         
@@ -365,43 +389,50 @@ class NewsCreateUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         
-        # Обновляем теги если они переданы
+        # Обновляем теги если они переданы: удаляются и добавляются только отличия
         if tags_data is not None:
-            instance.tags.all().delete()  # Удаляем старые связи
-            for tag in tags_data:
-                NewsTagRelation.objects.create(news=instance, tag=tag)
+            set_news_tags({instance.pk: tags_data})
         
         return instance
 
 
+class NestedNewsSerializer(NewsCreateUpdateSerializer):
+    """Новость внутри события или объявления: категория задается родителем"""
+    
+    class Meta(NewsCreateUpdateSerializer.Meta):
+        read_only_fields = ['category']
+
+
+def create_with_news(model, category_name, validated_data):
+    """Создает новость нужной категории и связанную с ней запись model"""
+    news_data = validated_data.pop('news')
+    news_data['category_id'] = get_category_id(category_name)
+    with transaction.atomic():
+        news = NestedNewsSerializer().create(news_data)
+        return model.objects.create(news=news, **validated_data)
+
+
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания и обновления событий"""
-    news_data = NewsCreateUpdateSerializer()
+    news_data = NestedNewsSerializer(source='news')
     
     class Meta:
         model = Event
         fields = [
-            'news_data', 'event_date', 'event_time', 'end_time', 'location',
+            'news_data', 'event_date', 'event_time', 'end_time',
+            'location_ru', 'location_kg', 'location_en',
             'event_category', 'status', 'max_participants', 'current_participants',
             'registration_required', 'registration_deadline', 'registration_link'
         ]
     
     def create(self, validated_data):
-        news_data = validated_data.pop('news_data')
-        # Устанавливаем категорию как 'events'
-        news_data['category'] = NewsCategory.objects.get(name=NewsCategory.EVENTS)
-        
-        news_serializer = NewsCreateUpdateSerializer(data=news_data)
-        news_serializer.is_valid(raise_exception=True)
-        news = news_serializer.save()
-        
-        event = Event.objects.create(news=news, **validated_data)
-        return event
+        # Категория новости - 'events'
+        return create_with_news(Event, NewsCategory.EVENTS, validated_data)
 
 
 class AnnouncementCreateUpdateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания и обновления объявлений"""
-    news_data = NewsCreateUpdateSerializer()
+    news_data = NestedNewsSerializer(source='news')
     
     class Meta:
         model = Announcement
@@ -412,13 +443,5 @@ class AnnouncementCreateUpdateSerializer(serializers.ModelSerializer):
         ]
     
     def create(self, validated_data):
-        news_data = validated_data.pop('news_data')
-        # Устанавливаем категорию как 'announcements'
-        news_data['category'] = NewsCategory.objects.get(name=NewsCategory.ANNOUNCEMENTS)
-        
-        news_serializer = NewsCreateUpdateSerializer(data=news_data)
-        news_serializer.is_valid(raise_exception=True)
-        news = news_serializer.save()
-        
-        announcement = Announcement.objects.create(news=news, **validated_data)
-        return announcement
+        # Категория новости - 'announcements'
+        return create_with_news(Announcement, NewsCategory.ANNOUNCEMENTS, validated_data)
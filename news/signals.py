@@ -0,0 +1,75 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Announcement, Event, News, NewsCategory, NewsTagRelation, RelatedNews
+from .related import schedule_rebuild
+from .search import remove_news, update_news
+from .serializers import invalidate_category_cache
+from .stats import invalidate_stats
+
+
+@receiver(post_save, sender=News)
+def news_saved(sender, instance, raw=False, **kwargs):
+    """Пересчет связанных новостей после сохранения новости"""
+    if not raw:
+        schedule_rebuild(instance.pk)
+
+
+@receiver(pre_delete, sender=News)
+def news_deleting(sender, instance, **kwargs):
+    # Запоминаем новости, в списках которых была удаляемая новость
+    instance._related_holders = list(
+        RelatedNews.objects.filter(related=instance).values_list('news_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=News)
+def news_deleted(sender, instance, **kwargs):
+    for news_id in getattr(instance, '_related_holders', []):
+        schedule_rebuild(news_id)
+
+
+@receiver(post_save, sender=News)
+def news_search_index_saved(sender, instance, raw=False, **kwargs):
+    """Обновление поискового индекса в той же транзакции, что и сохранение"""
+    if not raw:
+        update_news(instance.pk)
+
+
+@receiver(post_delete, sender=News)
+def news_search_index_deleted(sender, instance, **kwargs):
+    remove_news(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_search_index_changed(sender, instance, raw=False, **kwargs):
+    """Место проведения события входит в индекс его новости"""
+    if not raw:
+        update_news(instance.news_id)
+
+
+@receiver(post_save, sender=NewsTagRelation)
+@receiver(post_delete, sender=NewsTagRelation)
+def news_tags_changed(sender, instance, raw=False, **kwargs):
+    """Пересчет связанных новостей после изменения тегов"""
+    if not raw:
+        schedule_rebuild(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def news_content_changed(sender, **kwargs):
+    """Сброс кэша статистики"""
+    invalidate_stats()
+
+
+@receiver(post_save, sender=NewsCategory)
+@receiver(post_delete, sender=NewsCategory)
+def news_category_changed(sender, **kwargs):
+    """Сброс кэша id категорий (get_category_id)"""
+    invalidate_category_cache()
@@ -0,0 +1,63 @@
+"""
+Статистика новостей: по одному агрегирующему запросу на таблицу.
+
+Результат кэшируется в кэше процесса под ключом с версиями News, Event
+и Announcement из реестра back_su_m.content_versions: реестр общий для
+всех воркеров, поэтому запись в любом процессе (включая
+queryset.update() и raw SQL) меняет ключ у всех. Число предстоящих
+событий меняется со временем - на этот случай у кэша есть таймаут
+NEWS_STATS_CACHE_TIMEOUT.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from back_su_m import content_versions
+
+from .models import Announcement, Event, EventQuerySet, News
+
+STATS_CACHE_KEY = 'news:stats:{}'
+STATS_MODELS = (News, Event, Announcement)
+
+
+def stats_cache_key():
+    versions = content_versions.get_versions(STATS_MODELS)
+    return STATS_CACHE_KEY.format(':'.join(str(versions[name]) for name in sorted(versions)))
+
+
+def compute_stats():
+    """Считает все счетчики тремя запросами (News, Event, Announcement)"""
+    stats = {}
+    stats.update(News.objects.filter(is_published=True).aggregate(
+        total_news=Count('id'),
+        featured_news=Count('id', filter=Q(is_featured=True)),
+    ))
+    stats.update(Event.objects.filter(news__is_published=True).aggregate(
+        total_events=Count('id'),
+        upcoming_events=Count('id', filter=EventQuerySet.upcoming_q()),
+    ))
+    stats.update(Announcement.objects.filter(news__is_published=True).aggregate(
+        total_announcements=Count('id'),
+        urgent_announcements=Count('id', filter=Q(priority__in=['high', 'urgent'])),
+    ))
+    return stats
+
+
+def get_stats():
+    """Возвращает (stats, время расчета в мс, взято ли из кэша)"""
+    started = time.perf_counter()
+    key = stats_cache_key()
+    stats = cache.get(key)
+    cached = stats is not None
+    if not cached:
+        stats = compute_stats()
+        cache.set(key, stats, getattr(settings, 'NEWS_STATS_CACHE_TIMEOUT', 300))
+    return stats, (time.perf_counter() - started) * 1000, cached
+
+
+def invalidate_stats():
+    """Сбрасывает кэш текущего процесса; остальные процессы сменят ключ по версиям"""
+    cache.delete(stats_cache_key())
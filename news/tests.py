@@ -0,0 +1,802 @@
+from datetime import time, timedelta
+from io import StringIO
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from back_su_m.content_versions import get_versions
+from back_su_m.view_counter import BufferedViewCounter
+
+from .models import Announcement, Event, News, local_now, NewsCategory, NewsTag, NewsTagRelation, NewsView, RelatedNews
+from .importer import NewsImporter
+from .related import rebuild_all
+from .search import rebuild_index, search_news
+from .serializers import NewsCreateUpdateSerializer, get_category_id, invalidate_category_cache, set_news_tags
+from .stats import invalidate_stats
+from .views import news_view_counter
+
+
+def create_category(name=NewsCategory.NEWS):
+    return NewsCategory.objects.create(
+        name=name, slug=name,
+        name_ru=name, name_kg=name, name_en=name,
+    )
+
+
+def create_news(category, index, **kwargs):
+    fields = {
+        'title_ru': f'Новость {index}', 'title_kg': f'Жаңылык {index}', 'title_en': f'News {index}',
+        'slug': f'news-{index}',
+        'summary_ru': 'Описание', 'summary_kg': 'Сүрөттөмө', 'summary_en': 'Summary',
+        'content_ru': 'Текст новости', 'content_kg': 'Жаңылыктын тексти', 'content_en': 'News text',
+        'category': category,
+    }
+    fields.update(kwargs)
+    return News.objects.create(**fields)
+
+
+@override_settings(VIEW_COUNTER_FLUSH_INTERVAL=0)
+class NewsTagQueryCountTests(APITestCase):
+    """Количество запросов не должно зависеть от числа новостей в ответе"""
+
+    def tearDown(self):
+        news_view_counter.flush()
+
+    def setUp(self):
+        self.category = create_category()
+        self.tags = [
+            NewsTag.objects.create(name_ru=f'Тег {i}', name_kg=f'Тег {i}', name_en=f'Tag {i}', slug=f'tag-{i}')
+            for i in range(3)
+        ]
+
+    def add_news(self, count):
+        start = News.objects.count()
+        for index in range(start, start + count):
+            news = create_news(self.category, index, is_featured=True, is_pinned=True)
+            for tag in self.tags:
+                NewsTagRelation.objects.create(news=news, tag=tag)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url):
+        self.add_news(2)
+        small = self.count_queries(url)
+        self.add_news(8)
+        large = self.count_queries(url)
+        self.assertEqual(small, large, f'{url}: {small} запросов для 2 новостей, {large} для 10')
+
+    def test_list(self):
+        self.assertConstantQueries('/api/news/')
+
+    def test_featured(self):
+        self.assertConstantQueries('/api/news/featured/')
+
+    def test_pinned(self):
+        self.assertConstantQueries('/api/news/pinned/')
+
+    def test_popular(self):
+        self.assertConstantQueries('/api/news/popular/')
+
+    def test_by_category(self):
+        self.assertConstantQueries(f'/api/news/by_category/?category={self.category.slug}')
+
+    def test_search(self):
+        self.assertConstantQueries('/api/search/?q=News')
+
+    def test_detail_related_news(self):
+        self.assertConstantQueries('/api/news/news-0/')
+
+    def test_tags_are_returned(self):
+        self.add_news(1)
+        response = self.client.get('/api/news/')
+        slugs = [tag['slug'] for tag in response.data['results'][0]['tags']]
+        self.assertEqual(sorted(slugs), ['tag-0', 'tag-1', 'tag-2'])
+
+
+@override_settings(VIEW_COUNTER_FLUSH_INTERVAL=0)
+class NewsViewCounterTests(APITestCase):
+    """Просмотры копятся в буфере и сбрасываются в БД пачкой"""
+
+    def setUp(self):
+        category = create_category()
+        self.news = [create_news(category, index) for index in range(3)]
+        news_view_counter.flush()
+        news_view_counter._seen.clear()
+
+    def tearDown(self):
+        news_view_counter.flush()
+
+    def get(self, news, ip):
+        return self.client.get(f'/api/news/{news.slug}/', REMOTE_ADDR=ip)
+
+    def test_detail_makes_no_writes(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.get(self.news[0], '10.0.0.1').status_code, 200)
+        statements = [query['sql'].split()[0].upper() for query in context.captured_queries]
+        self.assertEqual(set(statements), {'SELECT'})
+
+    def test_flush_aggregates_and_deduplicates(self):
+        for ip in ['10.0.0.1', '10.0.0.2', '10.0.0.1']:
+            self.get(self.news[0], ip)
+        self.get(self.news[1], '10.0.0.1')
+        self.assertEqual(news_view_counter.pending_count(), 3)
+
+        self.assertEqual(news_view_counter.flush(), 3)
+        counts = dict(News.objects.values_list('slug', 'views_count'))
+        self.assertEqual(counts, {'news-0': 2, 'news-1': 1, 'news-2': 0})
+        self.assertEqual(NewsView.objects.count(), 3)
+
+    def test_flush_skips_views_already_stored(self):
+        NewsView.objects.create(news=self.news[0], ip_address='10.0.0.1')
+        self.get(self.news[0], '10.0.0.1')
+        self.assertEqual(news_view_counter.flush(), 0)
+        self.news[0].refresh_from_db()
+        self.assertEqual(self.news[0].views_count, 0)
+
+    def test_concurrent_flush_counts_view_once(self):
+        # Второй процесс со своим буфером учел тот же просмотр
+        other = BufferedViewCounter(News, NewsView, 'news')
+        other.record(self.news[0].pk, '10.0.0.1')
+        self.get(self.news[0], '10.0.0.1')
+        self.assertEqual(other.flush(), 1)
+        self.assertEqual(news_view_counter.flush(), 0)
+        self.news[0].refresh_from_db()
+        self.assertEqual(self.news[0].views_count, 1)
+
+    def test_flush_drops_views_of_deleted_objects(self):
+        self.get(self.news[0], '10.0.0.1')
+        self.news[0].delete()
+        self.assertEqual(news_view_counter.flush(), 0)
+        self.assertEqual(news_view_counter.pending_count(), 0)
+
+        self.get(self.news[1], '10.0.0.1')
+        self.assertEqual(news_view_counter.flush(), 1)
+        self.news[1].refresh_from_db()
+        self.assertEqual(self.news[1].views_count, 1)
+
+    def test_failed_flush_keeps_views(self):
+        self.get(self.news[0], '10.0.0.1')
+        with mock.patch.object(news_view_counter, '_increment', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                news_view_counter.flush()
+        self.assertEqual(NewsView.objects.count(), 0)
+        self.assertEqual(news_view_counter.pending_count(), 1)
+        self.assertEqual(news_view_counter.flush(), 1)
+        self.news[0].refresh_from_db()
+        self.assertEqual(self.news[0].views_count, 1)
+
+
+class NewsReadingStatsTests(APITestCase):
+    """Время чтения считается при сохранении, а не при сериализации"""
+
+    def setUp(self):
+        self.category = create_category()
+
+    def test_save_updates_reading_stats(self):
+        news = create_news(self.category, 0, content_ru='слово ' * 450, content_kg='', content_en='word ' * 30)
+        self.assertEqual((news.word_count_ru, news.read_time_ru), (450, 2))
+        self.assertEqual((news.word_count_kg, news.read_time_kg), (0, 1))
+        self.assertEqual((news.word_count_en, news.read_time_en), (30, 1))
+
+        news.content_ru = ''
+        news.save(update_fields=['content_ru'])
+        news.refresh_from_db()
+        self.assertEqual(news.word_count_ru, 0)
+        self.assertEqual(news.read_time, 1)
+
+    def test_list_does_not_load_content(self):
+        create_news(self.category, 0, content_ru='слово ' * 600)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/news/')
+        self.assertEqual(response.data['results'][0]['read_time'], 3)
+        self.assertFalse(any('content_ru' in query['sql'] for query in context.captured_queries))
+
+
+class RelatedNewsIndexTests(APITestCase):
+    """Индекс связанных новостей обновляется при сохранении и смене тегов"""
+
+    def setUp(self):
+        self.news_category = create_category()
+        self.events_category = create_category(NewsCategory.EVENTS)
+        self.tag = NewsTag.objects.create(name_ru='Наука', name_kg='Илим', name_en='Science', slug='science')
+
+    def tearDown(self):
+        news_view_counter.flush()
+
+    def create(self, index, category=None, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_news(category or self.news_category, index, **kwargs)
+
+    def related_ids(self, news):
+        return list(RelatedNews.objects.filter(news=news).values_list('related_id', flat=True))
+
+    def test_same_category_and_shared_tags(self):
+        first = self.create(0)
+        second = self.create(1)
+        other = self.create(2, category=self.events_category)
+        self.assertEqual(self.related_ids(first), [second.id])
+        self.assertEqual(self.related_ids(other), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NewsTagRelation.objects.create(news=other, tag=self.tag)
+            NewsTagRelation.objects.create(news=first, tag=self.tag)
+        # Общий тег весит меньше общей категории, но делает новость кандидатом
+        self.assertEqual(self.related_ids(first), [second.id, other.id])
+        self.assertEqual(self.related_ids(other), [first.id])
+
+    def test_unpublish_removes_from_lists(self):
+        first = self.create(0)
+        second = self.create(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.is_published = False
+            second.save()
+        self.assertEqual(self.related_ids(first), [])
+        self.assertEqual(self.related_ids(second), [])
+
+    def test_incremental_matches_full_rebuild(self):
+        for index in range(6):
+            self.create(index, category=self.events_category if index % 2 else None)
+        incremental = sorted(RelatedNews.objects.values_list('news_id', 'related_id', 'position'))
+        rebuild_all()
+        full = sorted(RelatedNews.objects.values_list('news_id', 'related_id', 'position'))
+        self.assertEqual(incremental, full)
+
+    def test_detail_reads_related_news_from_index(self):
+        for index in range(4):
+            self.create(index)
+        response = self.client.get('/api/news/news-0/')
+        self.assertEqual(len(response.data['related_news']), 3)
+        self.assertNotIn('content_ru', response.data['related_news'][0])
+
+
+class NewsStatsTests(APITestCase):
+    """Статистика считается одним запросом на таблицу и кэшируется"""
+
+    def setUp(self):
+        invalidate_stats()
+        category = create_category()
+        create_news(category, 0, is_featured=True)
+        create_news(category, 1)
+        create_news(category, 2, is_published=False)
+
+    def test_stats(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/stats/')
+        self.assertEqual(response.data['total_news'], 2)
+        self.assertEqual(response.data['featured_news'], 1)
+        self.assertIn('desc="miss"', response['Server-Timing'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/stats/')
+        self.assertIn('desc="hit"', response['Server-Timing'])
+
+    def test_key_follows_content_versions(self):
+        self.client.get('/api/stats/')
+        # queryset.update() без сигналов, как запись в другом воркере
+        News.objects.filter(is_published=True).update(is_featured=True)
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response.data['featured_news'], 2)
+        self.assertIn('desc="miss"', response['Server-Timing'])
+
+    def test_invalidated_on_save(self):
+        self.client.get('/api/stats/')
+        create_news(NewsCategory.objects.get(), 3, is_featured=True)
+        response = self.client.get('/api/stats/')
+        self.assertEqual(response.data['total_news'], 3)
+        self.assertEqual(response.data['featured_news'], 2)
+
+
+class NewsSearchTests(APITestCase):
+    """Полнотекстовый поиск: ранжирование, точные итоги, синхронизация индекса"""
+
+    def setUp(self):
+        self.category = create_category()
+
+    def search(self, query):
+        return search_news(query)[0]
+
+    def test_ranking_and_languages(self):
+        in_content = create_news(self.category, 0, content_ru='Лекция для студентов медицинского факультета')
+        in_title = create_news(self.category, 1, title_ru='Студенты победили на олимпиаде')
+        english = create_news(self.category, 2, content_en='Students are running a charity marathon')
+        kyrgyz = create_news(self.category, 3, summary_kg='Студенттер үчүн жаңы китепкана')
+
+        # Заголовок весит больше описания, описание - больше полного текста
+        self.assertEqual(self.search('студент'), [in_title.id, kyrgyz.id, in_content.id])
+        # Стемминг английского: runs -> run
+        self.assertEqual(self.search('runs'), [english.id])
+        self.assertEqual(self.search('китепкана'), [kyrgyz.id])
+        self.assertEqual(self.search('несуществующее'), [])
+
+    def test_index_follows_updates(self):
+        news = create_news(self.category, 0)
+        self.assertEqual(self.search('Анатомия'), [])
+        news.title_ru = 'Анатомия'
+        news.save()
+        self.assertEqual(self.search('Анатомия'), [news.id])
+        news.delete()
+        self.assertEqual(self.search('Анатомия'), [])
+
+    def test_event_location_and_unpublished(self):
+        news = create_news(self.category, 0)
+        Event.objects.create(
+            news=news, event_date='2026-01-01', event_time='10:00', event_category='conference', location_ru='Актовый зал',
+            location_kg='Актылар залы', location_en='Assembly hall',
+        )
+        hidden = create_news(self.category, 1, title_en='Assembly rules', is_published=False)
+        ids, kinds = search_news('assembly')
+        self.assertEqual(ids, [news.id])
+        self.assertEqual(kinds[news.id], 'event')
+        self.assertNotIn(hidden.id, ids)
+
+    def test_search_all_totals(self):
+        for index in range(7):
+            create_news(self.category, index, content_en='Vaccination campaign')
+        announcement = create_news(self.category, 7, title_en='Vaccination schedule')
+        Announcement.objects.create(news=announcement)
+
+        response = self.client.get('/api/search/?q=vaccination')
+        self.assertEqual(response.data['total_found'], 8)
+        self.assertEqual(len(response.data['news']), 5)
+        self.assertEqual(len(response.data['announcements']), 1)
+        self.assertEqual(response.data['events'], [])
+
+    def test_viewset_search_filter(self):
+        create_news(self.category, 0)
+        match = create_news(self.category, 1, title_en='Graduation ceremony')
+        response = self.client.get('/api/news/?search=graduation')
+        self.assertEqual([item['id'] for item in response.data['results']], [match.id])
+
+    def test_filter_and_total_are_not_limited(self):
+        for index in range(4):
+            create_news(self.category, index, title_en='Cardiology seminar')
+        limited = lambda query: search_news(query, limit=2)
+        with mock.patch('news.views.search_news', limited):
+            response = self.client.get('/api/search/?q=cardiology')
+        self.assertEqual(response.data['total_found'], 4)
+        response = self.client.get('/api/news/?search=cardiology')
+        self.assertEqual(response.data['count'], 4)
+
+    def test_rebuild_index(self):
+        news = create_news(self.category, 0, title_en='Microbiology')
+        self.assertEqual(rebuild_index(), 1)
+        self.assertEqual(self.search('microbiology'), [news.id])
+
+
+class EventScheduleTests(APITestCase):
+    """Статус события вычисляется по дате, календарь отдает окно дат"""
+
+    def setUp(self):
+        self.category = create_category(NewsCategory.EVENTS)
+        self.today, _ = local_now()
+        self.index = 0
+
+    def create_event(self, days, start=time(10, 0), end=None, **kwargs):
+        news = create_news(self.category, self.index)
+        self.index += 1
+        return Event.objects.create(
+            news=news, event_date=self.today + timedelta(days=days), event_time=start, end_time=end,
+            location_ru='Зал', location_kg='Зал', location_en='Hall', event_category='lecture', **kwargs
+        )
+
+    def slugs(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [item['slug'] for item in response.data]
+
+    def test_status_from_date(self):
+        # Хранимый статус устарел: событие вчера все еще "upcoming"
+        past = self.create_event(-1, status='upcoming')
+        future = self.create_event(2, status='past')
+        cancelled = self.create_event(3, status='cancelled')
+
+        self.assertEqual(self.slugs('/api/events/upcoming/'), [future.news.slug])
+        self.assertEqual(self.slugs('/api/events/past/'), [past.news.slug])
+        response = self.client.get('/api/events/?status=cancelled')
+        self.assertEqual([item['slug'] for item in response.data['results']], [cancelled.news.slug])
+        self.assertEqual(self.client.get('/api/events/past/').data[0]['status'], 'past')
+
+    def test_today_status(self):
+        morning = self.create_event(0, start=time(9, 0), end=time(11, 0))
+        noon = self.create_event(0, start=time(11, 30))
+        evening = self.create_event(0, start=time(18, 0))
+        current = (self.today, time(12, 0))
+        self.assertEqual(
+            [event.get_current_status(current) for event in (morning, noon, evening)],
+            ['past', 'ongoing', 'upcoming'],
+        )
+        for event_status, event in (('past', morning), ('ongoing', noon), ('upcoming', evening)):
+            self.assertEqual(list(Event.objects.with_status(event_status, current)), [event])
+
+    def test_calendar(self):
+        self.create_event(-10)
+        inside = [self.create_event(1), self.create_event(5)]
+        self.create_event(40)
+        date_from = self.today.isoformat()
+        date_to = (self.today + timedelta(days=7)).isoformat()
+        with self.assertNumQueries(1):
+            slugs = self.slugs(f'/api/events/calendar/?from={date_from}&to={date_to}')
+        self.assertEqual(slugs, [event.news.slug for event in inside])
+
+        self.assertEqual(self.client.get('/api/events/calendar/?from=2026-02-30&to=2026-03-01').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/events/calendar/?from={date_to}&to={date_from}').status_code, 400)
+
+    def test_update_event_statuses_command(self):
+        event = self.create_event(-1)
+        call_command('update_event_statuses', stdout=StringIO())
+        event.refresh_from_db()
+        self.assertEqual(event.status, 'past')
+
+
+@override_settings(STREAMING_CHUNK_SIZE=2)
+class StreamingListTests(APITestCase):
+    """?stream=1 отдает тот же JSON-массив потоком, пачками по STREAMING_CHUNK_SIZE"""
+
+    def setUp(self):
+        category = create_category(NewsCategory.EVENTS)
+        today, _ = local_now()
+        for index in range(5):
+            news = create_news(category, index, is_pinned=index % 2 == 0)
+            Event.objects.create(
+                news=news, event_date=today + timedelta(days=index + 1), event_time=time(10, 0),
+                location_ru='Зал', location_kg='Зал', location_en='Hall', event_category='lecture'
+            )
+            Announcement.objects.create(news=news, announcement_type='general')
+
+    def assertStreamed(self, url):
+        regular = self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            streamed = self.client.get(url + ('&' if '?' in url else '?') + 'stream=1')
+            content = b''.join(streamed.streaming_content)
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(streamed['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(content), regular.json())
+        return json.loads(content), len(context.captured_queries)
+
+    def test_events(self):
+        items, queries = self.assertStreamed('/api/events/upcoming/?lang=en')
+        self.assertEqual(len(items), 5)
+        self.assertEqual(items[0]['title'], 'News 0')
+        # Одна выборка пачками: запросов столько же, сколько пачек
+        self.assertLessEqual(queries, 4)
+
+    def test_announcements_and_empty(self):
+        items, _ = self.assertStreamed('/api/announcements/pinned/')
+        self.assertEqual(len(items), 3)
+        Event.objects.all().delete()
+        items, _ = self.assertStreamed('/api/events/upcoming/')
+        self.assertEqual(items, [])
+
+
+class RequestLanguageTests(APITestCase):
+    """Язык запроса определяется один раз middleware, ky и kg равнозначны"""
+
+    def setUp(self):
+        news = create_news(create_category(NewsCategory.EVENTS), 0, summary_kg='')
+        today, _ = local_now()
+        Event.objects.create(
+            news=news, event_date=today + timedelta(days=1), event_time=time(10, 0),
+            location_ru='Зал', location_kg='Зал kg', location_en='Hall', event_category='lecture'
+        )
+
+    def first_event(self, url='/api/events/upcoming/', **headers):
+        response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, 200)
+        return response, response.data[0]
+
+    def test_kyrgyz_aliases(self):
+        for header in ('ky', 'kg', 'ky-KG,ru;q=0.8', 'fr, ky;q=0.5'):
+            response, event = self.first_event(HTTP_ACCEPT_LANGUAGE=header)
+            self.assertEqual(event['title'], 'Жаңылык 0', header)
+            self.assertEqual(event['location'], 'Зал kg')
+            self.assertEqual(response['Content-Language'], 'ky')
+
+    def test_query_parameter_wins(self):
+        _, event = self.first_event('/api/events/upcoming/?lang=en', HTTP_ACCEPT_LANGUAGE='ky')
+        self.assertEqual(event['title'], 'News 0')
+
+    def test_fallback_to_russian(self):
+        _, event = self.first_event(HTTP_ACCEPT_LANGUAGE='ky')
+        self.assertEqual(event['summary'], 'Описание')
+        _, event = self.first_event(HTTP_ACCEPT_LANGUAGE='de')
+        self.assertEqual(event['title'], 'Новость 0')
+
+
+class CompactLanguageTests(APITestCase):
+    """?compact=1 отдает и загружает только язык запроса"""
+
+    def setUp(self):
+        category = create_category()
+        tag = NewsTag.objects.create(name_ru='Тег', name_kg='Тег kg', name_en='Tag', slug='tag')
+        for index in range(3):
+            news = create_news(category, index, title_kg='' if index == 0 else f'Жаңылык {index}')
+            NewsTagRelation.objects.create(news=news, tag=tag)
+
+    def tearDown(self):
+        news_view_counter.flush()
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, context.captured_queries
+
+    def test_list_projection(self):
+        response, _ = self.get('/api/news/?lang=en&compact=1')
+        item = response.data['results'][0]
+        self.assertFalse([key for key in item if key.endswith(('_ru', '_kg', '_en'))])
+        self.assertEqual(item['title'], 'News 2')
+        self.assertEqual(item['category']['name'], NewsCategory.NEWS)
+        self.assertEqual(item['category']['display_name'], NewsCategory.NEWS)
+        self.assertEqual(item['tags'][0]['name'], 'Tag')
+
+    def test_fallback_and_columns(self):
+        _, full_queries = self.get('/api/news/?lang=ky')
+        response, queries = self.get('/api/news/?lang=ky&compact=1')
+        titles = {item['slug']: item['title'] for item in response.data['results']}
+        self.assertEqual(titles['news-0'], 'Новость 0')
+        self.assertEqual(titles['news-1'], 'Жаңылык 1')
+        # Колонки других языков не загружаются и не догружаются по одной
+        self.assertEqual(len(queries), len(full_queries))
+        news_query = next(query['sql'] for query in queries if 'title_ru' in query['sql'])
+        self.assertNotIn('title_en', news_query)
+        self.assertIn('title_kg', news_query)
+
+    def test_detail_and_regular_mode(self):
+        response, _ = self.get('/api/news/news-1/?lang=ky&compact=1')
+        self.assertEqual(response.data['content'], 'Жаңылыктын тексти')
+        self.assertNotIn('content_ru', response.data)
+        response, _ = self.get('/api/news/news-1/?lang=ky')
+        self.assertIn('content_en', response.data)
+
+
+class ConditionalGetTests(APITestCase):
+    """ETag/Last-Modified: неизмененный список отдается как 304 без запросов к БД"""
+
+    url = '/api/news/'
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.category = create_category()
+        self.news = create_news(self.category, 0)
+
+    def tearDown(self):
+        news_view_counter.flush()
+
+    def get(self, url=None, **headers):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url or self.url, **headers)
+        return response, len(context.captured_queries)
+
+    def test_not_modified_skips_database(self):
+        response, _ = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response, queries = self.get(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(queries, 0)
+        self.assertFalse(response.content)
+
+    def test_etag_depends_on_query_and_language(self):
+        etag = self.get()[0]['ETag']
+        self.assertNotEqual(self.get(self.url + '?page=1')[0]['ETag'], etag)
+        self.assertNotEqual(self.get(HTTP_ACCEPT_LANGUAGE='en')[0]['ETag'], etag)
+        response, _ = self.get(self.url + '?lang=en', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changes_invalidate(self):
+        etag = self.get()[0]['ETag']
+        self.news.title_ru = 'Новый заголовок'
+        self.news.save()
+        response, _ = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['title_ru'], 'Новый заголовок')
+
+        # Сброс счетчика просмотров не меняет версии новостей
+        etag = response['ETag']
+        versions = get_versions([News, 'news'])
+        news_view_counter.record(self.news.pk, '10.0.0.1')
+        self.assertEqual(news_view_counter.flush(), 1)
+        self.assertEqual(get_versions([News, 'news']), versions)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag)[0].status_code, 304)
+
+    def test_tag_change_invalidates(self):
+        etag = self.get()[0]['ETag']
+        tag = NewsTag.objects.create(name_ru='Наука', name_kg='Илим', name_en='Science', slug='science')
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag)[0].status_code, 200)
+        etag = self.get()[0]['ETag']
+        NewsTagRelation.objects.create(news=self.news, tag=tag)
+        response, _ = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['slug'] for item in response.data['results'][0]['tags']], ['science'])
+
+    def test_if_modified_since(self):
+        response, _ = self.get()
+        response, queries = self.get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(queries, 0)
+
+    def test_detail_counts_views(self):
+        url = f'{self.url}{self.news.slug}/'
+        response, _ = self.get(url)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(news_view_counter.pending_count(), 1)
+
+
+class NewsTagWriteTests(APITestCase):
+    """Теги записываются разницей наборов, категория берется из кэша"""
+
+    def setUp(self):
+        invalidate_category_cache()
+        self.category = create_category()
+        self.tags = [
+            NewsTag.objects.create(name_ru=f'Тег {i}', name_kg=f'Тег {i}', name_en=f'Tag {i}', slug=f'tag-{i}')
+            for i in range(30)
+        ]
+
+    def tag_ids(self, news):
+        return set(NewsTagRelation.objects.filter(news=news).values_list('tag_id', flat=True))
+
+    def test_update_applies_difference(self):
+        news = create_news(self.category, 0)
+        set_news_tags({news.pk: self.tags[:2]})
+        kept = NewsTagRelation.objects.get(news=news, tag=self.tags[1])
+
+        serializer = NewsCreateUpdateSerializer(news, data={'tags': [self.tags[1].pk, self.tags[2].pk]}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(self.tag_ids(news), {self.tags[1].pk, self.tags[2].pk})
+        self.assertTrue(NewsTagRelation.objects.filter(pk=kept.pk).exists())
+
+    def test_constant_queries(self):
+        small = create_news(self.category, 0)
+        large = create_news(self.category, 1)
+        set_news_tags({small.pk: self.tags[:1], large.pk: self.tags[:10]})
+
+        def count(tags_by_news):
+            with CaptureQueriesContext(connection) as context:
+                set_news_tags(tags_by_news)
+            return len(context.captured_queries)
+
+        self.assertEqual(
+            count({small.pk: self.tags[1:3]}),
+            count({large.pk: self.tags[10:30]}),
+        )
+
+    def test_category_cache_follows_content_versions(self):
+        old = create_category(NewsCategory.EVENTS)
+        self.assertEqual(get_category_id(NewsCategory.EVENTS), old.pk)
+        # Без сигналов, как записи в другом воркере
+        NewsCategory.objects.filter(pk=old.pk).update(name='archive', slug='archive')
+        NewsCategory.objects.bulk_create([NewsCategory(
+            name=NewsCategory.EVENTS, slug='events-new', name_ru='-', name_kg='-', name_en='-',
+        )])
+        new = NewsCategory.objects.get(name=NewsCategory.EVENTS)
+        self.assertEqual(get_category_id(NewsCategory.EVENTS), new.pk)
+
+    def test_event_create_uses_cached_category(self):
+        create_category(NewsCategory.EVENTS)
+        self.client.force_authenticate(User.objects.create_user('editor'))
+        payload = {
+            'news_data': {
+                'title_ru': 'Событие', 'title_kg': 'Иш-чара', 'title_en': 'Event', 'slug': 'event-0',
+                'summary_ru': 'Описание', 'summary_kg': 'Сүрөттөмө', 'summary_en': 'Summary',
+                'content_ru': 'Текст', 'content_kg': 'Текст', 'content_en': 'Text',
+                'tags': [self.tags[0].pk],
+            },
+            'event_date': '2026-05-01', 'event_time': '10:00', 'event_category': 'lecture',
+            'location_ru': 'Зал', 'location_kg': 'Зал', 'location_en': 'Hall',
+        }
+        response = self.client.post('/api/events/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        payload['news_data']['slug'] = 'event-1'
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/events/', payload, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertFalse(any('news_newscategory' in query['sql'] for query in context.captured_queries))
+        event = Event.objects.get(news__slug='event-1')
+        self.assertEqual(event.news.category.name, NewsCategory.EVENTS)
+        self.assertEqual(self.tag_ids(event.news), {self.tags[0].pk})
+
+
+class NewsImportTests(APITestCase):
+    """Массовый импорт: upsert по slug, теги по ссылке, ошибки по строкам"""
+
+    def setUp(self):
+        invalidate_category_cache()
+        for name in (NewsCategory.NEWS, NewsCategory.EVENTS):
+            create_category(name)
+        self.tags = [
+            NewsTag.objects.create(name_ru=f'Тег {i}', name_kg=f'Тег {i}', name_en=f'Tag {i}', slug=f'tag-{i}')
+            for i in range(3)
+        ]
+
+    def row(self, index, **kwargs):
+        row = {
+            'slug': f'import-{index}', 'category': NewsCategory.NEWS,
+            'title_ru': f'Новость {index}', 'title_kg': f'Жаңылык {index}', 'title_en': f'Imported {index}',
+            'summary_ru': 'Описание', 'summary_kg': 'Сүрөттөмө', 'summary_en': 'Summary',
+            'content_ru': 'слово ' * 400, 'content_kg': 'сөз', 'content_en': 'word',
+        }
+        row.update(kwargs)
+        return row
+
+    def ndjson(self, rows):
+        return '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows).encode()
+
+    def post(self, body, content_type='application/x-ndjson'):
+        admin, _ = User.objects.get_or_create(username='admin', defaults={'is_staff': True})
+        self.client.force_authenticate(admin)
+        return self.client.generic('POST', '/api/import/', body, content_type=content_type)
+
+    def test_endpoint_requires_staff(self):
+        self.client.force_authenticate(User.objects.create_user('editor'))
+        response = self.client.generic('POST', '/api/import/', b'', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 403)
+
+    def test_import_and_upsert(self):
+        rows = [
+            self.row(0, tags=['tag-0', 'tag-1']),
+            self.row(1, category=NewsCategory.EVENTS, event_date='2026-05-01', event_time='10:00',
+                     event_category='lecture', location_ru='Зал', location_kg='Зал', location_en='Hall'),
+            self.row(2, title_ru=''),
+            self.row(3, tags=['missing']),
+        ]
+        response = self.post(self.ndjson(rows) + b'\nnot json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['failed']), (2, 0, 3))
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5])
+        self.assertIn('title_ru', response.data['errors'][0]['errors'])
+
+        news = News.objects.get(slug='import-0')
+        self.assertEqual(news.read_time_ru, 2)
+        self.assertEqual(set(news.tags.values_list('tag__slug', flat=True)), {'tag-0', 'tag-1'})
+        self.assertEqual(Event.objects.get(news__slug='import-1').location_en, 'Hall')
+        self.assertEqual(set(search_news('imported')[0]), set(News.objects.values_list('id', flat=True)))
+
+        response = self.post(self.ndjson([self.row(0, title_en='Renamed', tags=['tag-2'])]))
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        news.refresh_from_db()
+        self.assertEqual(news.title_en, 'Renamed')
+        self.assertEqual(list(news.tags.values_list('tag__slug', flat=True)), ['tag-2'])
+        self.assertEqual(search_news('renamed')[0], [news.id])
+
+    def test_constant_queries_per_chunk(self):
+        def count(rows):
+            importer = NewsImporter(chunk_size=100, rebuild_related=False)
+            with CaptureQueriesContext(connection) as context:
+                report = importer.import_stream(self.ndjson(rows), 'ndjson')
+            self.assertEqual(report.failed, 0)
+            return len(context.captured_queries)
+
+        small = count([self.row(index, tags=['tag-0']) for index in range(3)])
+        large = count([self.row(index, tags=['tag-0', 'tag-1']) for index in range(3, 60)])
+        self.assertEqual(small, large)
+
+    def test_command_csv(self):
+        header = ['slug', 'category', 'title_ru', 'title_kg', 'title_en', 'summary_ru', 'summary_kg', 'summary_en',
+                  'content_ru', 'content_kg', 'content_en', 'tags', 'is_featured']
+        lines = [','.join(header), 'csv-0,news,Новость,Жаңылык,News,О,С,S,Текст,Текст,Text,"tag-0,tag-1",true']
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as handle:
+            handle.write('\n'.join(lines))
+        self.addCleanup(os.remove, handle.name)
+
+        call_command('import_news', handle.name, stdout=StringIO(), stderr=StringIO())
+        news = News.objects.get(slug='csv-0')
+        self.assertTrue(news.is_featured)
+        self.assertEqual(news.tags.count(), 2)
@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     NewsViewSet, EventViewSet, AnnouncementViewSet,
     NewsCategoryViewSet, NewsTagViewSet,
-    NewsStatsView, SearchAllView
+    NewsStatsView, SearchAllView, NewsImportView
 )
 
 app_name = 'news'
@@ -23,6 +23,7 @@ urlpatterns = [
     # Дополнительные эндпоинты
     path('stats/', NewsStatsView.as_view(), name='news-stats'),
     path('search/', SearchAllView.as_view(), name='search-all'),
+    path('import/', NewsImportView.as_view(), name='news-import'),
 ]
 
 # Итоговые URL patterns:
@@ -66,3 +67,4 @@ urlpatterns = [
 #
 # GET /news/api/stats/ - статистика
 # GET /news/api/search/?q={query} - поиск по всем типам контента
+# POST /news/api/import/ - массовый импорт (NDJSON/CSV, только для staff)
@@ -1,98 +1,104 @@
 from rest_framework import viewsets, generics, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, F
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from calendar import monthrange
 from datetime import datetime, timedelta
 
-from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsView
+from back_su_m.columns import LanguageColumnsMixin, SerializerColumnsMixin, optimize_queryset
+from back_su_m.conditional import ConditionalGetMixin
+from back_su_m.streaming import StreamingListMixin
+from back_su_m.view_counter import get_client_ip, get_view_counter
+from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsTagRelation, NewsView, local_now
+from .importer import CSV, FORMATS, NDJSON, NewsImporter
+from .search import FullTextSearchFilter, count_matches, order_by_ids, search_news
+from .stats import get_stats
 from .serializers import (
     NewsListSerializer, NewsDetailSerializer, NewsCreateUpdateSerializer,
     EventListSerializer, EventCreateUpdateSerializer,
     AnnouncementListSerializer, AnnouncementCreateUpdateSerializer,
-    NewsCategorySerializer, NewsTagSerializer
+    NewsCategorySerializer, NewsTagSerializer, with_tags
 )
 
+news_view_counter = get_view_counter(News, NewsView, 'news')
 
-class NewsCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+
+class NewsCategoryViewSet(ConditionalGetMixin, LanguageColumnsMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для категорий новостей"""
     queryset = NewsCategory.objects.all()
     serializer_class = NewsCategorySerializer
     lookup_field = 'slug'
 
 
-class NewsTagViewSet(viewsets.ModelViewSet):
+class NewsTagViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet для тегов новостей"""
     queryset = NewsTag.objects.all()
     serializer_class = NewsTagSerializer
     lookup_field = 'slug'
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(ConditionalGetMixin, LanguageColumnsMixin, SerializerColumnsMixin, viewsets.ModelViewSet):
     """ViewSet для новостей"""
     queryset = News.objects.filter(is_published=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['category__name', 'is_featured', 'is_pinned']
-    search_fields = ['title', 'summary', 'content']
     ordering_fields = ['published_at', 'views_count', 'created_at']
     ordering = ['-published_at']
+    # Списочные действия загружают только колонки NewsListSerializer
+    serializer_columns_actions = ['list', 'featured', 'pinned', 'popular', 'by_category']
+    # retrieve не отвечает 304: он учитывает просмотр
+    conditional_actions = serializer_columns_actions
+    # Теги новости - в NewsTagRelation: их правка не трогает таблицу News
+    conditional_models = [News, NewsCategory, NewsTag, NewsTagRelation]
     
     def get_queryset(self):
         """Переопределяем queryset для поддержки поиска по slug"""
-        queryset = News.objects.filter(is_published=True)
+        queryset = super().get_queryset()
         
         # Поддержка поиска по slug в query параметрах
         slug = self.request.query_params.get('slug', None)
         if slug is not None:
             queryset = queryset.filter(slug=slug)
             
-        return queryset.select_related('category')
+        return with_tags(queryset.select_related('category'))
     
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in self.serializer_columns_actions:
             return NewsListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return NewsCreateUpdateSerializer
         return NewsDetailSerializer
     
+    def get_conditional_key(self):
+        # popular - окно последних 30 дней, сдвигается раз в сутки
+        return str(local_now()[0]) if self.action == 'popular' else ''
+    
     def retrieve(self, request, *args, **kwargs):
         """Переопределяем для поддержки ID и slug, и учета просмотров"""
         lookup_value = kwargs.get('pk')
         
         # Проверяем, является ли значение числом (ID) или строкой (slug)
         if lookup_value.isdigit():
-            instance = get_object_or_404(News, pk=lookup_value, is_published=True)
+            instance = get_object_or_404(self.get_queryset(), pk=lookup_value)
         else:
-            instance = get_object_or_404(News, slug=lookup_value, is_published=True)
+            instance = get_object_or_404(self.get_queryset(), slug=lookup_value)
         
-        # Увеличиваем счетчик просмотров
-        ip_address = self.get_client_ip(request)
-        news_view, created = NewsView.objects.get_or_create(
-            news=instance,
-            ip_address=ip_address,
-            defaults={'user_agent': request.META.get('HTTP_USER_AGENT', '')}
+        # Просмотр учитывается в буфере и сбрасывается в БД пачкой
+        news_view_counter.record(
+            instance.pk,
+            get_client_ip(request),
+            request.META.get('HTTP_USER_AGENT', '')
         )
         
-        if created:
-            # Увеличиваем счетчик только для новых просмотров
-            News.objects.filter(id=instance.id).update(views_count=F('views_count') + 1)
-            instance.refresh_from_db()
-        
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
-    def get_client_ip(self, request):
-        """Получение IP адреса клиента"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
-    
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Получение рекомендуемых новостей"""
@@ -140,16 +146,18 @@ class NewsViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet для событий"""
     queryset = Event.objects.select_related('news').filter(news__is_published=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'news__slug'
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status', 'event_category', 'registration_required']
-    search_fields = ['news__title', 'news__summary', 'location']
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
+    filterset_fields = ['event_category', 'registration_required']
+    search_index_lookup = 'news_id'
     ordering_fields = ['event_date', 'event_time', 'news__published_at']
     ordering = ['event_date', 'event_time']
+    CALENDAR_MAX_DAYS = 366
+    conditional_models = [Event, News]
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -158,54 +166,81 @@ class EventViewSet(viewsets.ModelViewSet):
             return EventCreateUpdateSerializer
         return EventListSerializer  # Для detail используем тот же сериализатор
     
+    def get_conditional_key(self):
+        # Статус события вычисляется по текущему времени с точностью до минуты
+        today, now = local_now()
+        return f'{today}T{now:%H:%M}'
+    
     def get_object(self):
         """Переопределяем для поиска по slug новости"""
         slug = self.kwargs.get('news__slug')
         return get_object_or_404(self.get_queryset(), news__slug=slug)
     
+    def get_queryset(self):
+        """?status= фильтрует по статусу на текущий момент, а не по хранимому полю"""
+        queryset = super().get_queryset()
+        event_status = self.request.query_params.get('status')
+        if event_status:
+            queryset = queryset.with_status(event_status)
+        return queryset
+    
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Предстоящие события"""
-        upcoming_events = self.get_queryset().filter(status='upcoming')
-        serializer = EventListSerializer(upcoming_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        upcoming_events = self.get_queryset().upcoming()
+        return self.list_response(upcoming_events, EventListSerializer)
     
     @action(detail=False, methods=['get'])
     def past(self, request):
         """Прошедшие события"""
-        past_events = self.get_queryset().filter(status='past')
-        serializer = EventListSerializer(past_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        past_events = self.get_queryset().past().order_by('-event_date', '-event_time')
+        return self.list_response(past_events, EventListSerializer)
     
     @action(detail=False, methods=['get'])
     def this_month(self, request):
-        """События этого месяца"""
-        today = datetime.now().date()
+        """События этого месяца (по часовому поясу проекта)"""
+        today, _ = local_now()
         first_day = today.replace(day=1)
-        if today.month == 12:
-            last_day = today.replace(year=today.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            last_day = today.replace(month=today.month + 1, day=1) - timedelta(days=1)
+        last_day = first_day.replace(day=monthrange(today.year, today.month)[1])
         
-        month_events = self.get_queryset().filter(
-            event_date__gte=first_day,
-            event_date__lte=last_day
-        )
+        month_events = self.get_queryset().in_range(first_day, last_day)
+        
+        return self.list_response(month_events, EventListSerializer)
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """События в окне ?from=YYYY-MM-DD&to=YYYY-MM-DD"""
+        try:
+            date_from = parse_date(request.query_params.get('from') or '')
+            date_to = parse_date(request.query_params.get('to') or '')
+        except ValueError:
+            date_from = date_to = None
+        if date_from is None or date_to is None:
+            return Response({'error': 'Параметры from и to обязательны (формат YYYY-MM-DD)'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if date_from > date_to:
+            return Response({'error': 'Дата from должна быть не позже to'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if (date_to - date_from).days >= self.CALENDAR_MAX_DAYS:
+            return Response({'error': f'Окно не может превышать {self.CALENDAR_MAX_DAYS} дней'},
+                          status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = EventListSerializer(month_events, many=True, context={'request': request})
+        events = self.get_queryset().in_range(date_from, date_to).order_by('event_date', 'event_time')
+        serializer = EventListSerializer(events, many=True, context={'request': request})
         return Response(serializer.data)
 
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(ConditionalGetMixin, StreamingListMixin, viewsets.ModelViewSet):
     """ViewSet для объявлений"""
     queryset = Announcement.objects.select_related('news').filter(news__is_published=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'news__slug'
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['announcement_type', 'priority', 'is_deadline_approaching']
-    search_fields = ['news__title', 'news__summary', 'news__content']
+    search_index_lookup = 'news_id'
     ordering_fields = ['news__published_at', 'deadline', 'priority']
     ordering = ['-priority', '-news__published_at']
+    conditional_models = [Announcement, News]
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -223,8 +258,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     def pinned(self, request):
         """Закрепленные объявления"""
         pinned_announcements = self.get_queryset().filter(news__is_pinned=True)
-        serializer = AnnouncementListSerializer(pinned_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(pinned_announcements, AnnouncementListSerializer)
     
     @action(detail=False, methods=['get'])
     def urgent(self, request):
@@ -232,8 +266,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         urgent_announcements = self.get_queryset().filter(
             Q(priority='high') | Q(priority='urgent') | Q(is_deadline_approaching=True)
         )
-        serializer = AnnouncementListSerializer(urgent_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(urgent_announcements, AnnouncementListSerializer)
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
@@ -257,66 +290,89 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     def for_students(self, request):
         """Объявления для студентов"""
         student_announcements = self.get_queryset().filter(target_students=True)
-        serializer = AnnouncementListSerializer(student_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(student_announcements, AnnouncementListSerializer)
 
 
 # Дополнительные API views для статистики и поиска
+class NewsImportView(APIView):
+    """Массовый импорт новостей/событий/объявлений (news/importer.py).
+
+    Тело запроса - NDJSON (Content-Type: application/x-ndjson) или CSV
+    (text/csv), либо multipart с файлом в поле file. Формат можно указать
+    явно параметром ?type=ndjson|csv.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request):
+        upload = None
+        if request.content_type.startswith('multipart/'):
+            upload = request.FILES.get('file')
+            if upload is None:
+                return Response({'error': 'Файл не передан (поле file)'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        fmt = request.query_params.get('type') or self.detect_format(request, upload)
+        if fmt not in FORMATS:
+            return Response({'error': 'Формат не распознан, укажите ?type=ndjson или ?type=csv'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        stream = upload.file if upload is not None else request.stream
+        if stream is None:
+            return Response({'error': 'Пустое тело запроса'}, status=status.HTTP_400_BAD_REQUEST)
+        report = NewsImporter().import_stream(stream, fmt)
+        return Response(report.as_dict())
+    
+    @staticmethod
+    def detect_format(request, upload):
+        name = (upload.name if upload is not None else '').lower()
+        content_type = request.content_type.lower()
+        if name.endswith('.csv') or 'csv' in content_type:
+            return CSV
+        if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+            return NDJSON
+        return None
+
+
 class NewsStatsView(generics.GenericAPIView):
     """API для получения статистики новостей"""
     
     def get(self, request):
-        stats = {
-            'total_news': News.objects.filter(is_published=True).count(),
-            'total_events': Event.objects.filter(news__is_published=True).count(),
-            'total_announcements': Announcement.objects.filter(news__is_published=True).count(),
-            'upcoming_events': Event.objects.filter(
-                news__is_published=True, 
-                status='upcoming'
-            ).count(),
-            'urgent_announcements': Announcement.objects.filter(
-                news__is_published=True,
-                priority__in=['high', 'urgent']
-            ).count(),
-            'featured_news': News.objects.filter(
-                is_published=True, 
-                is_featured=True
-            ).count(),
-        }
-        return Response(stats)
+        stats, duration, cached = get_stats()
+        response = Response(stats)
+        # Время расчета видно в DevTools браузера (вкладка Timing)
+        response['Server-Timing'] = f'stats;dur={duration:.2f};desc="{"hit" if cached else "miss"}"'
+        return response
 
 
 class SearchAllView(generics.GenericAPIView):
-    """Общий поиск по всем типам контента"""
-    
+    """Общий поиск по всем типам контента (полнотекстовый индекс, news/search.py)"""
+    RESULTS_PER_TYPE = 5
+
     def get(self, request):
         query = request.query_params.get('q', '')
         if len(query) < 2:
             return Response({'error': 'Поисковый запрос должен содержать минимум 2 символа'})
-        
-        # Поиск в новостях
-        news = News.objects.filter(
-            Q(title__icontains=query) | Q(summary__icontains=query) | Q(content__icontains=query),
-            is_published=True
-        )[:5]
-        
-        # Поиск в событиях
-        events = Event.objects.filter(
-            Q(news__title__icontains=query) | Q(news__summary__icontains=query) | Q(location__icontains=query),
-            news__is_published=True
-        )[:5]
-        
-        # Поиск в объявлениях
-        announcements = Announcement.objects.filter(
-            Q(news__title__icontains=query) | Q(news__summary__icontains=query) | Q(news__content__icontains=query),
-            news__is_published=True
-        )[:5]
-        
+
+        ids, kinds = search_news(query)
+        top = {kind: [] for kind in ('news', 'event', 'announcement')}
+        for news_id in ids:
+            if len(top[kinds[news_id]]) < self.RESULTS_PER_TYPE:
+                top[kinds[news_id]].append(news_id)
+
+        news = with_tags(optimize_queryset(News.objects.filter(id__in=top['news']), NewsListSerializer))
+        events = Event.objects.filter(news_id__in=top['event']).select_related('news')
+        announcements = Announcement.objects.filter(news_id__in=top['announcement']).select_related('news')
+
+        context = {'request': request}
         results = {
-            'news': NewsListSerializer(news, many=True, context={'request': request}).data,
-            'events': EventListSerializer(events, many=True, context={'request': request}).data,
-            'announcements': AnnouncementListSerializer(announcements, many=True, context={'request': request}).data,
-            'total_found': news.count() + events.count() + announcements.count()
+            'news': NewsListSerializer(order_by_ids(news, top['news']), many=True, context=context).data,
+            'events': EventListSerializer(
+                order_by_ids(events, top['event'], key=lambda event: event.news_id), many=True, context=context
+            ).data,
+            'announcements': AnnouncementListSerializer(
+                order_by_ids(announcements, top['announcement'], key=lambda item: item.news_id),
+                many=True, context=context
+            ).data,
+            'total_found': count_matches(query),
         }
-        
+
         return Response(results)
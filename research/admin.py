@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication,
     ResearchManagementPosition, ScientificCouncil, Commission,
-    ScientificJournal, JournalIssue, JournalArticle
+    ScientificJournal, JournalIssue, JournalArticle, Author
 )
 
 
@@ -173,6 +173,17 @@ class PublicationAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(Author)
+class AuthorAdmin(admin.ModelAdmin):
+    list_display = ['name_ru', 'name_en', 'publications_count', 'citations_count', 'h_index']
+    search_fields = ['name_ru', 'name_en', 'name_kg', 'key']
+    # Авторы и показатели пересчитываются при сохранении публикаций
+    readonly_fields = ['key', 'publications_count', 'citations_count', 'h_index', 'by_year', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(GrantApplication)
 class GrantApplicationAdmin(admin.ModelAdmin):
     list_display = ['project_title', 'principal_investigator', 'grant', 'status', 'budget', 'submitted_at']
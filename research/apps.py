@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResearchConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'research'
+    
+    def ready(self):
+        # Регистрируем обработчики сигналов (библиометрия, поисковый индекс)
+        import research.signals
@@ -0,0 +1,281 @@
+"""
+Библиометрия публикаций: авторы, индекс Хирша, цитирования по годам.
+
+Авторы публикации хранятся строками (authors_ru/en/kg: "Иванов И.И.,
+Петров П.П."), поэтому любая статистика по автору требовала icontains
+по всей таблице. Здесь строки разбираются в таблицу Author (ключ -
+нормализованное русское имя, английское и кыргызское имя берутся с той
+же позиции списка) и связи PublicationAuthor.
+
+Показатели (BibliometricMetrics) хранятся готовыми для каждого автора
+(Author), области исследований (ResearchAreaMetrics) и типа публикаций
+(PublicationTypeMetrics) и считаются только по активным публикациям:
+
+    publications_count, citations_count, h_index - наибольшее h, при
+    котором h публикаций процитированы не менее h раз; by_year - число
+    публикаций и цитирований по году публикации.
+
+При сохранении и удалении публикации (research/signals.py)
+пересчитываются только затронутые строки: ее авторы (прежние и новые),
+область и тип - несколько запросов независимо от размера таблиц.
+Изменения через queryset.update() сигналов не вызывают; полный
+пересчет - командой rebuild_bibliometrics.
+"""
+
+import re
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import Author, Publication, PublicationAuthor, PublicationTypeMetrics, ResearchAreaMetrics
+
+METRIC_FIELDS = ('publications_count', 'citations_count', 'h_index', 'by_year', 'updated_at')
+
+# Разделители авторов: запятая, точка с запятой, "и", "and", "&"
+SEPARATOR_RE = re.compile(r'\s*(?:[;,]|\s(?:и|and|&)\s)\s*', re.IGNORECASE)
+# "и др.", "et al.", "ж.б." - не автор
+ET_AL_RE = re.compile(r'^(?:и\s*др|et\s*al|ж\.?\s*б)\.?$', re.IGNORECASE)
+# "И. И." -> "И.И."
+INITIALS_RE = re.compile(r'(?<=\b\w\.)\s+(?=\w\.)')
+
+AuthorName = namedtuple('AuthorName', 'key name_ru name_en name_kg')
+
+
+def normalize_name(name):
+    return INITIALS_RE.sub('', ' '.join(name.split()))
+
+
+def author_key(name):
+    """Ключ автора: имя без учета регистра, лишних пробелов и ё"""
+    return normalize_name(name).lower().replace('ё', 'е')
+
+
+def parse_authors(value):
+    """Имена из строки авторов в порядке перечисления"""
+    names = (normalize_name(name) for name in SEPARATOR_RE.split(value or ''))
+    return [name for name in names if name and not ET_AL_RE.match(name)]
+
+
+def split_authors(authors_ru, authors_en='', authors_kg=''):
+    """[AuthorName] публикации без повторов.
+
+    Английское и кыргызское имя берутся с той же позиции, если списки
+    одной длины с русским.
+    """
+    names_ru = parse_authors(authors_ru)
+    translations = []
+    for value in (authors_en, authors_kg):
+        names = parse_authors(value)
+        translations.append(names if len(names) == len(names_ru) else [''] * len(names_ru))
+    result = {}
+    for name_ru, name_en, name_kg in zip(names_ru, *translations):
+        key = author_key(name_ru)
+        if key not in result:
+            result[key] = AuthorName(key, name_ru, name_en, name_kg)
+    return list(result.values())
+
+
+def h_index(citations):
+    """Наибольшее h: h публикаций процитированы не менее h раз"""
+    ranked = sorted(citations, reverse=True)
+    return sum(1 for position, count in enumerate(ranked, 1) if count >= position)
+
+
+def compute_metrics(rows):
+    """Значения METRIC_FIELDS (кроме updated_at) для строк (год, цитирования, импакт-фактор)"""
+    years = defaultdict(lambda: [0, 0])
+    citations = []
+    for year, count, _ in rows:
+        citations.append(count)
+        years[year][0] += 1
+        years[year][1] += count
+    return {
+        'publications_count': len(citations),
+        'citations_count': sum(citations),
+        'h_index': h_index(citations),
+        'by_year': [
+            {'year': year, 'publications': publications, 'citations': cited}
+            for year, (publications, cited) in sorted(years.items())
+        ],
+    }
+
+
+def average_impact_factor(rows):
+    factors = [factor for _, _, factor in rows if factor is not None]
+    if not factors:
+        return Decimal('0')
+    return (sum(factors) / len(factors)).quantize(Decimal('0.01'))
+
+
+# Связи публикаций с авторами
+
+def link_publications(publications):
+    """Пересобирает связи PublicationAuthor.
+
+    publications - [(id, authors_ru, authors_en, authors_kg, is_active)];
+    у неактивных публикаций связей нет. Возвращает (id авторов этих
+    публикаций до и после, id публикаций с изменившимися авторами).
+    """
+    parsed = {
+        pk: split_authors(ru, en, kg) if is_active else []
+        for pk, ru, en, kg, is_active in publications
+    }
+    names = {}
+    for entries in parsed.values():
+        for entry in entries:
+            names.setdefault(entry.key, entry)
+    authors = dict(Author.objects.filter(key__in=list(names)).values_list('key', 'id'))
+    missing = [
+        Author(key=entry.key, name_ru=entry.name_ru, name_en=entry.name_en, name_kg=entry.name_kg)
+        for key, entry in names.items() if key not in authors
+    ]
+    if missing:
+        Author.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+        authors.update(Author.objects.filter(key__in=[author.key for author in missing]).values_list('key', 'id'))
+
+    old_links = defaultdict(list)
+    for publication_id, author_id, position in PublicationAuthor.objects.filter(
+        publication_id__in=list(parsed)
+    ).order_by('publication_id', 'position').values_list('publication_id', 'author_id', 'position'):
+        old_links[publication_id].append((author_id, position))
+
+    affected = set()
+    changed, links = [], []
+    for publication_id, entries in parsed.items():
+        new = [(authors[entry.key], position) for position, entry in enumerate(entries)]
+        old = old_links.get(publication_id, [])
+        affected.update(author_id for author_id, _ in old)
+        affected.update(author_id for author_id, _ in new)
+        if new != old:
+            changed.append(publication_id)
+            links.extend(
+                PublicationAuthor(publication_id=publication_id, author_id=author_id, position=position)
+                for author_id, position in new
+            )
+    if changed:
+        PublicationAuthor.objects.filter(publication_id__in=changed).delete()
+        PublicationAuthor.objects.bulk_create(links, batch_size=500)
+    return affected, changed
+
+
+# Пересчет показателей
+
+def group_rows(values):
+    """{ключ: [(год, цитирования, импакт-фактор)]} из (ключ, дата, цитирования, импакт-фактор)"""
+    rows = defaultdict(list)
+    for key, date, citations, impact_factor in values:
+        rows[key].append((date.year, citations, impact_factor))
+    return rows
+
+
+def store_metrics(model, key_field, keys, rows, extra=None):
+    """Обновляет строки model для keys; строки без публикаций удаляются.
+
+    extra(rows) - дополнительные поля модели, кроме METRIC_FIELDS
+    """
+    keys = {key for key in keys if key is not None}
+    if not keys:
+        return
+    existing = {getattr(obj, key_field): obj for obj in model.objects.filter(**{f'{key_field}__in': keys})}
+    now = timezone.now()
+    created, updated = [], []
+    fields = set(METRIC_FIELDS)
+    for key in keys:
+        key_rows = rows.get(key)
+        if not key_rows:
+            continue
+        obj = existing.get(key) or model(**{key_field: key})
+        values = compute_metrics(key_rows)
+        if extra:
+            values.update(extra(key_rows))
+            fields.update(values)
+        for field, value in values.items():
+            setattr(obj, field, value)
+        obj.updated_at = now
+        (updated if key in existing else created).append(obj)
+    if created:
+        model.objects.bulk_create(created, batch_size=500)
+    if updated:
+        model.objects.bulk_update(updated, sorted(fields), batch_size=500)
+    stale = [key for key in existing if not rows.get(key)]
+    if stale:
+        model.objects.filter(**{f'{key_field}__in': stale}).delete()
+
+
+def update_authors(author_ids):
+    """Пересчитывает авторов; авторы без активных публикаций удаляются"""
+    author_ids = list(author_ids)
+    rows = group_rows(PublicationAuthor.objects.filter(
+        author_id__in=author_ids, publication__is_active=True,
+    ).values_list('author_id', 'publication__publication_date',
+                  'publication__citations_count', 'publication__impact_factor'))
+    store_metrics(Author, 'pk', author_ids, rows)
+
+
+def update_areas(area_ids):
+    area_ids = [area_id for area_id in area_ids if area_id is not None]
+    rows = group_rows(Publication.objects.filter(
+        is_active=True, research_area_id__in=area_ids,
+    ).values_list('research_area_id', 'publication_date', 'citations_count', 'impact_factor'))
+    store_metrics(ResearchAreaMetrics, 'research_area_id', area_ids, rows)
+
+
+def type_extra(rows):
+    return {'avg_impact_factor': average_impact_factor(rows)}
+
+
+def update_types(publication_types):
+    publication_types = [value for value in publication_types if value]
+    rows = group_rows(Publication.objects.filter(
+        is_active=True, publication_type__in=publication_types,
+    ).values_list('publication_type', 'publication_date', 'citations_count', 'impact_factor'))
+    store_metrics(PublicationTypeMetrics, 'publication_type', publication_types, rows, type_extra)
+
+
+# Точки входа
+
+# Поля публикации, от которых зависят показатели
+SOURCE_FIELDS = (
+    'research_area_id', 'publication_type', 'is_active',
+    'publication_date', 'citations_count', 'impact_factor',
+)
+
+
+def publication_saved(publication, previous=None):
+    """Пересчет после сохранения; previous - {поле SOURCE_FIELDS: значение} до сохранения"""
+    authors, changed = link_publications([(
+        publication.pk, publication.authors_ru, publication.authors_en,
+        publication.authors_kg, publication.is_active,
+    )])
+    current = {field: getattr(publication, field) for field in SOURCE_FIELDS}
+    if previous == current:
+        # Правка текста: показатели не меняются, кроме авторов при новом списке
+        if changed:
+            update_authors(authors)
+        return
+    previous = previous or {}
+    update_authors(authors)
+    update_areas({publication.research_area_id, previous.get('research_area_id')})
+    update_types({publication.publication_type, previous.get('publication_type')})
+
+
+def publication_deleted(publication, author_ids):
+    """Пересчет после удаления; author_ids - авторы удаленной публикации"""
+    update_authors(author_ids)
+    update_areas({publication.research_area_id})
+    update_types({publication.publication_type})
+
+
+def rebuild_all():
+    """Полный пересчет; возвращает (авторов, связей)"""
+    publications = list(Publication.objects.values_list(
+        'id', 'authors_ru', 'authors_en', 'authors_kg', 'is_active',
+    ))
+    link_publications(publications)
+    update_authors(Author.objects.values_list('id', flat=True))
+    update_areas(set(Publication.objects.values_list('research_area_id', flat=True))
+                 | set(ResearchAreaMetrics.objects.values_list('research_area_id', flat=True)))
+    update_types(set(Publication.objects.values_list('publication_type', flat=True))
+                 | set(PublicationTypeMetrics.objects.values_list('publication_type', flat=True)))
+    return Author.objects.count(), PublicationAuthor.objects.count()
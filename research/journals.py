@@ -0,0 +1,100 @@
+"""
+Каталог выпусков научных журналов.
+
+Список журналов показывал у каждого журнала последний выпуск и число
+выпусков, а карточка журнала - недавние выпуски и архив по годам; все
+это считалось запросами на журнал (и еще запросом на выпуск ради
+названия журнала). JournalCatalog загружает данные для всех журналов
+ответа сразу:
+
+- последний выпуск и число выпусков - одним запросом с оконными
+  функциями (ROW_NUMBER и COUNT по журналу);
+- выпуски для архива - одним запросом, группировка по годам идет по
+  уже упорядоченным строкам.
+
+Каталог хранится в context сериализатора (как деревья в
+back_su_m.trees), поэтому ответ стоит постоянное число запросов при
+любом числе журналов и выпусков.
+"""
+
+from itertools import groupby
+from operator import attrgetter
+
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .models import JournalIssue
+
+CATALOG_CONTEXT_KEY = 'journal_catalog'
+
+# Порядок выпусков: новые первыми
+ISSUE_ORDERING = ('-year', '-volume', '-number')
+
+
+def published_issues():
+    """Опубликованные выпуски в порядке ISSUE_ORDERING"""
+    return JournalIssue.objects.filter(is_published=True, is_active=True).order_by(*ISSUE_ORDERING)
+
+
+def group_by_year(issues):
+    """[(год, [выпуски])] для выпусков, упорядоченных по убыванию года"""
+    return [(year, list(group)) for year, group in groupby(issues, key=attrgetter('year'))]
+
+
+class JournalCatalog:
+    """Последние выпуски, число выпусков и архивы журналов journals"""
+
+    def __init__(self, journals):
+        self.journals = {journal.pk: journal for journal in journals}
+        self._latest = None
+        self._issues = None
+
+    def add(self, journal):
+        """Журнал вне исходного набора - данные загружаются заново"""
+        if journal.pk not in self.journals:
+            self.journals[journal.pk] = journal
+            self._latest = self._issues = None
+
+    def attach(self, issues):
+        # journal_title выпуска без запроса журнала
+        for issue in issues:
+            issue.journal = self.journals[issue.journal_id]
+        return issues
+
+    def load_latest(self):
+        ordering = [F(field.lstrip('-')).desc() for field in ISSUE_ORDERING]
+        issues = published_issues().filter(journal_id__in=list(self.journals)).annotate(
+            position=Window(RowNumber(), partition_by=F('journal_id'), order_by=ordering),
+            journal_issues_count=Window(Count('pk'), partition_by=F('journal_id')),
+        ).filter(position=1)
+        return {issue.journal_id: issue for issue in self.attach(list(issues))}
+
+    def load_issues(self):
+        issues = {journal_id: [] for journal_id in self.journals}
+        for issue in self.attach(list(published_issues().filter(journal_id__in=list(self.journals)))):
+            issues[issue.journal_id].append(issue)
+        return issues
+
+    def latest_issue(self, journal):
+        self.add(journal)
+        if self._latest is None:
+            self._latest = self.load_latest()
+        return self._latest.get(journal.pk)
+
+    def issues_count(self, journal):
+        latest = self.latest_issue(journal)
+        return latest.journal_issues_count if latest else 0
+
+    def issues(self, journal):
+        """Все опубликованные выпуски журнала, новые первыми"""
+        self.add(journal)
+        if self._issues is None:
+            self._issues = self.load_issues()
+        return self._issues[journal.pk]
+
+
+def get_catalog(context, journals=()):
+    """JournalCatalog из context; создается один раз на ответ"""
+    if CATALOG_CONTEXT_KEY not in context:
+        context[CATALOG_CONTEXT_KEY] = JournalCatalog(journals)
+    return context[CATALOG_CONTEXT_KEY]
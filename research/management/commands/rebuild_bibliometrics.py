@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from research.bibliometrics import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает авторов публикаций и библиометрические показатели'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            authors, links = rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(f'Авторов: {authors}, связей с публикациями: {links}')
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0009_grant_application_url'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='journalarticle',
+            index=models.Index(fields=['issue', 'order', 'id'], name='research_jarticle_order_idx'),
+        ),
+    ]
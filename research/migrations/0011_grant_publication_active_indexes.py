@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0010_journal_article_order_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='research_grant_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['status', 'created_at'], name='research_grant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['status', 'deadline'], name='research_grant_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['publication_date'], name='research_pub_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['publication_date'], name='research_pub_featured_idx'),
+        ),
+    ]
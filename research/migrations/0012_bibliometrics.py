@@ -0,0 +1,102 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0011_grant_publication_active_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publications_count', models.IntegerField(default=0, verbose_name='Количество публикаций')),
+                ('citations_count', models.IntegerField(default=0, verbose_name='Количество цитирований')),
+                ('h_index', models.IntegerField(default=0, verbose_name='Индекс Хирша')),
+                ('by_year', models.JSONField(default=list, verbose_name='По годам')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('key', models.CharField(max_length=200, unique=True, verbose_name='Ключ')),
+                ('name_ru', models.CharField(max_length=200, verbose_name='Имя (рус)')),
+                ('name_en', models.CharField(blank=True, max_length=200, verbose_name='Имя (англ)')),
+                ('name_kg', models.CharField(blank=True, max_length=200, verbose_name='Имя (кыр)')),
+            ],
+            options={
+                'verbose_name': 'Автор',
+                'verbose_name_plural': 'Авторы',
+                'ordering': ['-h_index', '-citations_count', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PublicationAuthor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Позиция')),
+            ],
+            options={
+                'verbose_name': 'Автор публикации',
+                'verbose_name_plural': 'Авторы публикаций',
+                'ordering': ['publication', 'position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PublicationTypeMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publications_count', models.IntegerField(default=0, verbose_name='Количество публикаций')),
+                ('citations_count', models.IntegerField(default=0, verbose_name='Количество цитирований')),
+                ('h_index', models.IntegerField(default=0, verbose_name='Индекс Хирша')),
+                ('by_year', models.JSONField(default=list, verbose_name='По годам')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('publication_type', models.CharField(choices=[('article', 'Статья'), ('book', 'Книга'), ('conference', 'Конференция'), ('patent', 'Патент'), ('thesis', 'Диссертация')], max_length=20, unique=True, verbose_name='Тип публикации')),
+                ('avg_impact_factor', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Средний импакт-фактор')),
+            ],
+            options={
+                'verbose_name': 'Показатели типа публикаций',
+                'verbose_name_plural': 'Показатели типов публикаций',
+                'ordering': ['-publications_count'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResearchAreaMetrics',
+            fields=[
+                ('publications_count', models.IntegerField(default=0, verbose_name='Количество публикаций')),
+                ('citations_count', models.IntegerField(default=0, verbose_name='Количество цитирований')),
+                ('h_index', models.IntegerField(default=0, verbose_name='Индекс Хирша')),
+                ('by_year', models.JSONField(default=list, verbose_name='По годам')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('research_area', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='metrics', serialize=False, to='research.researcharea', verbose_name='Область исследований')),
+            ],
+            options={
+                'verbose_name': 'Показатели области исследований',
+                'verbose_name_plural': 'Показатели областей исследований',
+                'ordering': ['research_area'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='journalarticle',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-citations_count'], name='research_jarticle_cited_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['-h_index', '-citations_count', 'id'], name='research_author_rank_idx'),
+        ),
+        migrations.AddField(
+            model_name='publicationauthor',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='publication_links', to='research.author', verbose_name='Автор'),
+        ),
+        migrations.AddField(
+            model_name='publicationauthor',
+            name='publication',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='author_links', to='research.publication', verbose_name='Публикация'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='publicationauthor',
+            unique_together={('publication', 'author')},
+        ),
+    ]
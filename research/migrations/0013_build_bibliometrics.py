@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def build_bibliometrics(apps, schema_editor):
+    # Авторы из существующих строк authors_* и показатели
+    from research.bibliometrics import rebuild_all
+    rebuild_all()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0012_bibliometrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_bibliometrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0014_research_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='journalarticle',
+            name='research_jarticle_order_idx',
+        ),
+    ]
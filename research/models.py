@@ -123,6 +123,15 @@ class Grant(models.Model):
         verbose_name = "Грант"
         verbose_name_plural = "Гранты"
         ordering = ['-created_at']
+        indexes = [
+            # API читает только активные гранты: список, active/upcoming, deadline_soon
+            models.Index(fields=['created_at'], name='research_grant_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['status', 'created_at'], name='research_grant_status_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['status', 'deadline'], name='research_grant_deadline_idx',
+                         condition=models.Q(is_active=True)),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.organization_ru})"
@@ -241,11 +250,94 @@ class Publication(models.Model):
         verbose_name = "Публикация"
         verbose_name_plural = "Публикации"
         ordering = ['-publication_date']
+        indexes = [
+            # API читает только активные публикации: список, recent, featured
+            models.Index(fields=['publication_date'], name='research_pub_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['publication_date'], name='research_pub_featured_idx',
+                         condition=models.Q(is_active=True, is_featured=True)),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.publication_date.year})"
 
 
+# Библиометрия: таблицы пересчитываются в research/bibliometrics.py
+class BibliometricMetrics(models.Model):
+    """Показатели набора публикаций (только активных)"""
+    publications_count = models.IntegerField("Количество публикаций", default=0)
+    citations_count = models.IntegerField("Количество цитирований", default=0)
+    h_index = models.IntegerField("Индекс Хирша", default=0)
+    # [{'year': 2024, 'publications': 3, 'citations': 17}, ...] по возрастанию года
+    by_year = models.JSONField("По годам", default=list)
+    updated_at = models.DateTimeField("Обновлено", auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class Author(BibliometricMetrics):
+    """Автор публикаций - нормализованное имя из строк authors_*"""
+    key = models.CharField("Ключ", max_length=200, unique=True)
+    name_ru = models.CharField("Имя (рус)", max_length=200)
+    name_en = models.CharField("Имя (англ)", max_length=200, blank=True)
+    name_kg = models.CharField("Имя (кыр)", max_length=200, blank=True)
+
+    class Meta:
+        verbose_name = "Автор"
+        verbose_name_plural = "Авторы"
+        ordering = ['-h_index', '-citations_count', 'id']
+        indexes = [
+            models.Index(fields=['-h_index', '-citations_count', 'id'], name='research_author_rank_idx'),
+        ]
+
+    def __str__(self):
+        return self.name_ru
+
+
+class PublicationAuthor(models.Model):
+    """Автор публикации и его место в списке авторов"""
+    publication = models.ForeignKey(Publication, on_delete=models.CASCADE, related_name='author_links', verbose_name="Публикация")
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='publication_links', verbose_name="Автор")
+    position = models.PositiveSmallIntegerField("Позиция")
+
+    class Meta:
+        verbose_name = "Автор публикации"
+        verbose_name_plural = "Авторы публикаций"
+        ordering = ['publication', 'position']
+        unique_together = ['publication', 'author']
+
+    def __str__(self):
+        return f"{self.author_id} -> {self.publication_id}"
+
+
+class ResearchAreaMetrics(BibliometricMetrics):
+    """Библиометрия области исследований"""
+    research_area = models.OneToOneField(ResearchArea, on_delete=models.CASCADE, primary_key=True, related_name='metrics', verbose_name="Область исследований")
+
+    class Meta:
+        verbose_name = "Показатели области исследований"
+        verbose_name_plural = "Показатели областей исследований"
+        ordering = ['research_area']
+
+    def __str__(self):
+        return str(self.research_area_id)
+
+
+class PublicationTypeMetrics(BibliometricMetrics):
+    """Библиометрия типа публикаций"""
+    publication_type = models.CharField("Тип публикации", max_length=20, choices=Publication.PUBLICATION_TYPE_CHOICES, unique=True)
+    avg_impact_factor = models.DecimalField("Средний импакт-фактор", max_digits=5, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Показатели типа публикаций"
+        verbose_name_plural = "Показатели типов публикаций"
+        ordering = ['-publications_count']
+
+    def __str__(self):
+        return self.publication_type
+
+
 class GrantApplication(models.Model):
     """Заявки на гранты"""
     STATUS_CHOICES = [
@@ -575,6 +667,11 @@ class JournalArticle(models.Model):
         verbose_name = "Статья журнала"
         verbose_name_plural = "Статьи журналов"
         ordering = ['issue', 'order', 'pages_start']
+        indexes = [
+            # most_cited: самые цитируемые активные статьи
+            models.Index(fields=['-citations_count'], name='research_jarticle_cited_idx',
+                         condition=models.Q(is_active=True)),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.issue})"
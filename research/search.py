@@ -0,0 +1,375 @@
+"""
+Поиск по разделу исследований: области, центры, гранты, конференции и
+публикации в одном индексе.
+
+Индекс - таблица research_search_index, одна строка на активную запись.
+Текст записи собирается в Python со всех трех языков, включая
+JSON-списки (ключевые слова публикаций, темы и спикеры конференций), в
+четыре колонки: title (A), people (B - авторы, директор, организация,
+спикеры), keywords (B) и body (C - описания, аннотации).
+
+- SQLite: виртуальная таблица FTS5 (porter unicode61), rowid =
+  pk * ENTITY_SLOTS + код типа. Ранжирование bm25 с весами колонок.
+- PostgreSQL: таблица (entity, entity_id, document tsvector) с
+  GIN-индексом; лексемы 'simple' (для префиксов и кыргызского), а также
+  'russian' и 'english' со стеммингом. Ранжирование ts_rank_cd.
+- Остальные СУБД: индекса нет, поиск через icontains по названиям.
+
+Каждое слово запроса ищется по префиксу, все слова обязательны. Если
+ничего не найдено, слова длиной от TYPO_MIN_LENGTH заменяются на
+термины словаря индекса на расстоянии редактирования 1 (2 для длинных
+слов) - опечатки вроде "кардеология". Ответ - один ранжированный запрос
+по всем типам сразу с ограничением числа записей на тип.
+
+Индекс обновляется из сигналов (research/signals.py) и полностью
+пересобирается командой rebuild_research_search_index.
+"""
+
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Conference, Grant, Publication, ResearchArea, ResearchCenter
+
+SEARCH_INDEX_TABLE = 'research_search_index'
+SEARCH_VOCAB_TABLE = 'research_search_vocab'
+LANGUAGES = ('ru', 'en', 'kg')
+
+COLUMNS = ('title', 'people', 'keywords', 'body')
+FTS5_WEIGHTS = (10.0, 5.0, 5.0, 1.0)
+POSTGRES_WEIGHTS = {'title': 'A', 'people': 'B', 'keywords': 'B', 'body': 'C'}
+POSTGRES_CONFIGS = ('simple', 'russian', 'english')
+
+# rowid в FTS5: pk * ENTITY_SLOTS + Entity.code
+ENTITY_SLOTS = 16
+TYPO_MIN_LENGTH = 4
+TYPO_CANDIDATES = 5
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Поля - префиксы языковых полей (title -> title_ru/en/kg) или обычные поля
+Entity = namedtuple('Entity', 'key code model title people keywords body')
+
+ENTITIES = (
+    Entity('research_areas', 1, ResearchArea, ('title',), (), (), ('description',)),
+    Entity('research_centers', 2, ResearchCenter, ('name',), ('director',), (), ('description', 'equipment')),
+    Entity('grants', 3, Grant, ('title',), ('organization',), (), ('description', 'requirements')),
+    Entity('conferences', 4, Conference, ('title',), ('speakers',), ('topics',), ('description', 'location')),
+    Entity('publications', 5, Publication, ('title',), ('authors',), ('keywords',), ('abstract', 'journal')),
+)
+ENTITY_BY_KEY = {entity.key: entity for entity in ENTITIES}
+ENTITY_BY_CODE = {entity.code: entity for entity in ENTITIES}
+ENTITY_BY_MODEL = {entity.model: entity for entity in ENTITIES}
+
+
+def backend():
+    """'postgresql', 'sqlite' или None, если индекс не поддерживается"""
+    if connection.vendor in ('postgresql', 'sqlite'):
+        return connection.vendor
+    return None
+
+
+def create_index(schema_editor):
+    """Создает таблицу индекса (вызывается из миграции)"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} ('
+            f'entity varchar(32) NOT NULL, entity_id bigint NOT NULL, '
+            f'document tsvector NOT NULL, PRIMARY KEY (entity, entity_id))'
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_TABLE}_document_gin '
+            f'ON {SEARCH_INDEX_TABLE} USING gin (document)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5('
+            f'{", ".join(COLUMNS)}, '
+            f"tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        # Словарь терминов для исправления опечаток
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_VOCAB_TABLE} '
+            f'USING fts5vocab({SEARCH_INDEX_TABLE}, row)'
+        )
+
+
+def drop_index(schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_VOCAB_TABLE}')
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}')
+
+
+# Документы
+
+def field_names(model, name):
+    """Языковые версии поля name или само поле"""
+    names = [f'{name}_{language}' for language in LANGUAGES]
+    fields = {field.name for field in model._meta.concrete_fields}
+    return names if names[0] in fields else [name]
+
+
+def flatten(value):
+    """Строки из значения поля, в том числе из JSON-списков и словарей"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in flatten(item)]
+    return [str(value)]
+
+
+def document(entity, obj):
+    """{колонка: текст} записи"""
+    return {
+        column: ' '.join(
+            text
+            for name in getattr(entity, column)
+            for field in field_names(entity.model, name)
+            for text in flatten(getattr(obj, field))
+        )
+        for column in COLUMNS
+    }
+
+
+def rowid(entity, pk):
+    return pk * ENTITY_SLOTS + entity.code
+
+
+def _postgres_document():
+    return ' || '.join(
+        f"setweight(to_tsvector('{config}', %s), '{POSTGRES_WEIGHTS[column]}')"
+        for column in COLUMNS for config in POSTGRES_CONFIGS
+    )
+
+
+def _delete_rows(cursor, entity, pks):
+    if not pks:
+        return
+    placeholders = ', '.join(['%s'] * len(pks))
+    if backend() == 'sqlite':
+        cursor.execute(
+            f'DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid IN ({placeholders})',
+            [rowid(entity, pk) for pk in pks],
+        )
+    else:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_INDEX_TABLE} WHERE entity = %s AND entity_id IN ({placeholders})',
+            [entity.key, *pks],
+        )
+
+
+def _insert_rows(cursor, entity, objects):
+    if backend() == 'sqlite':
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_INDEX_TABLE} (rowid, {", ".join(COLUMNS)}) '
+            f'VALUES (%s, {", ".join(["%s"] * len(COLUMNS))})',
+            [
+                [rowid(entity, obj.pk), *document(entity, obj).values()]
+                for obj in objects
+            ],
+        )
+    else:
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_INDEX_TABLE} (entity, entity_id, document) '
+            f'VALUES (%s, %s, {_postgres_document()})',
+            [
+                [entity.key, obj.pk, *(
+                    text for text in document(entity, obj).values() for _ in POSTGRES_CONFIGS
+                )]
+                for obj in objects
+            ],
+        )
+
+
+def update_objects(model, pks):
+    """Обновляет строки индекса записей model; неактивные удаляются"""
+    if backend() is None or not pks:
+        return
+    entity = ENTITY_BY_MODEL[model]
+    pks = list(pks)
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, entity, pks)
+        _insert_rows(cursor, entity, model.objects.filter(pk__in=pks, is_active=True))
+
+
+def remove_objects(model, pks):
+    if backend() is None:
+        return
+    with connection.cursor() as cursor:
+        _delete_rows(cursor, ENTITY_BY_MODEL[model], list(pks))
+
+
+def rebuild_index():
+    """Полностью пересобирает индекс, возвращает количество строк"""
+    if backend() is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_INDEX_TABLE}')
+        for entity in ENTITIES:
+            _insert_rows(cursor, entity, entity.model.objects.filter(is_active=True).iterator(chunk_size=500))
+        cursor.execute(f'SELECT COUNT(*) FROM {SEARCH_INDEX_TABLE}')
+        return cursor.fetchone()[0]
+
+
+# Запросы
+
+def query_words(query):
+    return WORD_RE.findall(query.lower())
+
+
+def edit_distance(a, b, limit):
+    """Расстояние Дамерау-Левенштейна (с перестановкой соседних букв); limit + 1, если больше limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def typo_limit(word):
+    return 2 if len(word) >= 8 else 1
+
+
+def vocabulary(cursor, first_letter):
+    """Термины индекса, начинающиеся с first_letter"""
+    if backend() == 'sqlite':
+        cursor.execute(
+            f'SELECT term FROM {SEARCH_VOCAB_TABLE} WHERE term >= %s AND term < %s',
+            [first_letter, first_letter + '\uffff'],
+        )
+    else:
+        cursor.execute(
+            f"SELECT word FROM ts_stat('SELECT document FROM {SEARCH_INDEX_TABLE}') WHERE word LIKE %s",
+            [first_letter.replace('%', '') + '%'],
+        )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def corrections(cursor, word):
+    """Термины словаря, отличающиеся от word (или от его начала) опечаткой"""
+    if len(word) < TYPO_MIN_LENGTH:
+        return []
+    limit = typo_limit(word)
+    letters = set(word)
+    scored = []
+    for term in vocabulary(cursor, word[0]):
+        # Слово может быть началом термина: "кардеол" -> "кардиология"
+        distances = [
+            edit_distance(word, candidate, limit)
+            for candidate in {term, term[:len(word)]}
+            # Каждая правка меняет не больше двух букв в наборе букв слова
+            if len(letters.symmetric_difference(candidate)) <= 2 * limit
+        ]
+        distance = min(distances, default=limit + 1)
+        if 0 < distance <= limit:
+            scored.append((distance, abs(len(term) - len(word)), term))
+    return [term for _, _, term in sorted(scored)[:TYPO_CANDIDATES]]
+
+
+def _fts5_query(words, alternatives=None):
+    """Запрос FTS5: все слова обязательны, каждое ищется по префиксу или заменяется исправлением"""
+    parts = []
+    for word in words:
+        options = [f'"{word}"*'] + [f'"{term}"*' for term in (alternatives or {}).get(word, [])]
+        parts.append(options[0] if len(options) == 1 else f'({" OR ".join(options)})')
+    return ' AND '.join(parts)
+
+
+def _postgres_query(words, alternatives=None):
+    parts = []
+    for word in words:
+        options = [word] + list((alternatives or {}).get(word, []))
+        parts.append('(' + ' | '.join(f"'{option}':*" for option in options) + ')')
+    return ' & '.join(parts)
+
+
+def _ranked(cursor, words, alternatives, per_type):
+    """[(Entity, pk)] по убыванию релевантности, не больше per_type записей каждого типа"""
+    if backend() == 'sqlite':
+        weights = ', '.join(str(weight) for weight in FTS5_WEIGHTS)
+        # bm25 - во внутреннем запросе: вспомогательные функции FTS5 нельзя вызывать в окне
+        cursor.execute(
+            f'SELECT id FROM ('
+            f'SELECT id, score, row_number() OVER ('
+            f'PARTITION BY id %% {ENTITY_SLOTS} ORDER BY score, id DESC) AS position FROM ('
+            f'SELECT rowid AS id, bm25({SEARCH_INDEX_TABLE}, {weights}) AS score '
+            f'FROM {SEARCH_INDEX_TABLE} WHERE {SEARCH_INDEX_TABLE} MATCH %s)'
+            f') WHERE position <= %s ORDER BY score, id DESC',
+            [_fts5_query(words, alternatives), per_type],
+        )
+        return [(ENTITY_BY_CODE[value % ENTITY_SLOTS], value // ENTITY_SLOTS) for value, in cursor.fetchall()]
+    tsquery = ' || '.join(f"to_tsquery('{config}', %s)" for config in POSTGRES_CONFIGS)
+    cursor.execute(
+        f'SELECT entity, entity_id FROM ('
+        f'SELECT entity, entity_id, ts_rank_cd(document, q.query) AS score, '
+        f'row_number() OVER (PARTITION BY entity ORDER BY ts_rank_cd(document, q.query) DESC, entity_id DESC) AS position '
+        f'FROM {SEARCH_INDEX_TABLE}, (SELECT {tsquery} AS query) AS q WHERE document @@ q.query'
+        f') AS ranked WHERE position <= %s ORDER BY score DESC, entity_id DESC',
+        [_postgres_query(words, alternatives)] * len(POSTGRES_CONFIGS) + [per_type],
+    )
+    return [(ENTITY_BY_KEY[key], pk) for key, pk in cursor.fetchall()]
+
+
+def ranked_matches(query, per_type=5):
+    """[(Entity, pk)] по убыванию релевантности и исправленные слова запроса.
+
+    None вместо списка - индекс не поддерживается СУБД.
+    """
+    if backend() is None:
+        return None, {}
+    words = query_words(query)
+    if not words:
+        return [], {}
+    with connection.cursor() as cursor:
+        matches = _ranked(cursor, words, None, per_type)
+        if matches:
+            return matches, {}
+        alternatives = {word: terms for word in words if (terms := corrections(cursor, word))}
+        if not alternatives:
+            return [], {}
+        return _ranked(cursor, words, alternatives, per_type), alternatives
+
+
+def multilingual_q(query, *fields):
+    """icontains по всем языковым версиям полей (_ru, _kg, _en)"""
+    condition = Q()
+    for field in fields:
+        for language in LANGUAGES:
+            condition |= Q(**{f'{field}_{language}__icontains': query})
+    return condition
+
+
+def fallback_matches(query, per_type=5):
+    """[(Entity, pk)] через icontains по названиям (и авторам публикаций)"""
+    matches = []
+    for entity in ENTITIES:
+        condition = multilingual_q(query, *entity.title)
+        if entity.model is Publication:
+            condition |= multilingual_q(query, 'authors')
+        pks = entity.model.objects.filter(condition, is_active=True).values_list('pk', flat=True)[:per_type]
+        matches.extend((entity, pk) for pk in pks)
+    return matches
+
+
+def search(query, per_type=5):
+    """Поиск по всем типам: ([(Entity, pk)] по релевантности, {слово: исправления})"""
+    matches, alternatives = ranked_matches(query, per_type)
+    if matches is None:
+        return fallback_matches(query, per_type), {}
+    return matches, alternatives
@@ -1,8 +1,11 @@
+from django.db import models
 from rest_framework import serializers
+from back_su_m.trees import TreeChildrenMixin
+from .journals import get_catalog, group_by_year
 from .models import (
     ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication,
     ResearchManagementPosition, ScientificCouncil, Commission,
-    ScientificJournal, JournalIssue, JournalArticle
+    ScientificJournal, JournalIssue, JournalArticle, Author, ResearchAreaMetrics
 )
 
 
@@ -185,10 +188,35 @@ class PublicationStatsSerializer(serializers.Serializer):
     avg_impact_factor = serializers.DecimalField(max_digits=5, decimal_places=2)
 
 
+# Сериализаторы для библиометрии
+BIBLIOMETRIC_FIELDS = ['publications_count', 'citations_count', 'h_index', 'by_year', 'updated_at']
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    """Сериализатор для авторов и их показателей"""
+    
+    class Meta:
+        model = Author
+        fields = ['id', 'name_ru', 'name_en', 'name_kg'] + BIBLIOMETRIC_FIELDS
+
+
+class ResearchAreaMetricsSerializer(serializers.ModelSerializer):
+    """Сериализатор для показателей областей исследований"""
+    title_ru = serializers.CharField(source='research_area.title_ru', read_only=True)
+    title_en = serializers.CharField(source='research_area.title_en', read_only=True)
+    title_kg = serializers.CharField(source='research_area.title_kg', read_only=True)
+    
+    class Meta:
+        model = ResearchAreaMetrics
+        fields = ['research_area', 'title_ru', 'title_en', 'title_kg'] + BIBLIOMETRIC_FIELDS
+
+
 # Сериализаторы для научного управления
-class ResearchManagementPositionSerializer(serializers.ModelSerializer):
+class ResearchManagementPositionSerializer(TreeChildrenMixin, serializers.ModelSerializer):
     """Сериализатор для должностей в научном управлении"""
     children = serializers.SerializerMethodField()
+    # Подчиненные (как в ResearchManagementPosition.get_children) - одним запросом на ответ
+    tree_queryset = ResearchManagementPosition.objects.filter(is_active=True).order_by('order', 'title_ru')
     
     class Meta:
         model = ResearchManagementPosition
@@ -201,10 +229,6 @@ class ResearchManagementPositionSerializer(serializers.ModelSerializer):
             'contact_email', 'contact_phone', 'office_location',
             'photo', 'order', 'parent', 'children'
         ]
-    
-    def get_children(self, obj):
-        children = obj.get_children()
-        return ResearchManagementPositionSerializer(children, many=True, context=self.context).data
 
 
 class ScientificCouncilSerializer(serializers.ModelSerializer):
@@ -288,6 +312,15 @@ class JournalIssueDetailSerializer(serializers.ModelSerializer):
         ]
 
 
+class JournalCatalogListSerializer(serializers.ListSerializer):
+    """Список журналов: каталог выпусков загружается сразу для всех журналов"""
+
+    def to_representation(self, data):
+        journals = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        get_catalog(self.context, journals)
+        return super().to_representation(journals)
+
+
 class ScientificJournalListSerializer(serializers.ModelSerializer):
     """Сериализатор для списка научных журналов"""
     latest_issue = serializers.SerializerMethodField()
@@ -304,15 +337,16 @@ class ScientificJournalListSerializer(serializers.ModelSerializer):
             'is_open_access', 'is_peer_reviewed',
             'latest_issue', 'issues_count'
         ]
+        list_serializer_class = JournalCatalogListSerializer
     
     def get_latest_issue(self, obj):
-        latest = obj.issues.filter(is_published=True, is_active=True).order_by('-year', '-volume', '-number').first()
+        latest = get_catalog(self.context).latest_issue(obj)
         if latest:
             return JournalIssueListSerializer(latest).data
         return None
     
     def get_issues_count(self, obj):
-        return obj.issues.filter(is_published=True, is_active=True).count()
+        return get_catalog(self.context).issues_count(obj)
 
 
 class ScientificJournalDetailSerializer(serializers.ModelSerializer):
@@ -336,19 +370,13 @@ class ScientificJournalDetailSerializer(serializers.ModelSerializer):
         ]
     
     def get_recent_issues(self, obj):
-        recent = obj.issues.filter(is_published=True, is_active=True).order_by('-year', '-volume', '-number')[:5]
+        recent = get_catalog(self.context).issues(obj)[:5]
         return JournalIssueListSerializer(recent, many=True).data
     
     def get_issues_by_year(self, obj):
         """Группировка выпусков по годам для архива"""
-        issues = obj.issues.filter(is_published=True, is_active=True).order_by('-year', '-volume', '-number')
-        
-        years_data = {}
-        for issue in issues:
-            year = issue.year
-            if year not in years_data:
-                years_data[year] = []
-            years_data[year].append(JournalIssueListSerializer(issue).data)
-        
-        # Преобразуем в список для удобства фронтенда
-        return [{'year': year, 'issues': issues} for year, issues in sorted(years_data.items(), reverse=True)]
+        issues = get_catalog(self.context).issues(obj)
+        return [
+            {'year': year, 'issues': JournalIssueListSerializer(year_issues, many=True).data}
+            for year, year_issues in group_by_year(issues)
+        ]
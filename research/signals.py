@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .bibliometrics import SOURCE_FIELDS, publication_deleted, publication_saved
+from .models import Conference, Grant, Publication, PublicationAuthor, ResearchArea, ResearchCenter
+from .search import remove_objects, update_objects
+
+
+@receiver(pre_save, sender=Publication)
+def publication_saving(sender, instance, raw=False, **kwargs):
+    # Значения до сохранения: прежние область и тип тоже пересчитываются
+    if not raw and instance.pk:
+        instance._bibliometrics_previous = Publication.objects.filter(
+            pk=instance.pk
+        ).values(*SOURCE_FIELDS).first()
+
+
+@receiver(post_save, sender=Publication)
+def publication_bibliometrics_saved(sender, instance, raw=False, **kwargs):
+    """Пересчет авторов и показателей в той же транзакции, что и сохранение"""
+    if not raw:
+        publication_saved(instance, getattr(instance, '_bibliometrics_previous', None))
+
+
+@receiver(pre_delete, sender=Publication)
+def publication_deleting(sender, instance, **kwargs):
+    # Связи с авторами удаляются каскадом вместе с публикацией
+    instance._bibliometrics_authors = list(
+        PublicationAuthor.objects.filter(publication=instance).values_list('author_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Publication)
+def publication_bibliometrics_deleted(sender, instance, **kwargs):
+    publication_deleted(instance, getattr(instance, '_bibliometrics_authors', []))
+
+
+@receiver(post_save, sender=ResearchArea)
+@receiver(post_save, sender=ResearchCenter)
+@receiver(post_save, sender=Grant)
+@receiver(post_save, sender=Conference)
+@receiver(post_save, sender=Publication)
+def search_index_saved(sender, instance, raw=False, **kwargs):
+    """Обновление поискового индекса в той же транзакции, что и сохранение"""
+    if not raw:
+        update_objects(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=ResearchArea)
+@receiver(post_delete, sender=ResearchCenter)
+@receiver(post_delete, sender=Grant)
+@receiver(post_delete, sender=Conference)
+@receiver(post_delete, sender=Publication)
+def search_index_deleted(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
@@ -1,3 +1,272 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from .bibliometrics import rebuild_all, split_authors
+from .models import (
+    Author, Conference, JournalIssue, Publication, PublicationTypeMetrics, ResearchArea, ResearchAreaMetrics,
+    ResearchManagementPosition, ScientificJournal,
+)
+
+
+class ManagementTreeTests(APITestCase):
+    """Дерево научного управления сериализуется за постоянное число запросов"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.root = self.position('Проректор', 'leadership')
+        for index in range(3):
+            department = self.position(f'Отдел {index}', 'department', parent=self.root, order=3 - index)
+            for number in range(2):
+                self.position(f'Сотрудник {index}.{number}', 'center', parent=department, order=number)
+        self.position('Упраздненный отдел', 'department', parent=self.root, is_active=False)
+
+    def position(self, title, position_type, **kwargs):
+        return ResearchManagementPosition.objects.create(
+            title_ru=title, title_en=title, title_kg=title,
+            full_name_ru='ФИО', full_name_en='Name', full_name_kg='Аты',
+            position_type=position_type, **kwargs
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context.captured_queries)
+
+    def test_list(self):
+        data, queries = self.get('/research/api/management/')
+        # COUNT, корни, дерево
+        self.assertEqual(queries, 3)
+        root = data['results'][0]
+        self.assertEqual([child['title_ru'] for child in root['children']], ['Отдел 2', 'Отдел 1', 'Отдел 0'])
+        self.assertEqual(
+            [item['title_ru'] for item in root['children'][0]['children']],
+            ['Сотрудник 2.0', 'Сотрудник 2.1'],
+        )
+        self.assertEqual(root['children'][0]['children'][0]['children'], [])
+
+    def test_by_type(self):
+        data, queries = self.get('/research/api/management/by_type/')
+        # Все должности и дерево подчиненных
+        self.assertEqual(queries, 2)
+        types = {group['type']: group['positions'] for group in data}
+        self.assertEqual(len(types['leadership'][0]['children']), 3)
+        self.assertEqual(len(types['department']), 3)
+        self.assertEqual(len(types['department'][0]['children']), 2)
+
+
+class JournalCatalogTests(APITestCase):
+    """Список и карточка журналов - постоянное число запросов"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.journals = [self.journal(f'Журнал {index}') for index in range(3)]
+        for journal in self.journals[:2]:
+            for year in (2022, 2023, 2024):
+                for number in (1, 2):
+                    self.issue(journal, year, number)
+        self.issue(self.journals[0], 2025, 1, is_published=False)
+
+    def journal(self, title):
+        return ScientificJournal.objects.create(
+            title_ru=title, title_en=title, title_kg=title,
+            description_ru='-', description_en='-', description_kg='-',
+            editor_in_chief_ru='-', editor_in_chief_en='-', editor_in_chief_kg='-',
+            publication_frequency_ru='-', publication_frequency_en='-', publication_frequency_kg='-',
+            established_year=2000,
+        )
+
+    def issue(self, journal, year, number, is_published=True):
+        return JournalIssue.objects.create(
+            journal=journal, volume=year - 2000, number=number, year=year,
+            publication_date=datetime.date(year, number, 1), is_published=is_published,
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context.captured_queries)
+
+    def test_list(self):
+        data, queries = self.get('/research/api/journals/')
+        # COUNT, журналы, последние выпуски с числом выпусков
+        self.assertEqual(queries, 3)
+        journals = {journal['title_ru']: journal for journal in data['results']}
+        first = journals['Журнал 0']
+        self.assertEqual(first['issues_count'], 6)
+        self.assertEqual((first['latest_issue']['year'], first['latest_issue']['number']), (2024, 2))
+        self.assertEqual(first['latest_issue']['journal_title'], 'Журнал 0')
+        self.assertEqual((journals['Журнал 2']['issues_count'], journals['Журнал 2']['latest_issue']), (0, None))
+
+    def test_detail(self):
+        data, queries = self.get(f'/research/api/journals/{self.journals[0].pk}/')
+        # Журнал и его выпуски
+        self.assertEqual(queries, 2)
+        self.assertEqual([(issue['year'], issue['number']) for issue in data['recent_issues'][:3]],
+                         [(2024, 2), (2024, 1), (2023, 2)])
+        self.assertEqual(len(data['recent_issues']), 5)
+        self.assertEqual([group['year'] for group in data['issues_by_year']], [2024, 2023, 2022])
+        self.assertEqual([issue['number'] for issue in data['issues_by_year'][0]['issues']], [2, 1])
+
+    def test_by_journal(self):
+        data, queries = self.get(f'/research/api/journal-issues/by_journal/?journal_id={self.journals[1].pk}')
+        self.assertEqual(queries, 1)
+        self.assertEqual([group['year'] for group in data], [2024, 2023, 2022])
+        self.assertEqual(data[0]['issues'][0]['journal_title'], 'Журнал 1')
+
+
+class BibliometricsTests(APITestCase):
+    """Авторы и показатели пересчитываются при сохранении публикаций"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.area = ResearchArea.objects.create(
+            title_ru='Медицина', title_en='Medicine', title_kg='Медицина',
+            description_ru='-', description_en='-', description_kg='-',
+        )
+        self.first = self.publication('Иванов И. И., Петров П.П.', 'Ivanov I.I., Petrov P.P.', 2022, 10, impact_factor=2)
+        self.publication('иванов И.И. и Сидоров С.С.', 'Ivanov I.I., Sidorov S.S.', 2023, 4, impact_factor=3)
+        self.publication('Иванов И.И., и др.', '', 2023, 1, publication_type='book')
+
+    def publication(self, authors_ru, authors_en, year, citations, **kwargs):
+        kwargs.setdefault('research_area', self.area)
+        return Publication.objects.create(
+            title_ru='Статья', title_en='Article', title_kg='Макала',
+            authors_ru=authors_ru, authors_en=authors_en, authors_kg='',
+            journal='Журнал', publication_date=datetime.date(year, 1, 1),
+            citations_count=citations, **kwargs
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context.captured_queries)
+
+    def test_split_authors(self):
+        names = split_authors('Иванов И. И.; Петров П.П. и Иванов И.И., et al.', 'Ivanov I.I., Petrov P.P., Ivanov I.I.')
+        self.assertEqual([(name.name_ru, name.name_en) for name in names], [('Иванов И.И.', 'Ivanov I.I.'), ('Петров П.П.', 'Petrov P.P.')])
+
+    def test_incremental_metrics(self):
+        ivanov = Author.objects.get(key='иванов и.и.')
+        self.assertEqual((ivanov.publications_count, ivanov.citations_count, ivanov.h_index), (3, 15, 2))
+        self.assertEqual(ivanov.name_en, 'Ivanov I.I.')
+        self.assertEqual(ivanov.by_year, [
+            {'year': 2022, 'publications': 1, 'citations': 10},
+            {'year': 2023, 'publications': 2, 'citations': 5},
+        ])
+
+        # Правка текста: прежние значения, UPDATE, авторы и связи - без пересчета
+        # (и три запроса поискового индекса)
+        self.first.title_ru = 'Новое название'
+        with CaptureQueriesContext(connection) as context:
+            self.first.save()
+        self.assertEqual(len(context.captured_queries), 7)
+
+        self.first.citations_count = 0
+        self.first.authors_ru = 'Иванов И.И.'
+        self.first.publication_type = 'book'
+        self.first.save()
+        ivanov.refresh_from_db()
+        self.assertEqual((ivanov.citations_count, ivanov.h_index), (5, 1))
+        self.assertFalse(Author.objects.filter(key='петров п.п.').exists())
+        self.assertEqual(PublicationTypeMetrics.objects.get(publication_type='article').publications_count, 1)
+
+        self.first.delete()
+        area = ResearchAreaMetrics.objects.get(research_area=self.area)
+        self.assertEqual((area.publications_count, area.citations_count), (2, 5))
+
+    def test_rebuild_matches_incremental(self):
+        expected = list(Author.objects.order_by('key').values_list('key', 'citations_count', 'h_index', 'by_year'))
+        Author.objects.all().delete()
+        ResearchAreaMetrics.objects.all().delete()
+        self.assertEqual(rebuild_all(), (3, 5))
+        self.assertEqual(list(Author.objects.order_by('key').values_list('key', 'citations_count', 'h_index', 'by_year')), expected)
+        self.assertEqual(ResearchAreaMetrics.objects.get().h_index, 2)
+
+    def test_endpoints(self):
+        data, queries = self.get('/research/api/authors/')
+        self.assertEqual(queries, 2)
+        self.assertEqual([author['name_ru'] for author in data['results']][:1], ['Иванов И.И.'])
+        author_id = data['results'][0]['id']
+
+        data, queries = self.get(f'/research/api/authors/{author_id}/publications/')
+        self.assertEqual(data['count'], 3)
+
+        data, queries = self.get('/research/api/stats/publications/')
+        self.assertEqual(queries, 1)
+        self.assertEqual([(row['publication_type'], row['count'], row['avg_impact_factor']) for row in data],
+                         [('article', 2, '2.50'), ('book', 1, '0.00')])
+
+        data, queries = self.get('/research/api/stats/areas/')
+        self.assertEqual(queries, 1)
+        self.assertEqual((data[0]['title_en'], data[0]['h_index'], data[0]['citations_count']), ('Medicine', 2, 15))
+
+
+class SearchIndexTests(APITestCase):
+    """Поиск по всем сущностям - один ранжированный запрос к индексу"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.area = ResearchArea.objects.create(
+            title_ru='Кардиология', title_en='Cardiology', title_kg='Кардиология',
+            description_ru='Болезни сердца', description_en='Heart diseases', description_kg='Жүрөк оорулары',
+        )
+        self.conference = Conference.objects.create(
+            title_ru='Медицинский конгресс', title_en='Medical congress', title_kg='Медициналык конгресс',
+            start_date=datetime.date(2025, 5, 1), end_date=datetime.date(2025, 5, 3),
+            location_ru='Бишкек', location_en='Bishkek', location_kg='Бишкек',
+            deadline=datetime.date(2025, 4, 1), website='https://example.com',
+            description_ru='-', description_en='-', description_kg='-',
+            topics_ru=['Кардиология', 'Аритмии'], topics_en=['Cardiology', 'Arrhythmias'], topics_kg=['Кардиология'],
+        )
+        self.publication = Publication.objects.create(
+            title_ru='Ранняя диагностика', title_en='Early diagnosis', title_kg='Эрте диагностика',
+            authors_ru='Иванов И.И.', authors_en='Ivanov I.I.', authors_kg='Иванов И.И.',
+            journal='Журнал', publication_date=datetime.date(2024, 1, 1),
+            keywords_ru=['кардиология', 'ЭКГ'], keywords_en=['cardiology', 'ECG'], keywords_kg=[],
+        )
+
+    def search(self, query):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/research/api/search/', {'q': query}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(context.captured_queries)
+
+    def test_ranked_across_types(self):
+        data, queries = self.search('кардиолог')
+        # Индекс и по запросу на каждый найденный тип
+        self.assertEqual(queries, 4)
+        self.assertEqual([item['id'] for item in data['research_areas']], [self.area.pk])
+        self.assertEqual([item['id'] for item in data['conferences']], [self.conference.pk])
+        self.assertEqual([item['id'] for item in data['publications']], [self.publication.pk])
+        self.assertEqual(data['grants'], [])
+        # Совпадение в названии важнее совпадения в темах и ключевых словах
+        self.assertEqual(data['ranking'][0], {'type': 'research_areas', 'id': self.area.pk})
+
+        data, _ = self.search('ivanov ECG')
+        self.assertEqual(data['ranking'], [{'type': 'publications', 'id': self.publication.pk}])
+
+    def test_typo_tolerance(self):
+        data, _ = self.search('кардеология')
+        self.assertIn('кардиология', data['corrections']['кардеология'])
+        self.assertEqual(len(data['ranking']), 3)
+        data, _ = self.search('arrhytmias')
+        self.assertEqual([item['id'] for item in data['conferences']], [self.conference.pk])
+
+    def test_updated_on_save(self):
+        self.publication.title_ru = 'Эхокардиография'
+        self.publication.save()
+        data, _ = self.search('эхокардиография')
+        self.assertEqual([item['id'] for item in data['publications']], [self.publication.pk])
+
+        self.publication.is_active = False
+        self.publication.save()
+        self.area.delete()
+        data, _ = self.search('кардиология')
+        self.assertEqual(data['ranking'], [{'type': 'conferences', 'id': self.conference.pk}])
@@ -9,6 +9,7 @@ router.register(r'centers', views.ResearchCenterViewSet, basename='researchcente
 router.register(r'grants', views.GrantViewSet, basename='grant')
 router.register(r'conferences', views.ConferenceViewSet, basename='conference')
 router.register(r'publications', views.PublicationViewSet, basename='publication')
+router.register(r'authors', views.AuthorViewSet, basename='author')
 
 # Новые ViewSets для научного управления
 router.register(r'management', views.ResearchManagementPositionViewSet, basename='researchmanagement')
@@ -34,6 +35,7 @@ urlpatterns = [
     path('api/stats/', views.research_stats, name='research-stats'),
     path('api/stats/grants/', views.grant_stats_by_category, name='grant-stats'),
     path('api/stats/publications/', views.publication_stats_by_type, name='publication-stats'),
+    path('api/stats/areas/', views.research_area_metrics, name='research-area-metrics'),
     
     # Поиск
     path('api/search/', views.search_all, name='search-all'),
@@ -87,6 +89,13 @@ GET /research/api/publications/by_research_area/?area_id={id} - публикац
 - is_featured: true/false
 - search: поиск по названию, авторам, журналу
 
+АВТОРЫ (библиометрия):
+GET /research/api/authors/ - авторы по убыванию индекса Хирша
+GET /research/api/authors/{id}/ - показатели автора (h_index, цитирования, по годам)
+GET /research/api/authors/{id}/publications/ - публикации автора
+- search: поиск по имени
+- ordering: h_index, citations_count, publications_count, name_ru
+
 ЗАЯВКИ НА ГРАНТЫ:
 POST /research/api/grant-applications/ - подача заявки на грант
 GET /research/api/grant-applications/list/ - список заявок (только для авторизованных)
@@ -95,11 +104,14 @@ GET /research/api/grant-applications/list/ - список заявок (толь
 GET /research/api/stats/ - общая статистика
 GET /research/api/stats/grants/ - статистика грантов по категориям
 GET /research/api/stats/publications/ - статистика публикаций по типам
+GET /research/api/stats/areas/ - библиометрия областей исследований
 
 ПОИСК:
 GET /research/api/search/?q={query}&lang={lang} - поиск по всем сущностям
-- q: поисковый запрос (обязательный)
+- q: поисковый запрос (обязательный), слова ищутся по префиксу во всех языках
 - lang: язык поиска (ru, en, kg, по умолчанию ru)
+- в ответе до 5 записей каждого типа, ranking - общий порядок по релевантности,
+  corrections - исправленные опечатки, если без них ничего не найдено
 
 ПРИМЕРЫ ЗАПРОСОВ:
 
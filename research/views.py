@@ -3,14 +3,20 @@ from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q, Avg
+from django.db.models import Count
 from django.utils import timezone
+from collections import defaultdict
 from datetime import timedelta
 
+from back_su_m.columns import SerializerColumnsMixin
+from back_su_m.streaming import StreamingListMixin
+from .journals import group_by_year
+from .search import ENTITIES, search
 from .models import (
     ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication,
     ResearchManagementPosition, ScientificCouncil, Commission,
-    ScientificJournal, JournalIssue, JournalArticle
+    ScientificJournal, JournalIssue, JournalArticle,
+    Author, ResearchAreaMetrics, PublicationTypeMetrics
 )
 from .serializers import (
     ResearchAreaSerializer, ResearchCenterSerializer,
@@ -20,7 +26,8 @@ from .serializers import (
     ResearchStatsSerializer, GrantStatsSerializer, PublicationStatsSerializer,
     ResearchManagementPositionSerializer, ScientificCouncilSerializer, CommissionSerializer,
     ScientificJournalListSerializer, ScientificJournalDetailSerializer,
-    JournalIssueListSerializer, JournalIssueDetailSerializer, JournalArticleSerializer
+    JournalIssueListSerializer, JournalIssueDetailSerializer, JournalArticleSerializer,
+    AuthorSerializer, ResearchAreaMetricsSerializer
 )
 
 
@@ -47,7 +54,7 @@ class ResearchCenterViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset.order_by('name_ru')
 
 
-class GrantViewSet(viewsets.ReadOnlyModelViewSet):
+class GrantViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для грантов"""
     queryset = Grant.objects.filter(is_active=True)
     permission_classes = [AllowAny]
@@ -66,15 +73,13 @@ class GrantViewSet(viewsets.ReadOnlyModelViewSet):
     def active(self, request):
         """Активные гранты"""
         queryset = self.get_queryset().filter(status='active')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Предстоящие гранты"""
         queryset = self.get_queryset().filter(status='upcoming')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def deadline_soon(self, request):
@@ -118,13 +123,14 @@ class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicationViewSet(StreamingListMixin, SerializerColumnsMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для публикаций"""
     queryset = Publication.objects.filter(is_active=True)
+    serializer_columns_actions = ['list', 'featured', 'recent', 'by_research_area']
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['publication_type', 'research_area', 'research_center', 'is_featured']
-    search_fields = ['title_ru', 'title_en', 'title_kg', 'authors', 'journal']
+    search_fields = ['title_ru', 'title_en', 'title_kg', 'authors_ru', 'authors_en', 'authors_kg', 'journal']
     ordering_fields = ['publication_date', 'impact_factor', 'citations_count']
     ordering = ['-publication_date']
     
@@ -137,16 +143,14 @@ class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
     def featured(self, request):
         """Рекомендуемые публикации"""
         queryset = self.get_queryset().filter(is_featured=True)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """Недавние публикации"""
         recent_date = timezone.now().date() - timedelta(days=365)
         queryset = self.get_queryset().filter(publication_date__gte=recent_date)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def by_research_area(self, request):
@@ -159,6 +163,31 @@ class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({"error": "area_id parameter is required"}, status=400)
 
 
+class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
+    """ViewSet для авторов публикаций с готовыми показателями"""
+    queryset = Author.objects.all()
+    serializer_class = AuthorSerializer
+    permission_classes = [AllowAny]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['name_ru', 'name_en', 'name_kg']
+    ordering_fields = ['h_index', 'citations_count', 'publications_count', 'name_ru']
+    ordering = ['-h_index', '-citations_count', 'id']
+
+    @action(detail=True, methods=['get'])
+    def publications(self, request, pk=None):
+        """Публикации автора"""
+        author = self.get_object()
+        queryset = Publication.objects.filter(is_active=True, author_links__author=author).select_related(
+            'research_area', 'research_center'
+        ).order_by('-publication_date', 'id')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = PublicationListSerializer(page, many=True, context=self.get_serializer_context())
+            return self.get_paginated_response(serializer.data)
+        serializer = PublicationListSerializer(queryset, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+
+
 class GrantApplicationCreateView(generics.CreateAPIView):
     """Создание заявки на грант"""
     queryset = GrantApplication.objects.all()
@@ -232,22 +261,39 @@ def grant_stats_by_category(request):
 @api_view(['GET'])
 def publication_stats_by_type(request):
     """Статистика публикаций по типам"""
-    stats = Publication.objects.filter(is_active=True).values('publication_type').annotate(
-        count=Count('id'),
-        avg_impact_factor=Avg('impact_factor')
-    ).order_by('-count')
-    
-    # Добавим человеко-читаемые названия типов
-    type_names = dict(Publication.PUBLICATION_TYPE_CHOICES)
-    for stat in stats:
-        stat['type_name'] = type_names.get(stat['publication_type'], stat['publication_type'])
-        if stat['avg_impact_factor'] is None:
-            stat['avg_impact_factor'] = 0
+    # Показатели типов пересчитываются при сохранении публикаций (research/bibliometrics.py)
+    stats = [
+        {
+            'publication_type': metrics.publication_type,
+            'count': metrics.publications_count,
+            'avg_impact_factor': metrics.avg_impact_factor,
+        }
+        for metrics in PublicationTypeMetrics.objects.order_by('-publications_count')
+    ]
     
     serializer = PublicationStatsSerializer(stats, many=True)
     return Response(serializer.data)
 
 
+@api_view(['GET'])
+def research_area_metrics(request):
+    """Библиометрия областей исследований"""
+    metrics = ResearchAreaMetrics.objects.filter(research_area__is_active=True).select_related(
+        'research_area'
+    ).order_by('-h_index', '-citations_count')
+    serializer = ResearchAreaMetricsSerializer(metrics, many=True)
+    return Response(serializer.data)
+
+
+SEARCH_SERIALIZERS = {
+    'research_areas': ResearchAreaSerializer,
+    'research_centers': ResearchCenterSerializer,
+    'grants': GrantListSerializer,
+    'conferences': ConferenceSerializer,
+    'publications': PublicationListSerializer,
+}
+
+
 @api_view(['GET'])
 def search_all(request):
     """Поиск по всем сущностям"""
@@ -255,45 +301,27 @@ def search_all(request):
     if not query:
         return Response({'error': 'Query parameter q is required'}, status=400)
     
-    # Поиск по всем моделям
-    results = {}
-    
-    # Поиск в областях исследований
-    areas = ResearchArea.objects.filter(
-        Q(title_ru__icontains=query) | Q(title_en__icontains=query) | Q(title_kg__icontains=query),
-        is_active=True
-    )[:5]
-    results['research_areas'] = ResearchAreaSerializer(areas, many=True).data
+    # Один ранжированный запрос к индексу (research/search.py), до 5 записей каждого типа
+    matches, corrections = search(query)
+    ids = defaultdict(list)
+    for entity, pk in matches:
+        ids[entity.key].append(pk)
     
-    # Поиск в центрах
-    centers = ResearchCenter.objects.filter(
-        Q(name_ru__icontains=query) | Q(name_en__icontains=query) | Q(name_kg__icontains=query),
-        is_active=True
-    )[:5]
-    results['research_centers'] = ResearchCenterSerializer(centers, many=True).data
-    
-    # Поиск в грантах
-    grants = Grant.objects.filter(
-        Q(title_ru__icontains=query) | Q(title_en__icontains=query) | Q(title_kg__icontains=query),
-        is_active=True
-    )[:5]
-    results['grants'] = GrantListSerializer(grants, many=True).data
-    
-    # Поиск в конференциях
-    conferences = Conference.objects.filter(
-        Q(title_ru__icontains=query) | Q(title_en__icontains=query) | Q(title_kg__icontains=query),
-        is_active=True
-    )[:5]
-    results['conferences'] = ConferenceSerializer(conferences, many=True).data
-    
-    # Поиск в публикациях
-    publications = Publication.objects.filter(
-        Q(title_ru__icontains=query) | Q(title_en__icontains=query) | Q(title_kg__icontains=query) |
-        Q(authors_ru__icontains=query) | Q(authors_en__icontains=query) | Q(authors_kg__icontains=query),
-        is_active=True
-    )[:5]
-    results['publications'] = PublicationListSerializer(publications, many=True).data
+    results = {}
+    for entity in ENTITIES:
+        objects = []
+        if ids[entity.key]:
+            queryset = entity.model.objects.filter(pk__in=ids[entity.key], is_active=True)
+            if entity.model is Publication:
+                queryset = queryset.select_related('research_area', 'research_center')
+            position = {pk: index for index, pk in enumerate(ids[entity.key])}
+            objects = sorted(queryset, key=lambda obj: position[obj.pk])
+        results[entity.key] = SEARCH_SERIALIZERS[entity.key](objects, many=True).data
     
+    # Общий порядок по релевантности для смешанной выдачи
+    results['ranking'] = [{'type': entity.key, 'id': pk} for entity, pk in matches]
+    if corrections:
+        results['corrections'] = corrections
     return Response(results)
 
 
@@ -313,9 +341,15 @@ class ResearchManagementPositionViewSet(viewsets.ReadOnlyModelViewSet):
     def by_type(self, request):
         """Группировка по типам должностей"""
         position_types = {}
-        positions = ResearchManagementPosition.objects.filter(is_active=True).order_by('position_type', 'order', 'title_ru')
+        positions = list(
+            ResearchManagementPosition.objects.filter(is_active=True).order_by('position_type', 'order', 'title_ru')
+        )
+        # Один сериализатор на все должности: подчиненные берутся из общего дерева
+        serialized = ResearchManagementPositionSerializer(
+            positions, many=True, context=self.get_serializer_context()
+        ).data
         
-        for position in positions:
+        for position, data in zip(positions, serialized):
             pos_type = position.position_type
             if pos_type not in position_types:
                 position_types[pos_type] = {
@@ -323,9 +357,7 @@ class ResearchManagementPositionViewSet(viewsets.ReadOnlyModelViewSet):
                     'type_display': position.get_position_type_display(),
                     'positions': []
                 }
-            position_types[pos_type]['positions'].append(
-                ResearchManagementPositionSerializer(position, context=self.get_serializer_context()).data
-            )
+            position_types[pos_type]['positions'].append(data)
         
         return Response(list(position_types.values()))
 
@@ -396,7 +428,8 @@ class ScientificJournalViewSet(viewsets.ReadOnlyModelViewSet):
 
 class JournalIssueViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet для выпусков журналов"""
-    queryset = JournalIssue.objects.filter(is_published=True, is_active=True).order_by('-year', '-volume', '-number')
+    # journal_title и journal выпуска без запроса на выпуск
+    queryset = JournalIssue.objects.filter(is_published=True, is_active=True).select_related('journal').order_by('-year', '-volume', '-number')
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['journal', 'year', 'volume']
@@ -418,16 +451,12 @@ class JournalIssueViewSet(viewsets.ReadOnlyModelViewSet):
         
         issues = self.get_queryset().filter(journal_id=journal_id)
         
-        # Группировка по годам
-        years_data = {}
-        for issue in issues:
-            year = issue.year
-            if year not in years_data:
-                years_data[year] = []
-            years_data[year].append(JournalIssueListSerializer(issue, context=self.get_serializer_context()).data)
-        
-        # Преобразуем в список для удобства фронтенда
-        result = [{'year': year, 'issues': issues} for year, issues in sorted(years_data.items(), reverse=True)]
+        # Группировка по годам: выпуски уже упорядочены по убыванию года
+        context = self.get_serializer_context()
+        result = [
+            {'year': year, 'issues': JournalIssueListSerializer(year_issues, many=True, context=context).data}
+            for year, year_issues in group_by_year(issues)
+        ]
         return Response(result)
 
     @action(detail=False, methods=['get'])
@@ -438,9 +467,10 @@ class JournalIssueViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class JournalArticleViewSet(viewsets.ReadOnlyModelViewSet):
+class JournalArticleViewSet(SerializerColumnsMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для статей журналов"""
     queryset = JournalArticle.objects.filter(is_active=True, issue__is_published=True).order_by('-issue__year', '-issue__volume', '-issue__number', 'order')
+    serializer_columns_actions = ['list', 'recent', 'most_cited']
     serializer_class = JournalArticleSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
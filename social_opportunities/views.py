@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+
+from back_su_m.streaming import StreamingListMixin
 from .models import Event, Club, Project
 from .serializers import EventSerializer, ClubSerializer, ProjectSerializer
 
@@ -32,7 +34,7 @@ class EventViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ClubViewSet(viewsets.ModelViewSet):
+class ClubViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Club.objects.all()
     serializer_class = ClubSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -53,8 +55,7 @@ class ClubViewSet(viewsets.ModelViewSet):
     def active(self, request):
         """Get active clubs"""
         clubs = self.queryset.filter(status='active')
-        serializer = self.get_serializer(clubs, many=True)
-        return Response(serializer.data)
+        return self.list_response(clubs)
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_life', '0009_eresourcecategory_eresource_eresourcefeature'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-uploaded_at'], name='student_photo_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['album', 'order', '-uploaded_at'], name='student_photo_album_idx'),
+        ),
+    ]
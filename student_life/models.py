@@ -751,6 +751,13 @@ class Photo(models.Model):
         verbose_name = _('Фотография')
         verbose_name_plural = _('Фотографии')
         ordering = ['order', '-uploaded_at']
+        indexes = [
+            # Активные фото в порядке Meta.ordering: общий список и фото альбома
+            models.Index(fields=['order', '-uploaded_at'], name='student_photo_active_idx',
+                         condition=models.Q(is_active=True)),
+            models.Index(fields=['album', 'order', '-uploaded_at'], name='student_photo_album_idx',
+                         condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.album.title_ru} - {self.title_ru or f'Фото {self.id}'}"
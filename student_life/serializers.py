@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from back_su_m.locale import CompactLanguageMixin, column_suffix, get_request_language
 from .models import (
     PartnerOrganization, StudentAppeal, OrganizationSpecialization,
     PhotoAlbum, Photo, VideoContent, StudentLifeStatistic,
@@ -52,12 +53,12 @@ class StudentAppealSerializer(serializers.ModelSerializer):
 # SERIALIZERS ДЛЯ ФОТОГАЛЕРЕИ И ВИДЕО
 # =============================================================================
 
-class PhotoSerializer(serializers.ModelSerializer):
+class PhotoSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     """Сериализатор для фотографий"""
     tags = serializers.SerializerMethodField()
     title = serializers.SerializerMethodField()
     url = serializers.SerializerMethodField()
-    album_id = serializers.ReadOnlyField(source='album.id')
+    album_id = serializers.ReadOnlyField()
     
     class Meta:
         model = Photo
@@ -72,7 +73,7 @@ class PhotoSerializer(serializers.ModelSerializer):
         """Возвращает название на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'title_{lang}', obj.title_ru)
         return obj.title_ru
     
@@ -92,7 +93,7 @@ class PhotoSerializer(serializers.ModelSerializer):
         """Возвращает теги в виде списка для текущего языка"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             tags_field = getattr(obj, f'tags_{lang}', obj.tags_ru)
         else:
             tags_field = obj.tags_ru
@@ -123,7 +124,7 @@ class PhotoAlbumSerializer(serializers.ModelSerializer):
         """Возвращает название на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'title_{lang}', obj.title_ru)
         return obj.title_ru
     
@@ -138,7 +139,7 @@ class PhotoAlbumSerializer(serializers.ModelSerializer):
         """Возвращает теги в виде списка для текущего языка"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             tags_field = getattr(obj, f'tags_{lang}', obj.tags_ru)
         else:
             tags_field = obj.tags_ru
@@ -148,6 +149,14 @@ class PhotoAlbumSerializer(serializers.ModelSerializer):
         return []
 
 
+class PhotoAlbumSummarySerializer(PhotoAlbumSerializer):
+    """Альбом без вложенных фотографий (галерея отдает их отдельным списком)"""
+    photos = None
+
+    class Meta(PhotoAlbumSerializer.Meta):
+        fields = [field for field in PhotoAlbumSerializer.Meta.fields if field != 'photos']
+
+
 class VideoContentSerializer(serializers.ModelSerializer):
     """Сериализатор для видеоконтента"""
     tags = serializers.SerializerMethodField()
@@ -170,7 +179,7 @@ class VideoContentSerializer(serializers.ModelSerializer):
         """Возвращает название на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'title_{lang}', obj.title_ru)
         return obj.title_ru
     
@@ -198,7 +207,7 @@ class VideoContentSerializer(serializers.ModelSerializer):
         """Возвращает теги в виде списка для текущего языка"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             tags_field = getattr(obj, f'tags_{lang}', obj.tags_ru)
         else:
             tags_field = obj.tags_ru
@@ -224,7 +233,7 @@ class StudentLifeStatisticSerializer(serializers.ModelSerializer):
         """Возвращает название на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'label_{lang}', obj.label_ru)
         return obj.label_ru
 
@@ -241,7 +250,7 @@ class InternshipRequirementItemSerializer(serializers.ModelSerializer):
         """Возвращает текст на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'text_{lang}', obj.text_ru)
         return obj.text_ru
 
@@ -263,7 +272,7 @@ class InternshipRequirementSerializer(serializers.ModelSerializer):
         """Возвращает заголовок на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'title_{lang}', obj.title_ru)
         return obj.title_ru
 
@@ -287,7 +296,7 @@ class ReportTemplateSerializer(serializers.ModelSerializer):
         """Возвращает название на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'name_{lang}', obj.name_ru)
         return obj.name_ru
     
@@ -295,7 +304,7 @@ class ReportTemplateSerializer(serializers.ModelSerializer):
         """Возвращает описание на текущем языке"""
         request = self.context.get('request')
         if request:
-            lang = request.GET.get('lang', 'ru')
+            lang = column_suffix(get_request_language(request))
             return getattr(obj, f'description_{lang}', obj.description_ru)
         return obj.description_ru
     
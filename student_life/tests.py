@@ -1,3 +1,29 @@
-from django.test import TestCase
+import json
+from datetime import date
 
-# Create your tests here.
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .models import Photo, PhotoAlbum
+
+
+@override_settings(STREAMING_CHUNK_SIZE=2)
+class GalleryStreamingTests(APITestCase):
+    """gallery_data с ?stream=1 отдает тот же объект, фотографии - потоком"""
+
+    url = '/api/student-life/api/data/gallery_data/'
+
+    def test_same_payload(self):
+        album = PhotoAlbum.objects.create(
+            title_ru='Альбом', title_kg='Альбом', title_en='Album', event_date=date(2026, 1, 1)
+        )
+        for index in range(5):
+            Photo.objects.create(album=album, title_ru=f'Фото {index}', url=f'https://example.com/{index}.jpg')
+
+        regular = self.client.get(self.url, {'lang': 'en'})
+        streamed = self.client.get(self.url, {'lang': 'en', 'stream': '1'})
+        self.assertTrue(streamed.streaming)
+        payload = json.loads(b''.join(streamed.streaming_content))
+        self.assertEqual(payload, regular.json())
+        self.assertEqual(len(payload['photos']), 5)
+        self.assertEqual(payload['photos'][0]['albumId'], album.pk)
@@ -10,15 +10,19 @@ from django.utils.encoding import force_str
 from django_filters.rest_framework import DjangoFilterBackend
 import os
 import mimetypes
+
+from back_su_m.columns import LanguageColumnsMixin, SerializerColumnsMixin
+from back_su_m.conditional import conditional_response
+from back_su_m.streaming import json_object_with_array, stream_chunks, streaming_json_response, wants_stream
 from .models import (
     PartnerOrganization, StudentAppeal, PhotoAlbum, Photo, 
-    VideoContent, StudentLifeStatistic, InternshipRequirement, ReportTemplate,
+    VideoContent, StudentLifeStatistic, InternshipRequirement, InternshipRequirementItem, ReportTemplate,
     StudentGuide, GuideRequirement, GuideStep, GuideStepDetail,
     EResourceCategory, EResource, EResourceFeature
 )
 from .serializers import (
     PartnerOrganizationSerializer, StudentAppealSerializer,
-    PhotoAlbumSerializer, PhotoSerializer, VideoContentSerializer,
+    PhotoAlbumSerializer, PhotoAlbumSummarySerializer, PhotoSerializer, VideoContentSerializer,
     StudentLifeStatisticSerializer, InternshipRequirementSerializer,
     ReportTemplateSerializer, StudentGuideSerializer,
     EResourceCategorySerializer, EResourceSerializer
@@ -52,7 +56,7 @@ class PhotoAlbumViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PhotoViewSet(viewsets.ModelViewSet):
+class PhotoViewSet(LanguageColumnsMixin, viewsets.ModelViewSet):
     """ViewSet для фотографий"""
     queryset = Photo.objects.filter(is_active=True)
     serializer_class = PhotoSerializer
@@ -94,6 +98,9 @@ class StudentLifeStatisticViewSet(viewsets.ModelViewSet):
 # КОМБИНИРОВАННЫЕ API ENDPOINTS ДЛЯ ФРОНТЕНДА
 # =============================================================================
 
+@conditional_response('internships_data', models=[
+    PartnerOrganization, InternshipRequirement, InternshipRequirementItem, ReportTemplate,
+])
 @api_view(['GET'])
 def internships_data(request):
     """Комбинированные данные для страницы практики"""
@@ -551,6 +558,22 @@ Email: {appeal.email}
 # НОВЫЕ API ENDPOINTS ДЛЯ ГАЛЕРЕИ И ОБЗОРА СТУДЕНЧЕСКОЙ ЖИЗНИ
 # =============================================================================
 
+def gallery_photo(photo_data):
+    """Фотография галереи в формате, совместимом с фронтендом"""
+    return {
+        'id': photo_data['id'],
+        'albumId': photo_data.get('album_id'),
+        'url': photo_data['url'],
+        'titleKey': f"gallery.photos.photo{photo_data['id']}.title",
+        'title': photo_data['title'],
+        'tagsKey': f"gallery.photos.photo{photo_data['id']}.tags",
+        'tags': photo_data['tags'],
+        'photographer': photo_data['photographer'],
+        'uploaded_at': photo_data['uploaded_at']
+    }
+
+
+@conditional_response('gallery_data', models=[PhotoAlbum, Photo])
 @api_view(['GET'])
 def gallery_data(request):
     """API endpoint для данных галереи"""
@@ -559,8 +582,7 @@ def gallery_data(request):
         photos = Photo.objects.filter(is_active=True)
         
         # Сериализация данных
-        albums_serializer = PhotoAlbumSerializer(albums, many=True, context={'request': request})
-        photos_serializer = PhotoSerializer(photos, many=True, context={'request': request})
+        albums_serializer = PhotoAlbumSummarySerializer(albums, many=True, context={'request': request})
         
         # Формируем структуру данных, совместимую с фронтендом
         albums_data = []
@@ -579,21 +601,16 @@ def gallery_data(request):
             }
             albums_data.append(album_compatible)
         
-        photos_data = []
-        for photo_data in photos_serializer.data:
-            # Преобразуем для совместимости с фронтендом
-            photo_compatible = {
-                'id': photo_data['id'],
-                'albumId': photo_data.get('album_id'),  # Нужно добавить это поле в сериализатор
-                'url': photo_data['url'],
-                'titleKey': f"gallery.photos.photo{photo_data['id']}.title",
-                'title': photo_data['title'],
-                'tagsKey': f"gallery.photos.photo{photo_data['id']}.tags",
-                'tags': photo_data['tags'],
-                'photographer': photo_data['photographer'],
-                'uploaded_at': photo_data['uploaded_at']
-            }
-            photos_data.append(photo_compatible)
+        if wants_stream(request):
+            # ?stream=1: фотографии сериализуются и отдаются пачками
+            chunks = (
+                [gallery_photo(photo_data) for photo_data in chunk]
+                for chunk in stream_chunks(photos, PhotoSerializer, {'request': request})
+            )
+            return streaming_json_response(json_object_with_array({'albums': albums_data}, 'photos', chunks))
+        
+        photos_serializer = PhotoSerializer(photos, many=True, context={'request': request})
+        photos_data = [gallery_photo(photo_data) for photo_data in photos_serializer.data]
         
         response_data = {
             'albums': albums_data,
@@ -777,9 +794,10 @@ class EResourceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-class EResourceViewSet(viewsets.ReadOnlyModelViewSet):
+class EResourceViewSet(SerializerColumnsMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для электронных ресурсов"""
     queryset = EResource.objects.filter(is_active=True).order_by('order', 'title_ru')
+    serializer_columns_actions = ['list', 'popular']
     serializer_class = EResourceSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -790,7 +808,7 @@ class EResourceViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def popular(self, request):
         """Получить популярные ресурсы"""
-        popular_resources = self.queryset.filter(is_popular=True)
+        popular_resources = self.get_queryset().filter(is_popular=True)
         serializer = self.get_serializer(popular_resources, many=True)
         return Response(serializer.data)
     
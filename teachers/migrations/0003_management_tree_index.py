@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0002_management'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='management',
+            index=models.Index(fields=['tree_id', 'lft'], name='teachers_mgmt_tree_idx'),
+        ),
+    ]
@@ -47,6 +47,10 @@ class Management(MPTTModel):
     class Meta:
         verbose_name = 'Руководитель'
         verbose_name_plural = 'Руководство'
+        indexes = [
+            # Поддеревья и обход дерева: tree_id = ? AND lft BETWEEN ? AND ? ORDER BY tree_id, lft
+            models.Index(fields=['tree_id', 'lft'], name='teachers_mgmt_tree_idx'),
+        ]
 
     def __str__(self):
         return self.full_name_ru
@@ -1,20 +1,40 @@
 from rest_framework import serializers
+from back_su_m.locale import CompactLanguageMixin
+from back_su_m.trees import TreeChildrenMixin
 from .models import Teacher, Management
 
-class TeacherSerializer(serializers.ModelSerializer):
+
+class TeacherSerializer(CompactLanguageMixin, serializers.ModelSerializer):
     class Meta:
         model = Teacher
         fields = '__all__'
 
-class ManagementSerializer(serializers.ModelSerializer):
+
+MANAGEMENT_FIELDS = ('id', 'full_name_ru', 'full_name_kg', 'full_name_en', 
+                     'position_ru', 'position_kg', 'position_en', 
+                     'bio_ru', 'bio_kg', 'bio_en', 'photo', 'parent')
+
+
+class ManagementSerializer(TreeChildrenMixin, serializers.ModelSerializer):
     children = serializers.SerializerMethodField()
+    # Порядок MPTT (tree_id, lft) совпадает с Management.get_children()
+    tree_queryset = Management.objects.all()
 
     class Meta:
         model = Management
-        fields = ('id', 'full_name_ru', 'full_name_kg', 'full_name_en', 
-                  'position_ru', 'position_kg', 'position_en', 
-                  'bio_ru', 'bio_kg', 'bio_en', 'photo', 'parent', 'children')
+        fields = MANAGEMENT_FIELDS + ('children',)
 
     def get_children(self, obj):
-        children = obj.get_children()
-        return ManagementSerializer(children, many=True, context=self.context).data
+        # Узлы из get_cached_trees() уже знают своих детей; get_children()
+        # строил бы для них лишний queryset pk__in на каждый узел
+        if hasattr(obj, '_cached_children'):
+            return ManagementSerializer(obj._cached_children, many=True, context=self.context).data
+        return super().get_children(obj)
+
+
+class ManagementFlatSerializer(serializers.ModelSerializer):
+    """Узел дерева без children: level и parent вместо вложенности"""
+
+    class Meta:
+        model = Management
+        fields = MANAGEMENT_FIELDS + ('level',)
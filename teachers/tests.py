@@ -1,3 +1,81 @@
-from django.test import TestCase
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import Management
+
+
+class ManagementTreeTests(APITestCase):
+    """Дерево руководства и его поддеревья - один запрос к таблице"""
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.rector = self.person('Ректор')
+        self.vice = {}
+        for name in ('Проректор Б', 'Проректор А'):
+            self.vice[name] = self.person(name, parent=self.rector)
+            for number in range(2):
+                head = self.person(f'{name}: отдел {number}', parent=self.vice[name])
+                self.person(f'{name}: сотрудник {number}', parent=head)
+        self.council = self.person('Ученый совет')
+
+    def person(self, name, **kwargs):
+        return Management.objects.create(full_name_ru=name, position_ru='Должность', **kwargs)
+
+    def get(self, url, status=200):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, status)
+        return response.json(), len(context.captured_queries)
+
+    def names(self, nodes):
+        return [node['full_name_ru'] for node in nodes]
+
+    def test_list(self):
+        data, queries = self.get('/api/management/')
+        self.assertEqual(queries, 1)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.names(data['results']), ['Ректор', 'Ученый совет'])
+        rector = data['results'][0]
+        # Порядок MPTT: order_insertion_by = full_name_ru
+        self.assertEqual(self.names(rector['children']), ['Проректор А', 'Проректор Б'])
+        head = rector['children'][0]['children'][0]
+        self.assertEqual(self.names(head['children']), ['Проректор А: сотрудник 0'])
+        self.assertEqual(head['children'][0]['children'], [])
+
+    def test_subtree_and_depth(self):
+        vice = self.vice['Проректор Б']
+        data, queries = self.get(f'/api/management/?root={vice.pk}&depth=1')
+        self.assertEqual(queries, 1)
+        root, = data['results']
+        self.assertEqual(root['id'], vice.pk)
+        self.assertEqual(self.names(root['children']), ['Проректор Б: отдел 0', 'Проректор Б: отдел 1'])
+        self.assertEqual(root['children'][0]['children'], [])
+
+        data, queries = self.get('/api/management/?depth=0')
+        self.assertEqual(self.names(data['results']), ['Ректор', 'Ученый совет'])
+        self.assertEqual(data['results'][0]['children'], [])
+
+        data, queries = self.get(f'/api/management/{vice.pk}/')
+        self.assertEqual(queries, 1)
+        self.assertEqual(len(data['children'][1]['children']), 1)
+
+        self.get('/api/management/?root=999999', status=404)
+        self.get('/api/management/?depth=-1', status=400)
+
+    def test_flat(self):
+        data, queries = self.get(f'/api/management/flat/?root={self.vice["Проректор А"].pk}')
+        self.assertEqual(queries, 1)
+        self.assertEqual(
+            [(node['full_name_ru'], node['level']) for node in data],
+            [
+                ('Проректор А', 1),
+                ('Проректор А: отдел 0', 2),
+                ('Проректор А: сотрудник 0', 3),
+                ('Проректор А: отдел 1', 2),
+                ('Проректор А: сотрудник 1', 3),
+            ],
+        )
+        data, _ = self.get('/api/management/flat/?depth=1')
+        self.assertEqual(self.names(data), ['Ректор', 'Проректор А', 'Проректор Б', 'Ученый совет'])
@@ -1,14 +1,87 @@
 from django.shortcuts import render
+from django.db.models import F, Subquery
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from mptt.utils import get_cached_trees
+from back_su_m.columns import LanguageColumnsMixin
 from .models import Teacher, Management
-from .serializers import TeacherSerializer, ManagementSerializer
+from .serializers import TeacherSerializer, ManagementSerializer, ManagementFlatSerializer
 
 # Create your views here.
 
-class TeacherViewSet(viewsets.ReadOnlyModelViewSet):
+class TeacherViewSet(LanguageColumnsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Teacher.objects.all()
     serializer_class = TeacherSerializer
 
 class ManagementViewSet(viewsets.ReadOnlyModelViewSet):
+    """Руководство: дерево целиком за один запрос по (tree_id, lft).
+
+    Узлы читаются одним запросом в порядке MPTT, get_cached_trees()
+    раскладывает их по родителям, и children сериализуются без запросов.
+    Параметры list и flat:
+    - ?root=<id>  - поддерево узла: узел и его потомки (lft между lft и
+      rght узла, границы - подзапросом в том же SQL);
+    - ?depth=N    - не глубже N уровней от корня ответа (0 - только корни).
+    flat/ - те же узлы плоским списком в порядке обхода, с level и parent.
+    """
     queryset = Management.objects.filter(parent__isnull=True)
     serializer_class = ManagementSerializer
+
+    def get_int_param(self, name):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            value = int(value)
+            if value < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({name: 'Ожидается неотрицательное целое число.'})
+        return value
+
+    def get_tree_queryset(self, root=None):
+        """Узлы дерева в порядке (tree_id, lft): поддерево root, не глубже ?depth"""
+        queryset = Management.objects.all()
+        depth = self.get_int_param('depth')
+        if root is None:
+            if depth is not None:
+                queryset = queryset.filter(level__lte=depth)
+            return queryset
+        bounds = Management.objects.filter(pk=root)
+        queryset = queryset.filter(
+            tree_id=Subquery(bounds.values('tree_id')),
+            lft__gte=Subquery(bounds.values('lft')),
+            lft__lt=Subquery(bounds.values('rght')),
+        )
+        if depth is not None:
+            queryset = queryset.filter(level__lte=Subquery(bounds.values(max_level=F('level') + depth)))
+        return queryset
+
+    def get_nodes(self, root=None):
+        nodes = list(self.get_tree_queryset(root))
+        if root is not None and not nodes:
+            raise NotFound('Узел не найден.')
+        return nodes
+
+    def list(self, request, *args, **kwargs):
+        # Корни ответа - узлы, чьих родителей нет в выборке
+        roots = get_cached_trees(self.get_nodes(self.get_int_param('root')))
+        page = self.paginate_queryset(roots)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(roots, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        root = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        if not str(root).isdigit():
+            raise NotFound('Узел не найден.')
+        return Response(self.get_serializer(get_cached_trees(self.get_nodes(int(root)))[0]).data)
+
+    @action(detail=False)
+    def flat(self, request):
+        """Узлы плоским списком в порядке обхода дерева"""
+        nodes = self.get_nodes(self.get_int_param('root'))
+        return Response(ManagementFlatSerializer(nodes, many=True, context=self.get_serializer_context()).data)